@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+密码哈希基准测试脚本
+
+报告各算法参数组合在当前机器上的吞吐量和内存占用
+"""
+import sys
+import os
+import json
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.infrastructure.hashing.benchmark import default_parameter_sets, run_benchmark
+
+
+def _format_bytes(size: int) -> str:
+    """格式化字节数"""
+    for unit in ("B", "KiB", "MiB"):
+        if size < 1024:
+            return f"{size:.0f}{unit}"
+        size /= 1024
+    return f"{size:.1f}GiB"
+
+
+def main():
+    """运行基准测试"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="密码哈希基准测试")
+    parser.add_argument("--iterations", type=int, default=5, help="每组参数的哈希次数")
+    parser.add_argument(
+        "--scheme",
+        choices=["bcrypt", "scrypt", "argon2"],
+        action="append",
+        help="只测试指定算法（可重复）"
+    )
+    parser.add_argument("--json", action="store_true", help="以 JSON 格式输出")
+
+    args = parser.parse_args()
+
+    hashers = [
+        hasher for hasher in default_parameter_sets()
+        if not args.scheme or hasher.scheme in args.scheme
+    ]
+    results = run_benchmark(hashers, iterations=args.iterations)
+
+    if args.json:
+        print(json.dumps([result.to_dict() for result in results], ensure_ascii=False))
+        return
+
+    cpu_count = os.cpu_count() or 1
+    print(f"CPU 核心数: {cpu_count}")
+    print(f"{'算法':<8}{'参数':<40}{'延迟':>10}{'单核 ops/s':>12}"
+          f"{'整机 ops/s':>12}{'理论内存':>12}{'峰值 RSS':>12}")
+    for result in results:
+        parameters = ",".join(f"{k}={v}" for k, v in result.parameters.items())
+        print(
+            f"{result.scheme:<8}{parameters:<40}{result.latency_ms:>8.1f}ms"
+            f"{result.ops_per_second:>12.1f}{result.ops_per_second * cpu_count:>12.1f}"
+            f"{_format_bytes(result.memory_bytes):>12}{_format_bytes(result.peak_rss_bytes):>12}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+泄露密码过滤器构建脚本
+
+把每行一个密码的文本文件（支持 .gz）编译为 Bloom 过滤器文件，
+供 BREACHED_PASSWORDS_FILTER_PATH 配置使用
+"""
+import sys
+import os
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config.settings import settings
+from src.infrastructure.breached_passwords import build_password_filter, iter_password_file
+
+
+def main():
+    """构建过滤器"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="构建泄露密码 Bloom 过滤器")
+    parser.add_argument("source", help="密码库文件（每行一个密码，支持 .gz）")
+    parser.add_argument("output", help="输出的过滤器文件")
+    parser.add_argument(
+        "--fp-rate",
+        type=float,
+        default=settings.BREACHED_PASSWORDS_FP_RATE,
+        help="目标误判率"
+    )
+    parser.add_argument(
+        "--capacity",
+        type=int,
+        help="预期条目数（默认先扫描一遍文件计数）"
+    )
+
+    args = parser.parse_args()
+
+    started_at = time.perf_counter()
+
+    capacity = args.capacity
+    if capacity is None:
+        print("统计条目数...")
+        capacity = sum(1 for _ in iter_password_file(args.source))
+
+    print(f"构建过滤器: capacity={capacity}, fp_rate={args.fp_rate}")
+    bloom = build_password_filter(
+        iter_password_file(args.source),
+        capacity=capacity,
+        false_positive_rate=args.fp_rate
+    )
+    bloom.save(args.output)
+
+    elapsed = time.perf_counter() - started_at
+    print(f"✅ 已写入 {args.output}")
+    print(f"  条目数: {bloom.count}")
+    print(f"  文件大小: {bloom.memory_bytes / 1024 / 1024:.1f}MiB")
+    print(f"  哈希函数个数: {bloom.num_hashes}")
+    print(f"  估算误判率: {bloom.false_positive_rate:.6f}")
+    print(f"  耗时: {elapsed:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+bcrypt cost 校准脚本
+
+在当前机器上测量 bcrypt 耗时，输出满足延迟预算的最高 cost，
+结果可写入 BCRYPT_ROUNDS 配置
+"""
+import sys
+import os
+import json
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config.settings import settings
+from src.infrastructure.hashing.calibration import calibrate_bcrypt_rounds
+
+
+def main():
+    """运行校准"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="校准 bcrypt cost")
+    parser.add_argument(
+        "--budget-ms",
+        type=float,
+        default=settings.BCRYPT_LATENCY_BUDGET_MS,
+        help="单次哈希 P95 延迟预算（毫秒）"
+    )
+    parser.add_argument("--min-rounds", type=int, default=settings.BCRYPT_MIN_ROUNDS)
+    parser.add_argument("--max-rounds", type=int, default=settings.BCRYPT_MAX_ROUNDS)
+    parser.add_argument("--samples", type=int, default=5, help="每个 cost 的采样次数")
+    parser.add_argument("--json", action="store_true", help="以 JSON 格式输出")
+
+    args = parser.parse_args()
+
+    result = calibrate_bcrypt_rounds(
+        budget_ms=args.budget_ms,
+        min_rounds=args.min_rounds,
+        max_rounds=args.max_rounds,
+        samples=args.samples
+    )
+
+    if args.json:
+        print(json.dumps(result.to_dict(), ensure_ascii=False))
+        return
+
+    print(f"延迟预算: {result.budget_ms}ms (P95)")
+    for rounds, elapsed_ms in result.measurements.items():
+        marker = "✅" if elapsed_ms <= result.budget_ms else "❌"
+        print(f"  {marker} rounds={rounds}: {elapsed_ms:.1f}ms")
+    print(f"推荐配置: BCRYPT_ROUNDS={result.rounds}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+过期注册数据清理脚本
+
+分批清除过期验证 token 的摘要并删除验证过期的未验证用户，
+与应用内的 user-purge 周期任务共用断点（maintenance_checkpoints），可随时中断后继续
+"""
+import sys
+import os
+import time
+from datetime import timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+from config.settings import settings
+from infrastructure.database import PrimarySessionLocal
+from infrastructure.purge import UserPurgeJob
+from infrastructure.repositories.cached_user_repository import encode_user
+
+
+def main():
+    """执行清理"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="分批清理过期验证 token 和未验证用户")
+    parser.add_argument(
+        "--token-retention-days",
+        type=int,
+        default=settings.USER_PURGE_TOKEN_RETENTION_DAYS,
+        help="验证 token 过期多少天后清除"
+    )
+    parser.add_argument(
+        "--account-retention-days",
+        type=int,
+        default=settings.USER_PURGE_UNVERIFIED_RETENTION_DAYS,
+        help="验证过期多少天后删除未验证用户"
+    )
+    parser.add_argument("--chunk-size", type=int, default=settings.USER_PURGE_CHUNK_SIZE)
+    parser.add_argument(
+        "--pause",
+        type=float,
+        default=settings.USER_PURGE_PAUSE_SECONDS,
+        help="批之间暂停的秒数"
+    )
+    parser.add_argument(
+        "--max-chunks",
+        type=int,
+        default=sys.maxsize,
+        help="每个步骤最多处理的批数（默认处理完为止）"
+    )
+    parser.add_argument("--archive", help="删除前把用户追加写入该文件（每行一个 JSON）")
+
+    args = parser.parse_args()
+
+    archive_file = open(args.archive, "a", encoding="utf-8") if args.archive else None
+
+    def archive(users):
+        archive_file.writelines(encode_user(user) + "\n" for user in users)
+        archive_file.flush()
+        os.fsync(archive_file.fileno())
+
+    job = UserPurgeJob(
+        PrimarySessionLocal,
+        token_retention=timedelta(days=args.token_retention_days),
+        account_retention=timedelta(days=args.account_retention_days),
+        chunk_size=args.chunk_size,
+        pause_seconds=args.pause,
+        max_chunks_per_run=args.max_chunks,
+        archive=archive if archive_file else None
+    )
+
+    started_at = time.perf_counter()
+    try:
+        result = job.run()
+    except KeyboardInterrupt:
+        print("⚠️ 已中断，下次从断点继续")
+        sys.exit(1)
+    finally:
+        if archive_file:
+            archive_file.close()
+
+    elapsed = time.perf_counter() - started_at
+    print("✅ 清理完成")
+    for task, rows in result.items():
+        print(f"  {task}: {rows}")
+    print(f"  耗时: {elapsed:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
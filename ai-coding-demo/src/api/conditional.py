@@ -0,0 +1,84 @@
+"""条件请求（ETag / Last-Modified）
+
+基于规范: SPEC-USER-001, 4.1 性能要求
+
+资源版本取实体的 updated_at: ETag 是它的微秒时间戳（强校验器），Last-Modified 精确到秒。
+轮询的客户端带上 If-None-Match / If-Modified-Since，版本未变时返回 304，
+服务端只需查询版本，不加载实体、不序列化响应。
+
+按 RFC 9110 13.2.2 的顺序判断: 请求带 If-None-Match 时只比较 ETag（弱比较），
+忽略 If-Modified-Since
+"""
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Dict, Mapping
+
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+def _utc(version: datetime) -> datetime:
+    """转换为 UTC（数据库返回的无时区时间按 UTC 处理）"""
+    if version.tzinfo is None:
+        return version.replace(tzinfo=timezone.utc)
+    return version.astimezone(timezone.utc)
+
+
+def entity_tag(version: datetime) -> str:
+    """版本对应的 ETag"""
+    micros = (_utc(version) - _EPOCH) // timedelta(microseconds=1)
+    return f'"{micros:x}"'
+
+
+def last_modified(version: datetime) -> str:
+    """版本对应的 Last-Modified（HTTP 日期，精确到秒）"""
+    return format_datetime(_utc(version).replace(microsecond=0), usegmt=True)
+
+
+def validator_headers(version: datetime) -> Dict[str, str]:
+    """
+    响应的校验器头
+
+    Cache-Control: no-cache 要求客户端（和共享缓存）每次先用校验器向服务端确认
+    """
+    return {
+        "ETag": entity_tag(version),
+        "Last-Modified": last_modified(version),
+        "Cache-Control": "private, no-cache",
+    }
+
+
+def is_conditional(headers: Mapping[str, str]) -> bool:
+    """请求是否带条件头"""
+    return (
+        headers.get("if-none-match") is not None
+        or headers.get("if-modified-since") is not None
+    )
+
+
+def not_modified(headers: Mapping[str, str], version: datetime) -> bool:
+    """
+    客户端缓存的表示是否仍是当前版本（应返回 304）
+
+    Args:
+        headers: 请求头（键为小写，Starlette 的 Headers 不区分大小写）
+        version: 资源当前版本
+    """
+    if_none_match = headers.get("if-none-match")
+    if if_none_match is not None:
+        current = entity_tag(version)
+        for tag in if_none_match.split(","):
+            tag = tag.strip()
+            if tag == "*" or tag.removeprefix("W/") == current:
+                return True
+        return False
+
+    if_modified_since = headers.get("if-modified-since")
+    if if_modified_since is None:
+        return False
+    try:
+        since = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        # 无效日期按未带该头处理
+        return False
+    return _utc(version).replace(microsecond=0) <= _utc(since)
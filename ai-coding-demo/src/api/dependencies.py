@@ -3,19 +3,76 @@
 提供 FastAPI 的依赖注入
 """
 from fastapi import Depends
+import redis
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from typing import Annotated
+from typing import Annotated, Callable, Optional
 
 import sys
 import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 
-from infrastructure.database import get_db
+from config.settings import settings
+from infrastructure.database import get_async_db, get_db
+from infrastructure.existence_filter import UserExistenceFilter
+from infrastructure.repositories.async_user_repository_impl import AsyncSQLAlchemyUserRepository
+from infrastructure.repositories.cached_user_repository import CachedUserRepository, UserCache
 from infrastructure.repositories.user_repository_impl import SQLAlchemyUserRepository
+from domain.repositories.user_repository import UserRepository
+
+
+def _create_user_cache() -> Optional[UserCache]:
+    """按配置创建进程内共用的用户实体缓存（配置 REDIS_URL 时启用共享层）"""
+    if not settings.USER_CACHE_ENABLED:
+        return None
+
+    shared = None
+    if settings.REDIS_URL:
+        shared = redis.Redis.from_url(
+            settings.REDIS_URL,
+            socket_timeout=settings.REDIS_SOCKET_TIMEOUT_SECONDS,
+            socket_connect_timeout=settings.REDIS_SOCKET_TIMEOUT_SECONDS
+        )
+    return UserCache(
+        max_entries=settings.USER_CACHE_MAX_ENTRIES,
+        ttl_seconds=settings.USER_CACHE_TTL_SECONDS,
+        shared=shared,
+        shared_ttl_seconds=settings.USER_CACHE_SHARED_TTL_SECONDS
+    )
+
+
+user_cache = _create_user_cache()
+
+# 用户名/邮箱存在性过滤器，进程内共用；启用时由应用启动任务在后台构建（见 api.main）。
+# 每个进程的过滤器只知道本进程插入的用户，其他进程的插入要到下次重建才加入，
+# 因此只用来跳过查询（建议性）；注册唯一性仍以 create / create_many 的 ON CONFLICT 为准
+user_existence_filter = UserExistenceFilter(
+    capacity=settings.EXISTENCE_FILTER_CAPACITY,
+    false_positive_rate=settings.EXISTENCE_FILTER_FP_RATE
+)
 
 
 async def get_user_repository(
     session: Annotated[Session, Depends(get_db)]
-) -> SQLAlchemyUserRepository:
-    """获取用户仓储依赖"""
-    return SQLAlchemyUserRepository(session)
+) -> UserRepository:
+    """获取用户仓储依赖（启用用户缓存时包装为 CachedUserRepository）"""
+    repository = SQLAlchemyUserRepository(session, existence_filter=user_existence_filter)
+    if user_cache is None:
+        return repository
+    return CachedUserRepository(repository, user_cache)
+
+
+async def get_async_user_repository(
+    session: Annotated[AsyncSession, Depends(get_async_db)]
+) -> AsyncSQLAlchemyUserRepository:
+    """获取异步用户仓储依赖"""
+    return AsyncSQLAlchemyUserRepository(session, existence_filter=user_existence_filter)
+
+
+def user_repository_dependency() -> Callable:
+    """
+    按 DATABASE_ASYNC 配置选择用户仓储依赖
+
+    用法: repository = Depends(user_repository_dependency())
+    """
+    return get_async_user_repository if settings.DATABASE_ASYNC else get_user_repository
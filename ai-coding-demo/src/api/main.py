@@ -2,31 +2,90 @@
 
 实现用户管理 API，基于规范 SPEC-USER-001
 """
-from fastapi import FastAPI, HTTPException
+import asyncio
+import functools
+import inspect
+from datetime import timedelta
+
+from fastapi import Depends, FastAPI, HTTPException, Query, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response, StreamingResponse
 from pydantic import BaseModel, EmailStr, Field
-from typing import Optional
+from typing import AsyncIterator, Iterator, List, Optional, Union
 from uuid import UUID
 
 import sys
 import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from config.settings import settings
+from api.conditional import is_conditional, not_modified, validator_headers
+from api.dependencies import (
+    user_existence_filter,
+    user_repository_dependency
+)
 from domain.services.user_service import UserService
-from domain.models.user import User
-from domain.exceptions import (
-    UserAlreadyExistsError,
+from domain.models.user import User, UserRegistrationResult
+from domain.repositories.user_repository import AsyncUserRepository, UserRepository
+from domain.validation import PASSWORD_RULE, USERNAME_RULE, UserInputValidator
+# 与领域服务和基础设施抛出异常时使用同一个导入根，否则 except 子句匹配不到
+from src.domain.exceptions import (
+    BaseDomainError,
+    ConflictError,
     ValidationError,
-    DomainError
+    RateLimitError,
+    ServiceOverloadedError
+)
+from infrastructure.admission import AdmissionController
+from infrastructure.breached_passwords import BreachedPasswordChecker
+from infrastructure.database import (
+    AsyncSessionLocal,
+    PrimarySessionLocal,
+    SessionLocal,
+    replica_pool
+)
+from infrastructure.export import EXPORT_MEDIA_TYPES, export_chunks, export_chunks_async
+from infrastructure.export_jobs import (
+    ColumnarExportWriter,
+    ExportJob,
+    ExportJobRunner,
+    list_part_files
 )
+from infrastructure.hashing.calibration import calibrate_bcrypt_rounds
+from infrastructure.hashing.executor import PasswordHashingExecutor
+from infrastructure.hashing.hashers import BcryptHasher, create_hasher, create_registry
+from infrastructure.periodic import PeriodicTask
+from infrastructure.pool_metrics import pool_statuses
+from infrastructure.purge import UserPurgeJob
+from infrastructure.routing import read_your_writes
+from infrastructure.repositories.async_user_repository_impl import AsyncSQLAlchemyUserRepository
+from infrastructure.repositories.user_repository_impl import SQLAlchemyUserRepository
+# 与 UserService 使用同一个导入根
+from src.infrastructure.email import EmailService
+from src.infrastructure.rate_limiter import RateLimiter
+# 与各基础设施组件登记指标时使用同一个注册表模块
+from src.infrastructure.metrics import METRICS_CONTENT_TYPE, render_metrics
 
 
 class RegistrationRequest(BaseModel):
-    """用户注册请求模型"""
+    """
+    用户注册请求模型
+
+    长度约束取自 domain.validation 规则表，完整业务规则由 UserService 验证
+    """
     email: EmailStr = Field(..., description="用户邮箱")
-    password: str = Field(..., min_length=8, max_length=128, description="用户密码")
-    username: Optional[str] = Field(None, min_length=3, max_length=50, description="用户名")
+    password: str = Field(
+        ...,
+        min_length=PASSWORD_RULE.min_length,
+        max_length=PASSWORD_RULE.max_length,
+        description="用户密码"
+    )
+    username: Optional[str] = Field(
+        None,
+        min_length=USERNAME_RULE.min_length,
+        max_length=USERNAME_RULE.max_length,
+        description="用户名"
+    )
 
 
 class UserResponse(BaseModel):
@@ -48,6 +107,131 @@ class UserResponse(BaseModel):
             created_at=user.created_at.isoformat()
         )
 
+    @classmethod
+    def from_registration(cls, result: UserRegistrationResult) -> "UserResponse":
+        """从注册结果转换（新注册用户均为激活状态）"""
+        return cls(
+            id=result.user_id,
+            email=result.email,
+            username=result.username,
+            is_active=True,
+            created_at=result.created_at.isoformat()
+        )
+
+
+class UserPageResponse(BaseModel):
+    """用户分页响应模型"""
+    items: List[UserResponse]
+    next_cursor: Optional[str] = Field(None, description="下一页游标，为空表示没有下一页")
+
+
+class BatchGetUsersRequest(BaseModel):
+    """批量查询用户请求模型"""
+    ids: List[UUID] = Field(
+        ...,
+        min_length=1,
+        max_length=settings.USER_BATCH_GET_MAX_IDS,
+        description="用户ID列表"
+    )
+
+
+class BatchGetUsersResponse(BaseModel):
+    """批量查询用户响应模型"""
+    items: List[UserResponse] = Field(..., description="存在的用户，按请求中ID的顺序")
+    missing: List[UUID] = Field(..., description="不存在或已删除的用户ID，按请求中的顺序")
+
+
+class BatchRegistrationRecord(BaseModel):
+    """
+    批量注册中的一条记录
+
+    这里只约束类型，长度和格式由 UserService 逐条验证，单条记录无效不影响整批
+    """
+    username: Optional[str] = Field(None, description="用户名")
+    email: str = Field(..., description="用户邮箱")
+    password: str = Field(..., description="用户密码")
+    first_name: Optional[str] = Field(None, description="名字")
+    last_name: Optional[str] = Field(None, description="姓氏")
+    phone_number: Optional[str] = Field(None, description="电话号码")
+
+
+class BatchRegistrationRequest(BaseModel):
+    """批量注册请求模型"""
+    users: List[BatchRegistrationRecord] = Field(
+        ...,
+        min_length=1,
+        max_length=settings.USER_BATCH_REGISTER_MAX_ITEMS,
+        description="注册记录"
+    )
+
+
+class BatchRegistrationError(BaseModel):
+    """批量注册中一条记录的错误"""
+    error: str
+    detail: str
+    field: Optional[str] = Field(None, description="未通过验证的字段")
+
+
+class BatchRegistrationItemResponse(BaseModel):
+    """批量注册中一条记录的结果，user 与 errors 只有一个有值"""
+    index: int = Field(..., description="记录在请求中的下标")
+    user: Optional[UserResponse] = None
+    errors: List[BatchRegistrationError] = Field(default_factory=list)
+
+
+class BatchRegistrationResponse(BaseModel):
+    """批量注册响应模型"""
+    items: List[BatchRegistrationItemResponse] = Field(..., description="与请求顺序一致")
+    created: int = Field(..., description="注册成功的记录数")
+    failed: int = Field(..., description="验证失败或冲突的记录数")
+
+
+class ExportJobRequest(BaseModel):
+    """用户快照导出任务请求模型"""
+    format: str = Field("parquet", pattern="^(parquet|arrow)$", description="parquet / arrow")
+    row_group_size: int = Field(
+        settings.USER_EXPORT_JOB_ROW_GROUP_SIZE,
+        ge=1000,
+        le=1_000_000,
+        description="每个行组（Arrow IPC 为记录批）的行数"
+    )
+
+
+class ExportJobResponse(BaseModel):
+    """用户快照导出任务响应模型"""
+    id: UUID
+    format: str
+    status: str = Field(..., description="pending / running / completed / failed")
+    row_group_size: int
+    rows_exported: int = Field(..., description="已完成分片中的行数")
+    rows_total: Optional[int] = Field(None, description="提交时的用户数（估算进度用）")
+    progress: Optional[float] = Field(None, description="完成比例 0~1")
+    location: str = Field(..., description="输出目录")
+    files: List[str] = Field(..., description="已完成的分片文件，按顺序")
+    error: Optional[str] = None
+    created_at: str
+    started_at: Optional[str] = None
+    finished_at: Optional[str] = None
+
+    @classmethod
+    def from_job(cls, job: ExportJob, location: str) -> "ExportJobResponse":
+        """从导出任务转换（分片文件从输出目录列出）"""
+        return cls(
+            id=job.id,
+            format=job.format,
+            status=job.status.value,
+            row_group_size=job.row_group_size,
+            rows_exported=job.rows_exported,
+            rows_total=job.rows_total,
+            progress=job.progress,
+            location=location,
+            files=list_part_files(location) if os.path.isdir(location) else [],
+            error=job.error,
+            created_at=job.created_at.isoformat(),
+            started_at=job.started_at.isoformat() if job.started_at else None,
+            finished_at=job.finished_at.isoformat() if job.finished_at else None
+        )
+
 
 class ErrorResponse(BaseModel):
     """错误响应模型"""
@@ -73,9 +257,215 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# 写后读粘滞 cookie: 写入后 DATABASE_STICKY_SECONDS 内该客户端的读取走主库
+PRIMARY_STICKY_COOKIE = "db_primary_sticky"
+
+
+@app.middleware("http")
+async def route_reads_after_writes(request: Request, call_next):
+    """读写分离下保证读己之写: 请求内写入后的读取、以及写入后粘滞窗口内的请求都走主库"""
+    if not replica_pool.engines:
+        return await call_next(request)
+
+    with read_your_writes(sticky=PRIMARY_STICKY_COOKIE in request.cookies) as state:
+        response = await call_next(request)
+
+    if state.wrote:
+        response.set_cookie(
+            PRIMARY_STICKY_COOKIE,
+            "1",
+            max_age=settings.DATABASE_STICKY_SECONDS,
+            httponly=True,
+            samesite="lax"
+        )
+    return response
+
+
+def _create_default_hasher():
+    """按配置创建新密码使用的哈希算法"""
+    parameters = {
+        "bcrypt": {"rounds": settings.BCRYPT_ROUNDS},
+        "scrypt": {"ln": settings.SCRYPT_LN, "r": settings.SCRYPT_R, "p": settings.SCRYPT_P},
+        "argon2": {
+            "time_cost": settings.ARGON2_TIME_COST,
+            "memory_cost": settings.ARGON2_MEMORY_COST_KB,
+            "parallelism": settings.ARGON2_PARALLELISM
+        },
+    }
+    scheme = settings.PASSWORD_HASH_SCHEME
+    return create_hasher(scheme, **parameters.get(scheme, {}))
+
+
+# 密码哈希进程池及其准入控制（规范: SPEC-USER-001, 4.1 性能要求）
+hashing_admission = AdmissionController(
+    max_in_flight=(
+        settings.ADMISSION_MAX_IN_FLIGHT or settings.HASHING_POOL_SIZE or os.cpu_count() or 1
+    ),
+    max_queue=settings.ADMISSION_MAX_QUEUE,
+    queue_timeout=settings.ADMISSION_QUEUE_TIMEOUT_SECONDS,
+    retry_after=settings.ADMISSION_RETRY_AFTER_SECONDS,
+    name="password_hashing"
+)
+password_hasher = PasswordHashingExecutor(
+    max_workers=settings.HASHING_POOL_SIZE,
+    hashers=create_registry(_create_default_hasher()),
+    max_tasks_per_child=settings.HASHING_MAX_TASKS_PER_CHILD,
+    admission=hashing_admission
+)
+
+# 泄露密码过滤器以只读 mmap 方式加载，启动开销和常驻内存与密码库大小无关
+breached_passwords = (
+    BreachedPasswordChecker.from_file(settings.BREACHED_PASSWORDS_FILTER_PATH)
+    if settings.BREACHED_PASSWORDS_FILTER_PATH
+    else BreachedPasswordChecker()
+)
+
+
+def _load_user_identities():
+    """流式读取全部用户名和邮箱，用于重建存在性过滤器"""
+    with SessionLocal() as session:
+        yield from SQLAlchemyUserRepository(session).iter_identities()
+
+
+def _reconcile_user_counts():
+    """按实际数据校准用户数量计数器"""
+    with PrimarySessionLocal() as session:
+        SQLAlchemyUserRepository(session).reconcile_counts()
+
+
+# 用户数量计数器定期校准（CountMode.MAINTAINED）
+user_count_reconciler = PeriodicTask(
+    "user-count-reconcile",
+    _reconcile_user_counts,
+    settings.USER_COUNTS_RECONCILE_SECONDS
+)
+
+# 过期注册数据分批清理（在主库上执行）
+user_purge_job = UserPurgeJob(
+    PrimarySessionLocal,
+    token_retention=timedelta(days=settings.USER_PURGE_TOKEN_RETENTION_DAYS),
+    account_retention=timedelta(days=settings.USER_PURGE_UNVERIFIED_RETENTION_DAYS),
+    chunk_size=settings.USER_PURGE_CHUNK_SIZE,
+    pause_seconds=settings.USER_PURGE_PAUSE_SECONDS,
+    max_chunks_per_run=settings.USER_PURGE_MAX_CHUNKS_PER_RUN,
+    repository_factory=lambda session: SQLAlchemyUserRepository(
+        session, existence_filter=user_existence_filter
+    )
+)
+user_purge_task = PeriodicTask(
+    "user-purge",
+    user_purge_job.run,
+    settings.USER_PURGE_INTERVAL_SECONDS,
+    run_immediately=False
+)
+
+# 用户快照导出任务: 请求只写入任务记录，后台线程逐个执行（任务状态在主库，用户读取走只读副本）
+user_export_jobs = ExportJobRunner(
+    PrimarySessionLocal,
+    settings.USER_EXPORT_JOB_DIR,
+    read_session_factory=SessionLocal,
+    chunk_size=settings.USER_EXPORT_JOB_CHUNK_SIZE,
+    row_groups_per_file=settings.USER_EXPORT_JOB_ROW_GROUPS_PER_FILE,
+    pause_seconds=settings.USER_EXPORT_JOB_PAUSE_SECONDS,
+    lease=timedelta(seconds=settings.USER_EXPORT_JOB_LEASE_SECONDS)
+)
+user_export_task = PeriodicTask(
+    "user-export-jobs",
+    user_export_jobs.run_pending,
+    settings.USER_EXPORT_JOB_POLL_SECONDS
+)
+
+# 只读副本复制延迟探测（延迟超过阈值的副本不参与读路由）
+replica_lag_monitor = PeriodicTask(
+    "database-replica-lag",
+    replica_pool.check,
+    settings.DATABASE_REPLICA_LAG_CHECK_SECONDS
+)
+
+
+# 用户服务的进程内共用组件
+email_service = EmailService()
+rate_limiter = RateLimiter()
+user_input_validator = UserInputValidator(is_weak_password=breached_passwords)
+
+
+def get_user_service(
+    repository: Union[UserRepository, AsyncUserRepository] = Depends(
+        user_repository_dependency()
+    )
+) -> UserService:
+    """
+    用户服务依赖: 每个请求使用自己的仓储，哈希进程池和验证器进程内共用
 
-# 用户服务实例 (实际应用中应该通过依赖注入)
-user_service = UserService()
+    配置 DATABASE_ASYNC 时传入 AsyncUserRepository，端点调用的异步服务方法直接 await 仓储
+    """
+    return UserService(
+        repository,
+        email_service,
+        rate_limiter,
+        password_hasher=password_hasher,
+        validator=user_input_validator
+    )
+
+
+@app.on_event("startup")
+async def on_startup():
+    """
+    启动时校准 bcrypt cost 并预热密码哈希进程池，避免首批注册请求承担进程启动开销；
+    按配置在后台构建用户名/邮箱存在性过滤器；后台初始化并定期校准用户数量计数器；
+    按配置定期清理过期注册数据；安装了 pyarrow 时执行导出任务（含上次中断的任务）；
+    配置了只读副本时开始探测复制延迟
+    """
+    default_hasher = password_hasher.hashers.default
+    if settings.BCRYPT_AUTO_CALIBRATE and isinstance(default_hasher, BcryptHasher):
+        loop = asyncio.get_running_loop()
+        result = await loop.run_in_executor(
+            None,
+            functools.partial(
+                calibrate_bcrypt_rounds,
+                budget_ms=settings.BCRYPT_LATENCY_BUDGET_MS,
+                min_rounds=settings.BCRYPT_MIN_ROUNDS,
+                max_rounds=settings.BCRYPT_MAX_ROUNDS
+            )
+        )
+        default_hasher.rounds = result.rounds
+
+    if settings.HASHING_WARM_START:
+        await password_hasher.warm_up()
+    else:
+        password_hasher.start()
+
+    if settings.EXISTENCE_FILTER_ENABLED:
+        # 后台构建，构建完成前仓储直接查询数据库
+        user_existence_filter.start(
+            _load_user_identities,
+            rebuild_interval_seconds=settings.EXISTENCE_FILTER_REBUILD_SECONDS
+        )
+
+    user_count_reconciler.start()
+
+    if settings.USER_PURGE_ENABLED:
+        user_purge_task.start()
+
+    if ColumnarExportWriter.available():
+        user_export_task.start()
+
+    if replica_pool.engines:
+        replica_lag_monitor.start()
+
+
+@app.on_event("shutdown")
+async def on_shutdown():
+    """关闭密码哈希进程池，释放泄露密码过滤器映射，停止后台维护任务"""
+    password_hasher.shutdown()
+    breached_passwords.close()
+    user_existence_filter.stop()
+    user_count_reconciler.stop()
+    user_purge_job.cancel()
+    user_purge_task.stop()
+    user_export_jobs.cancel()
+    user_export_task.stop()
+    replica_lag_monitor.stop()
 
 
 @app.get("/", tags=["Health"])
@@ -90,25 +480,36 @@ async def root():
 
 @app.get("/health", tags=["Health"])
 async def health_check():
-    """详细健康检查"""
+    """详细健康检查，连接池全部借出（请求需排队等待连接）时报告 degraded"""
+    pools = pool_statuses()
     return {
-        "status": "healthy",
+        "status": "degraded" if any(pool.get("saturated") for pool in pools) else "healthy",
         "service": "user-management",
-        "dependencies": []
+        "dependencies": [{"name": "database", "pools": pools}]
     }
 
 
+@app.get("/metrics", tags=["Health"])
+async def metrics():
+    """Prometheus 指标端点（规范: SPEC-USER-001, 4.3 可观测性要求）"""
+    return Response(content=render_metrics(), media_type=METRICS_CONTENT_TYPE)
+
+
 @app.post(
     "/api/v1/users/register",
     response_model=UserResponse,
     responses={
         400: {"model": ErrorResponse, "description": "验证错误"},
         409: {"model": ErrorResponse, "description": "用户已存在"},
-        500: {"model": ErrorResponse, "description": "服务器错误"}
+        500: {"model": ErrorResponse, "description": "服务器错误"},
+        503: {"model": ErrorResponse, "description": "服务繁忙，稍后重试"}
     },
     tags=["Users"]
 )
-async def register_user(request: RegistrationRequest):
+async def register_user(
+    request: RegistrationRequest,
+    user_service: UserService = Depends(get_user_service)
+):
     """
     用户注册端点
 
@@ -123,18 +524,29 @@ async def register_user(request: RegistrationRequest):
     **失败响应:**
     - 400: 输入验证失败
     - 409: 邮箱或用户名已存在
+    - 503: 哈希队列已满，按 Retry-After 重试
     """
     try:
         # 调用领域服务进行用户注册
-        user = user_service.register_user(
+        user = await user_service.register_user_async(
             email=request.email,
             password=request.password,
             username=request.username
         )
 
-        return UserResponse.from_domain(user)
+        return UserResponse.from_registration(user)
 
-    except UserAlreadyExistsError as e:
+    except ServiceOverloadedError as e:
+        raise HTTPException(
+            status_code=503,
+            detail={
+                "error": "SERVICE_OVERLOADED",
+                "detail": str(e)
+            },
+            headers={"Retry-After": str(e.retry_after)}
+        )
+
+    except ConflictError as e:
         raise HTTPException(
             status_code=409,
             detail={
@@ -152,7 +564,7 @@ async def register_user(request: RegistrationRequest):
             }
         )
 
-    except DomainError as e:
+    except BaseDomainError as e:
         raise HTTPException(
             status_code=500,
             detail={
@@ -171,27 +583,339 @@ async def register_user(request: RegistrationRequest):
         )
 
 
+@app.post(
+    "/api/v1/users:batchRegister",
+    response_model=BatchRegistrationResponse,
+    responses={
+        429: {"model": ErrorResponse, "description": "请求过于频繁"},
+        503: {"model": ErrorResponse, "description": "服务繁忙，稍后重试"}
+    },
+    tags=["Users"]
+)
+async def batch_register_users(
+    request: BatchRegistrationRequest,
+    http_request: Request,
+    user_service: UserService = Depends(get_user_service)
+):
+    """
+    批量注册端点（合作方批量导入）
+
+    基于规范: SPEC-USER-001, 2.1 核心功能 / 4.1 性能要求
+
+    每条记录的业务规则与单个注册相同；整批一次验证、冲突查询按集合进行、
+    密码哈希在进程池中并行计算、分块插入、验证邮件整批发送。
+
+    **成功响应:** 200 + 与请求顺序一致的每条记录结果（成功的用户或错误列表）
+    **失败响应:**
+    - 429: 超过速率限制（整批计一次请求）
+    - 503: 哈希队列已满，按 Retry-After 重试（整批未创建）
+    """
+    try:
+        items = await user_service.register_many_async(
+            [record.model_dump() for record in request.users],
+            ip_address=http_request.client.host if http_request.client else None,
+            chunk_size=settings.USER_BATCH_REGISTER_CHUNK_SIZE
+        )
+
+    except ServiceOverloadedError as e:
+        raise HTTPException(
+            status_code=503,
+            detail={
+                "error": "SERVICE_OVERLOADED",
+                "detail": str(e)
+            },
+            headers={"Retry-After": str(e.retry_after)}
+        )
+
+    except RateLimitError as e:
+        raise HTTPException(
+            status_code=429,
+            detail={
+                "error": "RATE_LIMIT_EXCEEDED",
+                "detail": str(e)
+            },
+            headers={"Retry-After": str(e.retry_after)}
+        )
+
+    responses = [
+        BatchRegistrationItemResponse(
+            index=item.index,
+            user=UserResponse.from_registration(item.result) if item.succeeded else None,
+            errors=[
+                BatchRegistrationError(
+                    error=error.code, detail=error.message, field=getattr(error, "field", None)
+                )
+                for error in item.errors
+            ]
+        )
+        for item in items
+    ]
+    created = sum(item.succeeded for item in items)
+    return BatchRegistrationResponse(
+        items=responses, created=created, failed=len(items) - created
+    )
+
+
+@app.get(
+    "/api/v1/users",
+    response_model=UserPageResponse,
+    responses={
+        400: {"model": ErrorResponse, "description": "游标无效"}
+    },
+    tags=["Users"]
+)
+async def list_users(
+    cursor: Optional[str] = Query(None, description="上一页返回的 next_cursor"),
+    limit: int = Query(20, ge=1, le=100, description="每页数量"),
+    is_active: Optional[bool] = Query(None, description="按激活状态过滤"),
+    repository=Depends(user_repository_dependency())
+):
+    """
+    用户列表（游标分页）
+
+    按注册时间排序，每页代价与页码无关（规范: SPEC-USER-001, 4.1 性能要求）
+
+    **成功响应:** 200 + 本页用户和 next_cursor
+    **失败响应:**
+    - 400: 游标无效
+    """
+    try:
+        page = repository.find_page(after=cursor, limit=limit, is_active=is_active)
+        if inspect.isawaitable(page):
+            page = await page
+
+    except ValidationError as e:
+        raise HTTPException(
+            status_code=400,
+            detail={
+                "error": "VALIDATION_ERROR",
+                "detail": str(e)
+            }
+        )
+
+    return UserPageResponse(
+        items=[UserResponse.from_domain(user) for user in page.items],
+        next_cursor=page.next_cursor
+    )
+
+
+@app.post(
+    "/api/v1/users:batchGet",
+    response_model=BatchGetUsersResponse,
+    tags=["Users"]
+)
+async def batch_get_users(
+    request: BatchGetUsersRequest,
+    repository=Depends(user_repository_dependency())
+):
+    """
+    批量查询用户
+
+    一次请求解析多个用户ID，仓储一次 IN 查询（启用用户缓存时只查询未命中的ID），
+    代替逐个调用 GET /api/v1/users/{user_id}（规范: SPEC-USER-001, 4.1 性能要求）
+
+    **参数:**
+    - ids: 用户ID列表，最多 USER_BATCH_GET_MAX_IDS 个，重复的ID只返回一次
+
+    **成功响应:** 200 + 按请求顺序排列的用户和不存在的ID
+    """
+    users = repository.find_by_ids(request.ids)
+    if inspect.isawaitable(users):
+        users = await users
+
+    found = {user.id: user for user in users if not user.is_deleted}
+    requested = list(dict.fromkeys(request.ids))
+    return BatchGetUsersResponse(
+        items=[UserResponse.from_domain(found[i]) for i in requested if i in found],
+        missing=[i for i in requested if i not in found]
+    )
+
+
+def _export_users(export_format: str, is_active: Optional[bool]) -> Iterator[bytes]:
+    """导出全部用户（同步仓储）；会话在生成器内打开，响应结束或客户端断开时关闭"""
+    with SessionLocal() as session:
+        users = SQLAlchemyUserRepository(session).iter_users(
+            settings.USER_EXPORT_BATCH_SIZE, is_active=is_active
+        )
+        yield from export_chunks(users, export_format, settings.USER_EXPORT_CHUNK_BYTES)
+
+
+async def _export_users_async(
+    export_format: str,
+    is_active: Optional[bool]
+) -> AsyncIterator[bytes]:
+    """导出全部用户（异步仓储），见 _export_users"""
+    async with AsyncSessionLocal() as session:
+        users = AsyncSQLAlchemyUserRepository(session).iter_users(
+            settings.USER_EXPORT_BATCH_SIZE, is_active=is_active
+        )
+        async for chunk in export_chunks_async(
+            users, export_format, settings.USER_EXPORT_CHUNK_BYTES
+        ):
+            yield chunk
+
+
+@app.get(
+    "/api/v1/users:export",
+    response_class=StreamingResponse,
+    responses={
+        200: {
+            "content": {media_type: {} for media_type in EXPORT_MEDIA_TYPES.values()},
+            "description": "NDJSON（每行一个用户）或 CSV（首行为表头）"
+        }
+    },
+    tags=["Users"]
+)
+async def export_users(
+    export_format: str = Query(
+        "ndjson", alias="format", pattern="^(ndjson|csv)$", description="ndjson / csv"
+    ),
+    is_active: Optional[bool] = Query(None, description="按激活状态过滤")
+):
+    """
+    导出全部未删除用户（流式）
+
+    按注册时间顺序经服务端游标逐批读取、逐块发送，内存占用与用户数无关；
+    客户端读取慢时生成器随发送暂停，不在进程内堆积缓冲（规范: SPEC-USER-001, 4.1 性能要求）。
+    导出期间占用一个数据库连接。
+
+    **成功响应:** 200 + 导出文件（Content-Disposition: attachment）
+    """
+    if settings.DATABASE_ASYNC:
+        chunks = _export_users_async(export_format, is_active)
+    else:
+        chunks = _export_users(export_format, is_active)
+
+    return StreamingResponse(
+        chunks,
+        media_type=EXPORT_MEDIA_TYPES[export_format],
+        headers={"Content-Disposition": f'attachment; filename="users.{export_format}"'}
+    )
+
+
+@app.post(
+    "/api/v1/exports",
+    response_model=ExportJobResponse,
+    status_code=202,
+    responses={
+        503: {"model": ErrorResponse, "description": "未安装 pyarrow"}
+    },
+    tags=["Exports"]
+)
+def create_export_job(request: ExportJobRequest):
+    """
+    提交用户快照导出任务
+
+    把全部未删除用户写成 Parquet 或 Arrow IPC 分片文件，供分析使用。
+    请求只写入任务记录，后台线程分批读取只读副本并限速执行，不占用请求路径；
+    中断后从最后一个完成的分片继续（规范: SPEC-USER-001, 4.1 性能要求）
+
+    **参数:**
+    - format: parquet（默认）/ arrow
+    - row_group_size: 行组大小，默认 USER_EXPORT_JOB_ROW_GROUP_SIZE
+
+    **成功响应:** 202 + 任务（用 GET /api/v1/exports/{job_id} 查询进度）
+    **失败响应:**
+    - 503: 服务端未安装 pyarrow
+    """
+    if not ColumnarExportWriter.available():
+        raise HTTPException(
+            status_code=503,
+            detail={
+                "error": "EXPORT_UNAVAILABLE",
+                "detail": "pyarrow 未安装，无法导出列式文件"
+            }
+        )
+
+    job = user_export_jobs.submit(request.format, request.row_group_size)
+    return ExportJobResponse.from_job(job, user_export_jobs.job_dir(job.id))
+
+
+@app.get(
+    "/api/v1/exports/{job_id}",
+    response_model=ExportJobResponse,
+    responses={
+        404: {"model": ErrorResponse, "description": "任务不存在"}
+    },
+    tags=["Exports"]
+)
+def get_export_job(job_id: UUID):
+    """
+    查询用户快照导出任务的状态和进度
+
+    **成功响应:** 200 + 任务状态、已导出行数、完成比例和已完成的分片文件
+    **失败响应:**
+    - 404: 任务不存在
+    """
+    job = user_export_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(
+            status_code=404,
+            detail={
+                "error": "EXPORT_JOB_NOT_FOUND",
+                "detail": f"导出任务不存在: {job_id}"
+            }
+        )
+    return ExportJobResponse.from_job(job, user_export_jobs.job_dir(job.id))
+
+
+def _user_not_found(user_id: UUID) -> HTTPException:
+    """用户不存在（含已删除）"""
+    return HTTPException(
+        status_code=404,
+        detail={
+            "error": "USER_NOT_FOUND",
+            "detail": f"用户不存在: {user_id}"
+        }
+    )
+
+
 @app.get(
     "/api/v1/users/{user_id}",
     response_model=UserResponse,
     responses={
+        304: {"description": "客户端缓存的版本仍是最新（条件请求）"},
         404: {"model": ErrorResponse, "description": "用户不存在"}
     },
     tags=["Users"]
 )
-async def get_user(user_id: UUID):
+async def get_user(
+    user_id: UUID,
+    request: Request,
+    response: Response,
+    repository=Depends(user_repository_dependency())
+):
     """
     获取用户信息
 
+    响应带 ETag（由 updated_at 生成）和 Last-Modified。轮询的客户端带上
+    If-None-Match / If-Modified-Since 时先只查询版本（启用用户缓存时优先取缓存中的版本），
+    版本未变则返回 304，不加载实体、不序列化响应（规范: SPEC-USER-001, 4.1 性能要求）
+
     **参数:**
     - user_id: 用户UUID
 
-    **成功响应:** 200 + 用户信息
+    **成功响应:** 200 + 用户信息；304: 版本未变（无响应体）
     **失败响应:**
     - 404: 用户不存在
     """
-    # TODO: 实现获取用户逻辑
-    raise HTTPException(status_code=501, detail="Not implemented yet")
+    if is_conditional(request.headers):
+        version = repository.find_version(user_id)
+        if inspect.isawaitable(version):
+            version = await version
+        if version is None:
+            raise _user_not_found(user_id)
+        if not_modified(request.headers, version):
+            return Response(status_code=304, headers=validator_headers(version))
+
+    user = repository.find_by_id(user_id)
+    if inspect.isawaitable(user):
+        user = await user
+    if user is None or user.is_deleted:
+        raise _user_not_found(user_id)
+
+    response.headers.update(validator_headers(user.updated_at or user.created_at))
+    return UserResponse.from_domain(user)
 
 
 @app.exception_handler(Exception)
@@ -108,6 +108,26 @@ class RateLimitError(BaseDomainError):
         super().__init__(message, code)
 
 
+class ServiceOverloadedError(BaseDomainError):
+    """
+    服务过载错误
+
+    准入控制拒绝请求时抛出，retry_after 语义与 RateLimitError 相同（秒）
+    实现规范: SPEC-USER-001, 4.1 性能要求
+    """
+
+    def __init__(
+        self,
+        message: str,
+        retry_after: int,
+        reason: Optional[str] = None,
+        code: str = "SERVICE_OVERLOADED"
+    ):
+        self.retry_after = retry_after
+        self.reason = reason
+        super().__init__(message, code)
+
+
 class BusinessRuleError(BaseDomainError):
     """
     业务规则错误
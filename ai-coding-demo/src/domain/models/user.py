@@ -5,10 +5,13 @@
 定义用户实体及其行为
 """
 
-from dataclasses import dataclass, field
+import hashlib
+from dataclasses import dataclass, field, fields
 from datetime import datetime
 from uuid import UUID
-from typing import Optional
+from typing import Any, Dict, List, Optional, Set
+
+from src.domain.exceptions import BaseDomainError, ConflictError
 
 
 @dataclass
@@ -17,6 +20,9 @@ class User:
     用户实体
 
     实现规范: SPEC-DATA-USER-001
+
+    仓储加载或写入后调用 mark_persisted()，此后记录修改过的字段（changed_fields），
+    仓储更新时只写入这些列
     """
 
     # 主键
@@ -30,9 +36,9 @@ class User:
     last_name: Optional[str] = None
     phone_number: Optional[str] = None
 
-    # 邮箱验证
+    # 邮箱验证（只保存 token 的摘要，见 hash_verification_token）
     email_verified: bool = False
-    email_verification_token: Optional[UUID] = None
+    email_verification_token_hash: Optional[str] = None
     email_verification_expires: Optional[datetime] = None
 
     # 时间戳
@@ -49,6 +55,35 @@ class User:
         self.username = self.username.lower()
         self.email = self.email.lower()
 
+    def __setattr__(self, name: str, value: Any) -> None:
+        """开始记录后，字段第一次被赋值时保存其持久化时的值"""
+        persisted = self.__dict__.get("_persisted_values")
+        if persisted is not None and name in TRACKED_USER_FIELDS and name not in persisted:
+            persisted[name] = self.__dict__.get(name)
+        object.__setattr__(self, name, value)
+
+    def mark_persisted(self) -> None:
+        """标记当前状态与数据库一致，并开始记录修改的字段"""
+        object.__setattr__(self, "_persisted_values", {})
+
+    @property
+    def changed_fields(self) -> Optional[Set[str]]:
+        """
+        自 mark_persisted() 以来值发生变化的字段
+
+        Returns:
+            字段名集合；未标记过的实体（不是从仓储加载的）返回 None，表示无法判断
+        """
+        persisted = self.__dict__.get("_persisted_values")
+        if persisted is None:
+            return None
+        return {name for name, value in persisted.items() if getattr(self, name) != value}
+
+    def persisted_value(self, name: str) -> Any:
+        """字段在 mark_persisted() 时的值（未修改时即当前值）"""
+        persisted = self.__dict__.get("_persisted_values") or {}
+        return persisted.get(name, getattr(self, name))
+
     @property
     def full_name(self) -> str:
         """获取全名"""
@@ -67,7 +102,7 @@ class User:
     def verify_email(self) -> None:
         """验证邮箱"""
         self.email_verified = True
-        self.email_verification_token = None
+        self.email_verification_token_hash = None
         self.email_verification_expires = None
         self.updated_at = datetime.utcnow()
 
@@ -88,6 +123,24 @@ class User:
         self.updated_at = datetime.utcnow()
 
 
+def hash_verification_token(token: Any) -> str:
+    """
+    计算邮箱验证 token 的摘要（规范: SPEC-USER-001, 3.3 业务规则）
+
+    数据库只保存摘要并按摘要做索引点查，原始 token 只出现在验证邮件中。
+    token 是 128 位随机 UUID，无需加盐或慢哈希。
+
+    Returns:
+        64 位十六进制 SHA-256 摘要
+    """
+    normalized = str(token).strip().lower()
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+
+# 记录修改的字段（主键不可修改）
+TRACKED_USER_FIELDS = frozenset(f.name for f in fields(User)) - {"id"}
+
+
 @dataclass
 class UserRegistrationResult:
     """
@@ -115,6 +168,54 @@ class UserRegistrationResult:
         }
 
 
+@dataclass
+class BatchRegistrationItem:
+    """
+    批量注册中一条记录的结果
+
+    result 为注册成功的结果；errors 为验证错误（可能多个字段）或冲突错误，二者只有一个有值
+    """
+
+    index: int
+    result: Optional[UserRegistrationResult] = None
+    errors: List[BaseDomainError] = field(default_factory=list)
+
+    @property
+    def succeeded(self) -> bool:
+        """是否注册成功"""
+        return self.result is not None
+
+
+@dataclass
+class BulkCreateResult:
+    """
+    批量创建用户结果
+
+    created 为成功创建的用户（按输入顺序），
+    conflicts 为冲突记录: 输入下标 → 冲突错误（USERNAME_TAKEN / EMAIL_ALREADY_REGISTERED）
+    """
+
+    created: List[User] = field(default_factory=list)
+    conflicts: Dict[int, ConflictError] = field(default_factory=dict)
+
+    def merge(self, other: "BulkCreateResult") -> None:
+        """合并另一批次的结果"""
+        self.created.extend(other.created)
+        self.conflicts.update(other.conflicts)
+
+
+@dataclass
+class UserPage:
+    """
+    用户分页结果
+
+    next_cursor 为 None 表示没有下一页
+    """
+
+    items: List[User]
+    next_cursor: Optional[str] = None
+
+
 @dataclass
 class UserProfile:
     """
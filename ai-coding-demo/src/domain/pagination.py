@@ -0,0 +1,49 @@
+"""
+游标分页
+
+基于规范: SPEC-USER-001, 4.1 性能要求
+按 (created_at, id) 排序的 keyset 分页: 每页都是一次索引范围扫描，
+翻到第 N 页与第 1 页代价相同，并发插入也不会造成跳行或重复。
+
+游标对调用方不透明（base64url 编码），只能原样传回。
+"""
+
+import base64
+import json
+from dataclasses import dataclass
+from datetime import datetime
+from uuid import UUID
+
+from src.domain.exceptions import ValidationError
+
+
+@dataclass(frozen=True)
+class PageCursor:
+    """
+    分页游标: 上一页最后一条记录的排序键
+    """
+
+    created_at: datetime
+    id: UUID
+
+    def encode(self) -> str:
+        """编码为不透明字符串"""
+        payload = json.dumps(
+            [self.created_at.isoformat(), str(self.id)], separators=(",", ":")
+        )
+        return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+    @classmethod
+    def decode(cls, cursor: str) -> "PageCursor":
+        """
+        解码游标
+
+        Raises:
+            ValidationError: 游标格式无效
+        """
+        try:
+            padded = cursor + "=" * (-len(cursor) % 4)
+            created_at, user_id = json.loads(base64.urlsafe_b64decode(padded))
+            return cls(created_at=datetime.fromisoformat(created_at), id=UUID(user_id))
+        except (ValueError, TypeError):
+            raise ValidationError("分页游标无效", field="cursor")
@@ -5,10 +5,27 @@
 """
 
 from abc import ABC, abstractmethod
-from typing import Optional, List
+from datetime import datetime
+from enum import Enum
+from typing import AsyncIterator, Iterable, Iterator, Optional, List, Sequence, Set
 from uuid import UUID
 
-from src.domain.models.user import User
+from src.domain.models.user import BulkCreateResult, User, UserPage
+
+
+class CountMode(str, Enum):
+    """
+    用户计数方式（规范: SPEC-USER-001, 4.1 性能要求）
+
+    EXACT: COUNT(*)，精确，代价随表大小线性增长
+    ESTIMATED: 数据库查询规划器的行数估计（PostgreSQL），不扫描表；
+        其他数据库退回 EXACT
+    MAINTAINED: 按状态组合维护的计数器，写入时同事务更新并定期校准，O(1)
+    """
+
+    EXACT = "exact"
+    ESTIMATED = "estimated"
+    MAINTAINED = "maintained"
 
 
 class UserRepository(ABC):
@@ -35,6 +52,22 @@ class UserRepository(ABC):
         """
         pass
 
+    @abstractmethod
+    def create_many(self, users: Sequence[User], chunk_size: int = 1000) -> BulkCreateResult:
+        """
+        批量创建用户（用于数据迁移和批量导入）
+
+        每个分块一个事务；冲突的行被跳过并按输入下标报告，不影响同一分块中的其他行
+
+        Args:
+            users: 用户实体列表
+            chunk_size: 每个事务插入的行数
+
+        Returns:
+            BulkCreateResult: 成功创建的用户和冲突记录
+        """
+        pass
+
     @abstractmethod
     def update(self, user: User) -> User:
         """
@@ -77,6 +110,35 @@ class UserRepository(ABC):
         """
         pass
 
+    @abstractmethod
+    def find_by_ids(self, user_ids: Sequence[UUID]) -> List[User]:
+        """
+        通过ID批量查找用户（一次查询）
+
+        Args:
+            user_ids: 用户ID列表
+
+        Returns:
+            存在的用户，按 user_ids 中首次出现的顺序排列（重复的ID只返回一次），
+            不存在的ID跳过
+        """
+        pass
+
+    @abstractmethod
+    def find_version(self, user_id: UUID) -> Optional[datetime]:
+        """
+        查询用户的版本（updated_at），用于条件请求
+
+        只读取版本列，不加载实体（规范: SPEC-USER-001, 4.1 性能要求）
+
+        Args:
+            user_id: 用户ID
+
+        Returns:
+            未删除用户的版本，用户不存在或已删除时返回 None
+        """
+        pass
+
     @abstractmethod
     def find_by_username(self, username: str) -> Optional[User]:
         """
@@ -108,8 +170,10 @@ class UserRepository(ABC):
         """
         通过验证token查找用户
 
+        实现按 token 摘要（hash_verification_token）点查，不保存也不扫描原始 token
+
         Args:
-            token: 验证token
+            token: 验证token（邮件链接中的原始值）
 
         Returns:
             用户实体或None
@@ -139,10 +203,58 @@ class UserRepository(ABC):
         pass
 
     @abstractmethod
-    def count(
+    def find_page(
+        self,
+        after: Optional[str] = None,
+        limit: int = 100,
+        is_active: Optional[bool] = None,
+        is_deleted: Optional[bool] = False
+    ) -> UserPage:
+        """
+        按 (created_at, id) 游标分页查找用户
+
+        与 find_many 的 offset 分页不同，每页代价固定，并发插入不会造成跳行或重复
+
+        Args:
+            after: 上一页返回的 next_cursor（None 表示第一页）
+            limit: 每页数量
+            is_active: 是否激活（None表示不过滤）
+            is_deleted: 是否删除（默认只返回未删除的）
+
+        Returns:
+            UserPage: 本页用户和下一页游标
+
+        Raises:
+            ValidationError: 游标无效
+        """
+        pass
+
+    @abstractmethod
+    def iter_users(
         self,
+        batch_size: int = 1000,
         is_active: Optional[bool] = None,
         is_deleted: Optional[bool] = False
+    ) -> Iterator[User]:
+        """
+        按 (created_at, id) 顺序流式读取用户（用于全量导出）
+
+        使用服务端游标，每次从数据库取 batch_size 行，内存占用与总行数无关；
+        迭代期间占用一个数据库连接和事务
+
+        Args:
+            batch_size: 每次从游标读取的行数
+            is_active: 是否激活（None表示不过滤）
+            is_deleted: 是否删除（默认只返回未删除的）
+        """
+        pass
+
+    @abstractmethod
+    def count(
+        self,
+        is_active: Optional[bool] = None,
+        is_deleted: Optional[bool] = False,
+        mode: CountMode = CountMode.EXACT
     ) -> int:
         """
         统计用户数量
@@ -150,12 +262,22 @@ class UserRepository(ABC):
         Args:
             is_active: 是否激活
             is_deleted: 是否删除
+            mode: 计数方式，仪表盘等允许近似值的场景应使用 ESTIMATED 或 MAINTAINED
 
         Returns:
             用户数量
         """
         pass
 
+    @abstractmethod
+    def reconcile_counts(self) -> None:
+        """
+        按实际数据重算 MAINTAINED 计数器
+
+        应定期执行，修正计数器与数据之间的偏差
+        """
+        pass
+
     @abstractmethod
     def username_exists(self, username: str) -> bool:
         """
@@ -169,6 +291,32 @@ class UserRepository(ABC):
         """
         pass
 
+    @abstractmethod
+    def find_existing_usernames(self, usernames: Iterable[str]) -> Set[str]:
+        """
+        批量检查用户名是否存在（一次查询）
+
+        Args:
+            usernames: 候选用户名（小写）
+
+        Returns:
+            其中已存在的用户名
+        """
+        pass
+
+    @abstractmethod
+    def find_existing_emails(self, emails: Iterable[str]) -> Set[str]:
+        """
+        批量检查邮箱是否存在（一次查询）
+
+        Args:
+            emails: 候选邮箱（小写）
+
+        Returns:
+            其中已存在的邮箱
+        """
+        pass
+
     @abstractmethod
     def email_exists(self, email: str) -> bool:
         """
@@ -181,3 +329,133 @@ class UserRepository(ABC):
             是否存在
         """
         pass
+
+
+class AsyncUserRepository(ABC):
+    """
+    用户仓储接口（异步）
+
+    方法语义与 UserRepository 相同，供 async 端点在事件循环中直接 await，
+    不阻塞其他请求
+    """
+
+    @abstractmethod
+    async def create(self, user: User) -> User:
+        """创建新用户，见 UserRepository.create"""
+        pass
+
+    @abstractmethod
+    async def create_many(
+        self,
+        users: Sequence[User],
+        chunk_size: int = 1000
+    ) -> BulkCreateResult:
+        """批量创建用户，见 UserRepository.create_many"""
+        pass
+
+    @abstractmethod
+    async def update(self, user: User) -> User:
+        """更新用户，见 UserRepository.update"""
+        pass
+
+    @abstractmethod
+    async def delete(self, user_id: UUID) -> None:
+        """删除用户，见 UserRepository.delete"""
+        pass
+
+    @abstractmethod
+    async def find_by_id(self, user_id: UUID) -> Optional[User]:
+        """通过ID查找用户，见 UserRepository.find_by_id"""
+        pass
+
+    @abstractmethod
+    async def find_by_ids(self, user_ids: Sequence[UUID]) -> List[User]:
+        """通过ID批量查找用户，见 UserRepository.find_by_ids"""
+        pass
+
+    @abstractmethod
+    async def find_version(self, user_id: UUID) -> Optional[datetime]:
+        """查询用户的版本，见 UserRepository.find_version"""
+        pass
+
+    @abstractmethod
+    async def find_by_username(self, username: str) -> Optional[User]:
+        """通过用户名查找用户，见 UserRepository.find_by_username"""
+        pass
+
+    @abstractmethod
+    async def find_by_email(self, email: str) -> Optional[User]:
+        """通过邮箱查找用户，见 UserRepository.find_by_email"""
+        pass
+
+    @abstractmethod
+    async def find_by_verification_token(self, token: str) -> Optional[User]:
+        """通过验证token查找用户，见 UserRepository.find_by_verification_token"""
+        pass
+
+    @abstractmethod
+    async def find_many(
+        self,
+        offset: int = 0,
+        limit: int = 100,
+        is_active: Optional[bool] = None,
+        is_deleted: Optional[bool] = False
+    ) -> List[User]:
+        """查找多个用户（分页），见 UserRepository.find_many"""
+        pass
+
+    @abstractmethod
+    async def find_page(
+        self,
+        after: Optional[str] = None,
+        limit: int = 100,
+        is_active: Optional[bool] = None,
+        is_deleted: Optional[bool] = False
+    ) -> UserPage:
+        """游标分页查找用户，见 UserRepository.find_page"""
+        pass
+
+    @abstractmethod
+    def iter_users(
+        self,
+        batch_size: int = 1000,
+        is_active: Optional[bool] = None,
+        is_deleted: Optional[bool] = False
+    ) -> AsyncIterator[User]:
+        """流式读取用户（async for），见 UserRepository.iter_users"""
+        pass
+
+    @abstractmethod
+    async def count(
+        self,
+        is_active: Optional[bool] = None,
+        is_deleted: Optional[bool] = False,
+        mode: CountMode = CountMode.EXACT
+    ) -> int:
+        """统计用户数量，见 UserRepository.count"""
+        pass
+
+    @abstractmethod
+    async def reconcile_counts(self) -> None:
+        """重算计数器，见 UserRepository.reconcile_counts"""
+        pass
+
+    @abstractmethod
+    async def username_exists(self, username: str) -> bool:
+        """检查用户名是否存在，见 UserRepository.username_exists"""
+        pass
+
+    @abstractmethod
+    async def find_existing_usernames(self, usernames: Iterable[str]) -> Set[str]:
+        """批量检查用户名是否存在，见 UserRepository.find_existing_usernames"""
+        pass
+
+    @abstractmethod
+    async def find_existing_emails(self, emails: Iterable[str]) -> Set[str]:
+        """批量检查邮箱是否存在，见 UserRepository.find_existing_emails"""
+        pass
+
+    @abstractmethod
+    async def email_exists(self, email: str) -> bool:
+        """检查邮箱是否存在，见 UserRepository.email_exists"""
+        pass
@@ -5,23 +5,43 @@
 对应测试: tests/unit/domain/test_user_registration.py
 
 此实现遵循领域驱动设计原则，处理用户注册相关的业务逻辑。
+
+异步方法（register_user_async / register_many_async / authenticate_user_async）
+同时接受同步仓储和 AsyncUserRepository: 配置 DATABASE_ASYNC 时仓储调用在事件循环中 await，
+不阻塞其他请求。verify_email / resend_verification_email 只有同步版本。
 """
 
-import re
-import bcrypt
+import inspect
+import random
 from datetime import datetime, timedelta
 from uuid import uuid4
-from typing import Optional, List, Dict, Any
-
-from src.domain.models.user import User, UserRegistrationResult
-from src.domain.repositories.user_repository import UserRepository
+from typing import Optional, List, Dict, Any, Sequence, Set, Tuple, Union
+from uuid import UUID
+
+from src.domain.models.user import (
+    BatchRegistrationItem,
+    BulkCreateResult,
+    User,
+    UserRegistrationResult,
+    hash_verification_token
+)
+from src.domain.repositories.user_repository import AsyncUserRepository, UserRepository
+from src.domain.validation import (
+    COMMON_WEAK_PASSWORDS,
+    RESERVED_USERNAMES,
+    USERNAME_RULE,
+    UserInputValidator
+)
 from src.domain.exceptions import (
     ValidationError,
     ConflictError,
     RateLimitError,
-    NotFoundError
+    NotFoundError,
+    AuthenticationError
 )
 from src.infrastructure.email import EmailService
+from src.infrastructure.hashing.executor import PasswordHashingExecutor
+from src.infrastructure.hashing.hashers import PasswordHasherRegistry, create_registry
 from src.infrastructure.rate_limiter import RateLimiter
 from src.infrastructure.logging import get_logger
 
@@ -29,6 +49,13 @@ from src.infrastructure.logging import get_logger
 logger = get_logger(__name__)
 
 
+async def _resolve(value: Any) -> Any:
+    """异步仓储返回可等待对象时 await，同步仓储的返回值原样返回"""
+    if inspect.isawaitable(value):
+        return await value
+    return value
+
+
 class UserService:
     """
     用户服务类
@@ -37,36 +64,37 @@ class UserService:
     实现规范: SPEC-USER-001
     """
 
-    # 保留用户名列表（规范: SPEC-USER-001, 3.3）
-    RESERVED_USERNAMES = {
-        'admin', 'root', 'system', 'administrator',
-        'moderator', 'support', 'help', 'api',
-        'www', 'mail', 'ftp', 'localhost'
-    }
-
-    # 常见弱密码列表
-    COMMON_WEAK_PASSWORDS = {
-        'password', 'password123', '12345678', 'qwerty',
-        'abc123', 'monkey', '1234567', 'letmein'
-    }
+    # 保留用户名和弱密码列表（规范: SPEC-USER-001, 3.3），定义见 domain.validation
+    RESERVED_USERNAMES = RESERVED_USERNAMES
+    COMMON_WEAK_PASSWORDS = COMMON_WEAK_PASSWORDS
 
     def __init__(
         self,
-        user_repository: UserRepository,
+        user_repository: Union[UserRepository, AsyncUserRepository],
         email_service: EmailService,
-        rate_limiter: RateLimiter
+        rate_limiter: RateLimiter,
+        password_hasher: Optional[PasswordHashingExecutor] = None,
+        validator: Optional[UserInputValidator] = None
     ):
         """
         初始化用户服务
 
         Args:
-            user_repository: 用户数据仓储
+            user_repository: 用户数据仓储（AsyncUserRepository 只能用于异步方法）
             email_service: 邮件服务
             rate_limiter: 速率限制器
+            password_hasher: 密码哈希进程池（可选，异步注册时使用）
+            validator: 输入验证器（默认使用共享规则表）
         """
         self.user_repository = user_repository
         self.email_service = email_service
         self.rate_limiter = rate_limiter
+        self.password_hasher = password_hasher
+        self.validator = validator or UserInputValidator()
+        # 算法注册表与进程池共用，保证同步/异步路径使用相同算法和参数
+        self.password_hashers: PasswordHasherRegistry = (
+            password_hasher.hashers if password_hasher is not None else create_registry()
+        )
 
     def register_user(
         self,
@@ -102,84 +130,172 @@ class UserService:
         """
         logger.info(f"开始注册流程: username={username}, email={email}")
 
-        # 1. 速率限制检查（规范: SPEC-USER-001, 3.3）
-        self._check_rate_limit(ip_address or 'unknown')
+        self._prepare_registration(
+            username, email, password, first_name, last_name, phone_number, ip_address
+        )
 
-        # 2. 输入验证
-        self._validate_username(username)
-        self._validate_email(email)
-        self._validate_password(password)
-
-        if first_name:
-            self._validate_name_field(first_name, "first_name")
-        if last_name:
-            self._validate_name_field(last_name, "last_name")
-        if phone_number:
-            self._validate_phone_number(phone_number)
-
-        # 3. 检查唯一性（规范: SPEC-USER-001, 2.3）
-        self._check_username_availability(username)
-        self._check_email_availability(email)
-
-        # 4. 密码加密（规范: SPEC-USER-001, 3.3）
+        # 3. 密码加密（规范: SPEC-USER-001, 3.3）
         password_hash = self._hash_password(password)
 
-        # 5. 生成邮箱验证 token（规范: SPEC-USER-001, 3.3）
-        verification_token = uuid4()
-        verification_expires = datetime.utcnow() + timedelta(hours=24)
+        return self._complete_registration(
+            username, email, password_hash, first_name, last_name, phone_number
+        )
 
-        # 6. 创建用户对象
-        user = User(
-            id=uuid4(),
-            username=username.lower(),  # 统一小写存储
-            email=email.lower(),        # 统一小写存储
-            password_hash=password_hash,
-            first_name=first_name,
-            last_name=last_name,
-            phone_number=phone_number,
-            email_verified=False,
-            email_verification_token=verification_token,
-            email_verification_expires=verification_expires,
-            created_at=datetime.utcnow(),
-            updated_at=datetime.utcnow(),
-            is_active=True,
-            is_deleted=False
+    async def register_user_async(
+        self,
+        username: str,
+        email: str,
+        password: str,
+        first_name: Optional[str] = None,
+        last_name: Optional[str] = None,
+        phone_number: Optional[str] = None,
+        ip_address: Optional[str] = None
+    ) -> UserRegistrationResult:
+        """
+        注册新用户（异步版本）
+
+        流程与 register_user 相同，密码哈希交给 password_hasher 进程池执行，
+        异步仓储的写入在事件循环中 await，避免阻塞（规范: SPEC-USER-001, 4.1 性能要求）。
+        参数、返回值和异常同 register_user。
+        """
+        logger.info(f"开始注册流程: username={username}, email={email}")
+
+        self._prepare_registration(
+            username, email, password, first_name, last_name, phone_number, ip_address
         )
 
-        # 7. 保存到数据库
-        try:
-            saved_user = self.user_repository.create(user)
-        except Exception as e:
-            logger.error(f"保存用户失败: {str(e)}")
-            raise
+        # 3. 密码加密（进程池）
+        password_hash = await self._hash_password_async(password)
 
-        # 8. 发送验证邮件（异步）（规范: SPEC-USER-001, 2.1）
-        try:
-            self.email_service.send_verification_email(
-                email=saved_user.email,
-                username=saved_user.username,
-                verification_token=str(verification_token)
+        return await self._complete_registration_async(
+            username, email, password_hash, first_name, last_name, phone_number
+        )
+
+    def register_many(
+        self,
+        records: Sequence[Dict[str, Optional[str]]],
+        ip_address: Optional[str] = None,
+        chunk_size: int = 1000
+    ) -> List[BatchRegistrationItem]:
+        """
+        批量注册（合作方批量导入）
+
+        实现规范: SPEC-USER-001, 2.1 核心功能 / 4.1 性能要求
+
+        每条记录的规则与 register_user 相同，整批共用每一步:
+        - 整批计一次速率限制
+        - 批量验证，每条记录报告全部字段错误
+        - 批内重复和已被使用的用户名/邮箱各一次集合查询排除，冲突记录不计算密码哈希
+        - 按 chunk_size 分块插入，每块一个事务（插入时仍原子检测并发注册造成的冲突）
+        - 验证邮件整批发送
+
+        Args:
+            records: 注册记录，字段同 register_user（username/email/password 及可选字段）
+            ip_address: 客户端IP（用于速率限制）
+            chunk_size: 每个插入事务的行数
+
+        Returns:
+            与输入顺序一致的每条记录结果
+
+        Raises:
+            RateLimitError: 超过速率限制
+        """
+        items, pending = self._prepare_batch(records, ip_address)
+
+        password_hashes = [self._hash_password(records[i]["password"]) for i in pending]
+
+        self._complete_batch(records, items, pending, password_hashes, chunk_size)
+        return items
+
+    async def register_many_async(
+        self,
+        records: Sequence[Dict[str, Optional[str]]],
+        ip_address: Optional[str] = None,
+        chunk_size: int = 1000
+    ) -> List[BatchRegistrationItem]:
+        """
+        批量注册（异步版本）
+
+        流程与 register_many 相同，密码哈希在 password_hasher 进程池中并行计算，
+        异步仓储的查询和写入在事件循环中 await。
+        参数、返回值和异常同 register_many，另外进程池超出容量时抛出 ServiceOverloadedError。
+        """
+        items, unique, usernames, emails = self._screen_batch(records, ip_address)
+        pending = self._exclude_taken(
+            records, items, unique,
+            await _resolve(self.user_repository.find_existing_usernames(usernames)),
+            await _resolve(self.user_repository.find_existing_emails(emails))
+        )
+
+        password_hashes = await self._hash_passwords_async(
+            [records[i]["password"] for i in pending]
+        )
+
+        users, tokens = self._new_batch_users(records, pending, password_hashes)
+        result = await _resolve(self.user_repository.create_many(users, chunk_size))
+        self._finish_batch(records, items, pending, users, tokens, result)
+        return items
+
+    def authenticate_user(self, email: str, password: str) -> User:
+        """
+        用户认证
+
+        密码校验通过后，若存储哈希不是默认算法生成的，或参数弱于当前默认配置
+        （例如 bcrypt cost 经校准调高），用本次提交的明文密码重新哈希并保存
+        （rehash-on-login），使配置变更随用户登录逐步生效。
+
+        Args:
+            email: 用户邮箱
+            password: 明文密码
+
+        Returns:
+            User: 认证通过的用户
+
+        Raises:
+            AuthenticationError: 邮箱或密码错误，或账户不可登录
+        """
+        user = self._find_login_user(email)
+
+        if not self._verify_password(password, user.password_hash):
+            logger.warning(f"登录失败，密码错误: user_id={user.id}")
+            raise AuthenticationError("邮箱或密码错误")
+
+        if self._needs_rehash(user.password_hash):
+            user.password_hash = self._hash_password(password)
+            logger.info(
+                f"密码哈希已升级: user_id={user.id}, "
+                f"scheme={self.password_hashers.default.scheme}"
             )
-            logger.info(f"验证邮件已发送: email={email}")
-        except Exception as e:
-            logger.error(f"发送验证邮件失败: {str(e)}")
-            # 邮件发送失败不阻止注册
 
-        # 9. 生成临时 token
-        auth_token = self._generate_auth_token(saved_user.id)
+        return self._complete_login(user)
 
-        logger.info(f"注册成功: user_id={saved_user.id}, username={username}")
+    async def authenticate_user_async(self, email: str, password: str) -> User:
+        """
+        用户认证（异步版本）
 
-        # 10. 返回注册结果（规范: SPEC-USER-001, 3.1）
-        return UserRegistrationResult(
-            user_id=str(saved_user.id),
-            username=saved_user.username,
-            email=saved_user.email,
-            email_verified=saved_user.email_verified,
-            created_at=saved_user.created_at,
-            token=auth_token
+        流程与 authenticate_user 相同，校验和重新哈希在 password_hasher 进程池中执行，
+        异步仓储的查询和写入在事件循环中 await。
+        """
+        user = self._require_login_user(
+            await _resolve(self.user_repository.find_by_email(email.lower()))
         )
 
+        if not await self._verify_password_async(password, user.password_hash):
+            logger.warning(f"登录失败，密码错误: user_id={user.id}")
+            raise AuthenticationError("邮箱或密码错误")
+
+        if self._needs_rehash(user.password_hash):
+            user.password_hash = await self._hash_password_async(password)
+            logger.info(
+                f"密码哈希已升级: user_id={user.id}, "
+                f"scheme={self.password_hashers.default.scheme}"
+            )
+
+        self._check_login(user)
+        await _resolve(self.user_repository.update(user))
+        logger.info(f"登录成功: user_id={user.id}")
+        return user
+
     def verify_email(self, token: str) -> Dict[str, Any]:
         """
         验证邮箱
@@ -222,10 +338,7 @@ class UserService:
             raise ValidationError("验证 token 已过期，请重新发送验证邮件")
 
         # 4. 更新用户状态
-        user.email_verified = True
-        user.email_verification_token = None
-        user.email_verification_expires = None
-        user.updated_at = datetime.utcnow()
+        user.verify_email()
 
         self.user_repository.update(user)
 
@@ -279,7 +392,7 @@ class UserService:
         verification_token = uuid4()
         verification_expires = datetime.utcnow() + timedelta(hours=24)
 
-        user.email_verification_token = verification_token
+        user.email_verification_token_hash = hash_verification_token(verification_token)
         user.email_verification_expires = verification_expires
         user.updated_at = datetime.utcnow()
 
@@ -309,122 +422,411 @@ class UserService:
             raise NotFoundError(f"用户不存在: {user_id}")
         return user
 
-    # ====== 私有方法：验证逻辑 ======
+    # ====== 私有方法：注册流程 ======
 
-    def _validate_username(self, username: str) -> None:
+    def _prepare_registration(
+        self,
+        username: str,
+        email: str,
+        password: str,
+        first_name: Optional[str],
+        last_name: Optional[str],
+        phone_number: Optional[str],
+        ip_address: Optional[str]
+    ) -> None:
         """
-        验证用户名
-        规范: SPEC-USER-001, 3.3 业务规则
+        注册前置步骤: 速率限制、输入验证
+
+        唯一性不在这里预先查询，由 user_repository.create 在插入时原子检测
+        （规范: SPEC-USER-001, 2.3）
         """
-        if not username:
-            raise ValidationError("用户名不能为空")
+        # 1. 速率限制检查（规范: SPEC-USER-001, 3.3）
+        self._check_rate_limit(ip_address or 'unknown')
 
-        # 长度检查
-        if len(username) < 3:
-            raise ValidationError("用户名至少需要3个字符")
-        if len(username) > 20:
-            raise ValidationError("用户名最多20个字符")
+        # 2. 输入验证
+        self.validator.validate_registration(
+            username, email, password, first_name, last_name, phone_number
+        )
 
-        # 格式检查：字母开头，字母数字下划线
-        if not re.match(r'^[a-zA-Z][a-zA-Z0-9_]*$', username):
-            raise ValidationError(
-                "用户名必须以字母开头，只能包含字母、数字和下划线"
-            )
+    def _complete_registration(
+        self,
+        username: str,
+        email: str,
+        password_hash: str,
+        first_name: Optional[str],
+        last_name: Optional[str],
+        phone_number: Optional[str]
+    ) -> UserRegistrationResult:
+        """注册后续步骤: 创建用户、发送验证邮件、生成 token"""
+        # 4-5. 创建用户对象和邮箱验证 token
+        user, verification_token = self._new_user(
+            username, email, password_hash, first_name, last_name, phone_number
+        )
 
-        # 保留用户名检查
-        if username.lower() in self.RESERVED_USERNAMES:
-            raise ValidationError("此用户名为系统保留，无法使用")
+        # 6. 保存到数据库（插入时检测用户名/邮箱冲突，规范: SPEC-USER-001, 2.3）
+        try:
+            saved_user = self.user_repository.create(user)
+        except ConflictError as e:
+            if e.code == "USERNAME_TAKEN":
+                # 生成建议的替代用户名
+                e.suggestions = self._generate_username_suggestions(username)
+            logger.info(f"注册冲突: code={e.code}, username={username}")
+            raise
+        except Exception as e:
+            logger.error(f"保存用户失败: {str(e)}")
+            raise
 
-    def _validate_email(self, email: str) -> None:
-        """
-        验证邮箱格式
-        规范: SPEC-USER-001, 3.3 业务规则
-        """
-        if not email:
-            raise ValidationError("邮箱不能为空")
+        return self._finish_registration(saved_user, verification_token)
 
-        # RFC 5322 简化版本
-        email_pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-        if not re.match(email_pattern, email):
-            raise ValidationError("邮箱格式无效")
+    async def _complete_registration_async(
+        self,
+        username: str,
+        email: str,
+        password_hash: str,
+        first_name: Optional[str],
+        last_name: Optional[str],
+        phone_number: Optional[str]
+    ) -> UserRegistrationResult:
+        """注册后续步骤（异步），仓储调用在事件循环中 await"""
+        user, verification_token = self._new_user(
+            username, email, password_hash, first_name, last_name, phone_number
+        )
 
-        if len(email) > 255:
-            raise ValidationError("邮箱地址过长")
+        try:
+            saved_user = await _resolve(self.user_repository.create(user))
+        except ConflictError as e:
+            if e.code == "USERNAME_TAKEN":
+                candidates = self._username_candidates(username)
+                taken = await _resolve(self.user_repository.find_existing_usernames(candidates))
+                e.suggestions = self._available_usernames(candidates, taken)
+            logger.info(f"注册冲突: code={e.code}, username={username}")
+            raise
+        except Exception as e:
+            logger.error(f"保存用户失败: {str(e)}")
+            raise
 
-    def _validate_password(self, password: str) -> None:
-        """
-        验证密码强度
-        规范: SPEC-USER-001, 3.3 业务规则
-        """
-        if not password:
-            raise ValidationError("密码不能为空")
+        return self._finish_registration(saved_user, verification_token)
 
-        # 长度检查
-        if len(password) < 8:
-            raise ValidationError("密码至少需要8个字符")
-        if len(password) > 128:
-            raise ValidationError("密码最多128个字符")
+    def _finish_registration(
+        self,
+        saved_user: User,
+        verification_token: UUID
+    ) -> UserRegistrationResult:
+        """用户保存之后: 发送验证邮件、生成 token"""
+        # 7. 发送验证邮件（异步）（规范: SPEC-USER-001, 2.1）
+        try:
+            self.email_service.send_verification_email(
+                email=saved_user.email,
+                username=saved_user.username,
+                verification_token=str(verification_token)
+            )
+            logger.info(f"验证邮件已发送: email={saved_user.email}")
+        except Exception as e:
+            logger.error(f"发送验证邮件失败: {str(e)}")
+            # 邮件发送失败不阻止注册
 
-        # 复杂度检查
-        has_upper = any(c.isupper() for c in password)
-        has_lower = any(c.islower() for c in password)
-        has_digit = any(c.isdigit() for c in password)
+        logger.info(f"注册成功: user_id={saved_user.id}, username={saved_user.username}")
 
-        if not (has_upper and has_lower and has_digit):
-            raise ValidationError(
-                "密码必须包含至少一个大写字母、一个小写字母和一个数字"
-            )
+        # 8-9. 生成临时 token，返回注册结果（规范: SPEC-USER-001, 3.1）
+        return self._registration_result(saved_user)
 
-        # 弱密码检查
-        if password.lower() in self.COMMON_WEAK_PASSWORDS:
-            raise ValidationError("此密码过于常见，请选择更安全的密码")
+    def _new_user(
+        self,
+        username: str,
+        email: str,
+        password_hash: str,
+        first_name: Optional[str],
+        last_name: Optional[str],
+        phone_number: Optional[str]
+    ) -> Tuple[User, UUID]:
+        """创建待保存的用户对象，返回用户和原始邮箱验证 token（只保存摘要）"""
+        # 生成邮箱验证 token（规范: SPEC-USER-001, 3.3）
+        verification_token = uuid4()
+        verification_expires = datetime.utcnow() + timedelta(hours=24)
 
-    def _validate_name_field(self, name: str, field_name: str) -> None:
-        """验证姓名字段"""
-        if len(name) > 50:
-            raise ValidationError(f"{field_name} 最多50个字符")
+        user = User(
+            id=uuid4(),
+            username=username.lower(),  # 统一小写存储
+            email=email.lower(),        # 统一小写存储
+            password_hash=password_hash,
+            first_name=first_name,
+            last_name=last_name,
+            phone_number=phone_number,
+            email_verified=False,
+            email_verification_token_hash=hash_verification_token(verification_token),
+            email_verification_expires=verification_expires,
+            created_at=datetime.utcnow(),
+            updated_at=datetime.utcnow(),
+            is_active=True,
+            is_deleted=False
+        )
+        return user, verification_token
 
-    def _validate_phone_number(self, phone: str) -> None:
-        """验证电话号码（简化版）"""
-        if not re.match(r'^\+?[1-9]\d{1,14}$', phone):
-            raise ValidationError("电话号码格式无效")
+    def _registration_result(self, user: User) -> UserRegistrationResult:
+        """生成临时 token 并构造注册结果"""
+        return UserRegistrationResult(
+            user_id=str(user.id),
+            username=user.username,
+            email=user.email,
+            email_verified=user.email_verified,
+            created_at=user.created_at,
+            token=self._generate_auth_token(user.id)
+        )
 
-    def _check_username_availability(self, username: str) -> None:
+    # ====== 私有方法：批量注册 ======
+
+    def _prepare_batch(
+        self,
+        records: Sequence[Dict[str, Optional[str]]],
+        ip_address: Optional[str]
+    ) -> Tuple[List[BatchRegistrationItem], List[int]]:
         """
-        检查用户名是否可用
-        规范: SPEC-USER-001, 2.3 边缘情况处理
+        批量注册前置步骤: 速率限制、批量验证、冲突预检
+
+        Returns:
+            每条记录的结果，以及通过验证且没有冲突、待创建的记录下标
         """
-        existing_user = self.user_repository.find_by_username(username.lower())
-        if existing_user:
-            # 生成建议的替代用户名
-            suggestions = self._generate_username_suggestions(username)
-            raise ConflictError(
-                message=f"用户名 '{username}' 已被使用",
-                code="USERNAME_TAKEN",
-                suggestions=suggestions
-            )
+        items, unique, usernames, emails = self._screen_batch(records, ip_address)
+
+        # 4. 已被使用的用户名/邮箱（各一次集合查询）
+        pending = self._exclude_taken(
+            records, items, unique,
+            self.user_repository.find_existing_usernames(usernames),
+            self.user_repository.find_existing_emails(emails)
+        )
+        return items, pending
 
-    def _check_email_availability(self, email: str) -> None:
+    def _screen_batch(
+        self,
+        records: Sequence[Dict[str, Optional[str]]],
+        ip_address: Optional[str]
+    ) -> Tuple[List[BatchRegistrationItem], List[int], Set[str], Set[str]]:
         """
-        检查邮箱是否可用
-        规范: SPEC-USER-001, 2.3 边缘情况处理
+        不访问仓储的批量前置步骤: 速率限制、批量验证、批内去重
+
+        Returns:
+            每条记录的结果、批内唯一的记录下标，以及待查询的用户名和邮箱（小写）
         """
-        existing_user = self.user_repository.find_by_email(email.lower())
-        if existing_user:
-            raise ConflictError(
-                message=f"邮箱 '{email}' 已被注册",
-                code="EMAIL_ALREADY_REGISTERED"
+        # 1. 速率限制检查，整批计一次（规范: SPEC-USER-001, 3.3）
+        self._check_rate_limit(ip_address or 'unknown')
+
+        # 2. 批量验证
+        items = [
+            BatchRegistrationItem(index=index, errors=errors)
+            for index, errors in enumerate(self.validator.validate_many(records))
+        ]
+
+        # 3. 批内重复: 同一用户名/邮箱只保留第一条
+        seen_usernames, seen_emails = set(), set()
+        unique = []
+        for item in items:
+            if item.errors:
+                continue
+            username = records[item.index]["username"].lower()
+            email = records[item.index]["email"].lower()
+            if username in seen_usernames:
+                item.errors.append(self._username_taken_error(username))
+            elif email in seen_emails:
+                item.errors.append(self._email_taken_error(email))
+            else:
+                seen_usernames.add(username)
+                seen_emails.add(email)
+                unique.append(item.index)
+        return items, unique, seen_usernames, seen_emails
+
+    def _exclude_taken(
+        self,
+        records: Sequence[Dict[str, Optional[str]]],
+        items: List[BatchRegistrationItem],
+        unique: List[int],
+        taken_usernames: Set[str],
+        taken_emails: Set[str]
+    ) -> List[int]:
+        """记录已被使用的用户名/邮箱错误，返回待创建的记录下标"""
+        pending = []
+        for index in unique:
+            username = records[index]["username"].lower()
+            email = records[index]["email"].lower()
+            if username in taken_usernames:
+                items[index].errors.append(self._username_taken_error(username))
+            elif email in taken_emails:
+                items[index].errors.append(self._email_taken_error(email))
+            else:
+                pending.append(index)
+        return pending
+
+    def _complete_batch(
+        self,
+        records: Sequence[Dict[str, Optional[str]]],
+        items: List[BatchRegistrationItem],
+        pending: List[int],
+        password_hashes: List[str],
+        chunk_size: int
+    ) -> None:
+        """批量注册后续步骤: 分块创建用户、整批发送验证邮件、生成 token"""
+        users, tokens = self._new_batch_users(records, pending, password_hashes)
+
+        # 预检之后并发注册造成的冲突由插入检测（规范: SPEC-USER-001, 2.3）
+        result = self.user_repository.create_many(users, chunk_size)
+        self._finish_batch(records, items, pending, users, tokens, result)
+
+    def _new_batch_users(
+        self,
+        records: Sequence[Dict[str, Optional[str]]],
+        pending: List[int],
+        password_hashes: List[str]
+    ) -> Tuple[List[User], List[UUID]]:
+        """创建待保存的用户对象和对应的邮箱验证 token"""
+        users, tokens = [], []
+        for index, password_hash in zip(pending, password_hashes):
+            record = records[index]
+            user, verification_token = self._new_user(
+                record["username"],
+                record["email"],
+                password_hash,
+                record.get("first_name"),
+                record.get("last_name"),
+                record.get("phone_number")
             )
+            users.append(user)
+            tokens.append(verification_token)
+        return users, tokens
+
+    def _finish_batch(
+        self,
+        records: Sequence[Dict[str, Optional[str]]],
+        items: List[BatchRegistrationItem],
+        pending: List[int],
+        users: List[User],
+        tokens: List[UUID],
+        result: BulkCreateResult
+    ) -> None:
+        """按插入结果记录每条记录的结果，整批发送验证邮件"""
+        for position, error in result.conflicts.items():
+            items[pending[position]].errors.append(error)
+
+        created_ids = {user.id for user in result.created}
+        registrations = []
+        for index, user, verification_token in zip(pending, users, tokens):
+            if user.id in created_ids:
+                items[index].result = self._registration_result(user)
+                registrations.append((user, verification_token))
+
+        self._send_verification_emails(registrations)
+
+        logger.info(f"批量注册完成: total={len(records)}, created={len(registrations)}")
+
+    def _send_verification_emails(self, registrations: List[Tuple[User, UUID]]) -> None:
+        """
+        批量发送验证邮件（规范: SPEC-USER-001, 2.1）
+
+        邮件服务提供 send_verification_emails 时整批提交一次，否则逐封发送；
+        发送失败不影响注册结果
+        """
+        messages = [
+            {
+                "email": user.email,
+                "username": user.username,
+                "verification_token": str(verification_token)
+            }
+            for user, verification_token in registrations
+        ]
+        if not messages:
+            return
+
+        send_many = getattr(self.email_service, "send_verification_emails", None)
+        if send_many is not None:
+            try:
+                send_many(messages)
+            except Exception as e:
+                logger.error(f"批量发送验证邮件失败: count={len(messages)}, error={str(e)}")
+            return
+
+        for message in messages:
+            try:
+                self.email_service.send_verification_email(**message)
+            except Exception as e:
+                logger.error(f"发送验证邮件失败: email={message['email']}, error={str(e)}")
+
+    @staticmethod
+    def _username_taken_error(username: str) -> ConflictError:
+        """用户名冲突错误"""
+        return ConflictError(message=f"用户名 '{username}' 已被使用", code="USERNAME_TAKEN")
+
+    @staticmethod
+    def _email_taken_error(email: str) -> ConflictError:
+        """邮箱冲突错误"""
+        return ConflictError(message=f"邮箱 '{email}' 已被注册", code="EMAIL_ALREADY_REGISTERED")
+
+    # ====== 私有方法：登录流程 ======
+
+    def _find_login_user(self, email: str) -> User:
+        """查找登录用户，不存在时抛出认证错误（不暴露用户是否存在）"""
+        return self._require_login_user(self.user_repository.find_by_email(email.lower()))
+
+    @staticmethod
+    def _require_login_user(user: Optional[User]) -> User:
+        """用户不存在时抛出认证错误"""
+        if not user:
+            raise AuthenticationError("邮箱或密码错误")
+        return user
+
+    @staticmethod
+    def _check_login(user: User) -> None:
+        """检查账户状态并记录登录时间"""
+        if not user.can_login():
+            raise AuthenticationError("账户未激活或邮箱未验证")
+        user.update_last_login()
+
+    def _complete_login(self, user: User) -> User:
+        """检查账户状态、记录登录时间并保存"""
+        self._check_login(user)
+        self.user_repository.update(user)
+
+        logger.info(f"登录成功: user_id={user.id}")
+        return user
+
+    # ====== 私有方法：密码哈希 ======
 
     def _hash_password(self, password: str) -> str:
         """
         密码加密
         规范: SPEC-USER-001, 3.3 业务规则
-        使用 bcrypt，cost factor = 12
+        使用注册表的默认算法（默认 bcrypt，cost factor = 12）
         """
-        salt = bcrypt.gensalt(rounds=12)
-        password_hash = bcrypt.hashpw(password.encode('utf-8'), salt)
-        return password_hash.decode('utf-8')
+        return self.password_hashers.hash(password)
+
+    async def _hash_password_async(self, password: str) -> str:
+        """
+        密码加密（异步）
+        配置了 password_hasher 时在进程池中计算，否则退化为同步计算
+        """
+        if self.password_hasher is None:
+            return self._hash_password(password)
+        return await self.password_hasher.hash_password(password)
+
+    async def _hash_passwords_async(self, passwords: List[str]) -> List[str]:
+        """
+        批量密码加密（异步）
+        配置了 password_hasher 时在进程池中并行计算，否则退化为同步计算
+        """
+        if self.password_hasher is None:
+            return [self._hash_password(password) for password in passwords]
+        return await self.password_hasher.hash_passwords(passwords)
+
+    def _verify_password(self, password: str, password_hash: str) -> bool:
+        """校验密码，按哈希前缀选择算法"""
+        return self.password_hashers.verify(password, password_hash)
+
+    async def _verify_password_async(self, password: str, password_hash: str) -> bool:
+        """校验密码（异步），配置了 password_hasher 时在进程池中计算"""
+        if self.password_hasher is None:
+            return self._verify_password(password, password_hash)
+        return await self.password_hasher.verify_password(password, password_hash)
+
+    def _needs_rehash(self, password_hash: str) -> bool:
+        """存储哈希不是默认算法生成的，或参数弱于当前默认配置时需要重新哈希"""
+        return self.password_hashers.needs_rehash(password_hash)
 
     def _check_rate_limit(self, identifier: str) -> None:
         """
@@ -443,25 +845,43 @@ class UserService:
                 retry_after=3600
             )
 
-    def _generate_username_suggestions(self, username: str) -> List[str]:
-        """生成可用的用户名建议"""
-        import random
-        suggestions = []
+    def _generate_username_suggestions(self, username: str, limit: int = 3) -> List[str]:
+        """
+        生成可用的用户名建议
+        规范: SPEC-USER-001, 2.3 边缘情况处理
 
-        # 添加数字后缀
-        for i in range(1, 4):
-            suffix = random.randint(1, 999)
-            suggestion = f"{username}{suffix}"
-            if not self.user_repository.find_by_username(suggestion.lower()):
-                suggestions.append(suggestion)
+        先生成一批候选，再用一次 IN 查询排除已被占用的，
+        按候选顺序返回前 limit 个（冲突响应只多一次数据库往返）
+        """
+        candidates = self._username_candidates(username)
+        taken = self.user_repository.find_existing_usernames(candidates)
+        return self._available_usernames(candidates, taken, limit)
+
+    @staticmethod
+    def _available_usernames(
+        candidates: List[str], taken: Set[str], limit: int = 3
+    ) -> List[str]:
+        """按候选顺序取前 limit 个未被占用的用户名"""
+        return [c for c in candidates if c not in taken][:limit]
+
+    @staticmethod
+    def _username_candidates(username: str) -> List[str]:
+        """
+        生成候选用户名: 随机数字后缀、年份、下划线分隔的序号
 
-        # 添加下划线和年份
+        超出用户名长度上限时截断原用户名，保证候选本身是合法用户名
+        """
+        base = username.lower()
         year = datetime.utcnow().year
-        suggestion = f"{username}_{year}"
-        if not self.user_repository.find_by_username(suggestion.lower()):
-            suggestions.append(suggestion)
+        suffixes = [str(random.randint(1, 999)) for _ in range(3)]
+        suffixes += [f"_{year}", str(year)]
+        suffixes += [f"_{i}" for i in range(1, 4)]
+        suffixes += [str(random.randint(1000, 9999)) for _ in range(2)]
 
-        return suggestions[:3]  # 最多返回3个建议
+        candidates = (
+            base[:USERNAME_RULE.max_length - len(suffix)] + suffix for suffix in suffixes
+        )
+        return list(dict.fromkeys(candidates))
 
     def _generate_auth_token(self, user_id: uuid4) -> str:
         """
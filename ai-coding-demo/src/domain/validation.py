@@ -0,0 +1,277 @@
+"""
+用户输入验证
+
+基于规范: SPEC-USER-001, 3.3 业务规则
+API 层 (Pydantic) 与 UserService 共用同一份字段规则表，规则只在此处定义。
+
+正则在模块加载时预编译；密码字符类检查只扫描一遍。
+"""
+
+import re
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, List, Optional, Pattern, Tuple
+
+from src.domain.exceptions import ValidationError
+
+
+@dataclass(frozen=True)
+class FieldRule:
+    """
+    字段验证规则
+
+    消息模板中的 {min}/{max} 会被替换为对应长度
+    """
+
+    field: str
+    min_length: Optional[int] = None
+    max_length: Optional[int] = None
+    pattern: Optional[Pattern[str]] = None
+    empty_message: str = ""
+    too_short_message: str = ""
+    too_long_message: str = ""
+    pattern_message: str = ""
+
+    def check(self, value: str) -> None:
+        """
+        按顺序检查: 非空 → 长度 → 格式
+
+        Raises:
+            ValidationError: 第一个未通过的检查
+        """
+        if not value:
+            raise ValidationError(self.empty_message, field=self.field)
+
+        length = len(value)
+        if self.min_length is not None and length < self.min_length:
+            raise ValidationError(
+                self.too_short_message.format(min=self.min_length), field=self.field
+            )
+        if self.max_length is not None and length > self.max_length:
+            raise ValidationError(
+                self.too_long_message.format(max=self.max_length), field=self.field
+            )
+
+        if self.pattern is not None and self.pattern.fullmatch(value) is None:
+            raise ValidationError(self.pattern_message, field=self.field)
+
+
+# ====== 字段规则表（规范: SPEC-USER-001, 3.3 业务规则） ======
+
+USERNAME_RULE = FieldRule(
+    field="username",
+    min_length=3,
+    max_length=20,
+    # 字母开头，字母数字下划线
+    pattern=re.compile(r'[a-zA-Z][a-zA-Z0-9_]*'),
+    empty_message="用户名不能为空",
+    too_short_message="用户名至少需要{min}个字符",
+    too_long_message="用户名最多{max}个字符",
+    pattern_message="用户名必须以字母开头，只能包含字母、数字和下划线"
+)
+
+EMAIL_RULE = FieldRule(
+    field="email",
+    max_length=255,
+    # RFC 5322 简化版本
+    pattern=re.compile(r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}'),
+    empty_message="邮箱不能为空",
+    too_long_message="邮箱地址过长",
+    pattern_message="邮箱格式无效"
+)
+
+PASSWORD_RULE = FieldRule(
+    field="password",
+    min_length=8,
+    max_length=128,
+    empty_message="密码不能为空",
+    too_short_message="密码至少需要{min}个字符",
+    too_long_message="密码最多{max}个字符"
+)
+
+NAME_RULE = FieldRule(
+    field="name",
+    max_length=50
+)
+
+PHONE_NUMBER_RULE = FieldRule(
+    field="phone_number",
+    # E.164 简化版本
+    pattern=re.compile(r'\+?[1-9]\d{1,14}'),
+    empty_message="电话号码格式无效",
+    pattern_message="电话号码格式无效"
+)
+
+USER_FIELD_RULES: Dict[str, FieldRule] = {
+    rule.field: rule
+    for rule in (USERNAME_RULE, EMAIL_RULE, PASSWORD_RULE, NAME_RULE, PHONE_NUMBER_RULE)
+}
+
+# 保留用户名列表（规范: SPEC-USER-001, 3.3）
+RESERVED_USERNAMES = frozenset({
+    'admin', 'root', 'system', 'administrator',
+    'moderator', 'support', 'help', 'api',
+    'www', 'mail', 'ftp', 'localhost'
+})
+
+# 常见弱密码列表
+COMMON_WEAK_PASSWORDS = frozenset({
+    'password', 'password123', '12345678', 'qwerty',
+    'abc123', 'monkey', '1234567', 'letmein'
+})
+
+# 注册表单可选字段
+_NAME_FIELDS = ("first_name", "last_name")
+
+
+def password_character_classes(password: str) -> Tuple[bool, bool, bool]:
+    """
+    单次扫描统计密码字符类
+
+    Returns:
+        (是否含大写字母, 是否含小写字母, 是否含数字)，三类都出现后提前结束
+    """
+    has_upper = has_lower = has_digit = False
+    for char in password:
+        if char.isupper():
+            has_upper = True
+        elif char.islower():
+            has_lower = True
+        elif char.isdigit():
+            has_digit = True
+        else:
+            continue
+        if has_upper and has_lower and has_digit:
+            break
+    return has_upper, has_lower, has_digit
+
+
+class UserInputValidator:
+    """
+    用户输入验证器
+
+    实现规范: SPEC-USER-001, 3.3 业务规则
+    """
+
+    def __init__(
+        self,
+        reserved_usernames: Iterable[str] = RESERVED_USERNAMES,
+        is_weak_password: Optional[Callable[[str], bool]] = None
+    ):
+        """
+        初始化验证器
+
+        Args:
+            reserved_usernames: 保留用户名（小写）
+            is_weak_password: 弱密码判定函数（接收小写密码），默认查 COMMON_WEAK_PASSWORDS
+        """
+        self.reserved_usernames = frozenset(reserved_usernames)
+        self.is_weak_password = is_weak_password or COMMON_WEAK_PASSWORDS.__contains__
+
+    def validate_username(self, username: str) -> None:
+        """验证用户名"""
+        USERNAME_RULE.check(username)
+
+        if username.lower() in self.reserved_usernames:
+            raise ValidationError("此用户名为系统保留，无法使用", field="username")
+
+    def validate_email(self, email: str) -> None:
+        """验证邮箱格式"""
+        EMAIL_RULE.check(email)
+
+    def validate_password(self, password: str) -> None:
+        """验证密码强度"""
+        PASSWORD_RULE.check(password)
+
+        # 复杂度检查
+        if not all(password_character_classes(password)):
+            raise ValidationError(
+                "密码必须包含至少一个大写字母、一个小写字母和一个数字",
+                field="password"
+            )
+
+        # 弱密码检查
+        if self.is_weak_password(password.lower()):
+            raise ValidationError("此密码过于常见，请选择更安全的密码", field="password")
+
+    def validate_name_field(self, name: str, field_name: str) -> None:
+        """验证姓名字段"""
+        if len(name) > NAME_RULE.max_length:
+            raise ValidationError(
+                f"{field_name} 最多{NAME_RULE.max_length}个字符", field=field_name
+            )
+
+    def validate_phone_number(self, phone: str) -> None:
+        """验证电话号码（简化版）"""
+        PHONE_NUMBER_RULE.check(phone)
+
+    def validate_registration(
+        self,
+        username: str,
+        email: str,
+        password: str,
+        first_name: Optional[str] = None,
+        last_name: Optional[str] = None,
+        phone_number: Optional[str] = None
+    ) -> None:
+        """
+        验证注册输入
+
+        Raises:
+            ValidationError: 第一个未通过验证的字段
+        """
+        self.validate_username(username)
+        self.validate_email(email)
+        self.validate_password(password)
+
+        if first_name:
+            self.validate_name_field(first_name, "first_name")
+        if last_name:
+            self.validate_name_field(last_name, "last_name")
+        if phone_number:
+            self.validate_phone_number(phone_number)
+
+    def collect_errors(self, record: Dict[str, Optional[str]]) -> List[ValidationError]:
+        """
+        验证一条注册记录的所有字段
+
+        与 validate_registration 不同，不在第一个错误处停止
+
+        Args:
+            record: 包含 username/email/password 及可选 first_name/last_name/phone_number
+
+        Returns:
+            所有字段的验证错误（为空表示通过）
+        """
+        checks: List[Tuple[Callable[..., None], tuple]] = [
+            (self.validate_username, (record.get("username") or "",)),
+            (self.validate_email, (record.get("email") or "",)),
+            (self.validate_password, (record.get("password") or "",)),
+        ]
+        for field_name in _NAME_FIELDS:
+            if record.get(field_name):
+                checks.append((self.validate_name_field, (record[field_name], field_name)))
+        if record.get("phone_number"):
+            checks.append((self.validate_phone_number, (record["phone_number"],)))
+
+        errors = []
+        for check, args in checks:
+            try:
+                check(*args)
+            except ValidationError as e:
+                errors.append(e)
+        return errors
+
+    def validate_many(
+        self,
+        records: Iterable[Dict[str, Optional[str]]]
+    ) -> List[List[ValidationError]]:
+        """
+        批量验证（用于批量导入）
+
+        Args:
+            records: 注册记录序列
+
+        Returns:
+            与输入顺序一致的错误列表，每条记录对应一个列表（为空表示通过）
+        """
+        return [self.collect_errors(record) for record in records]
@@ -0,0 +1,177 @@
+"""准入控制
+
+为 CPU 密集的哈希路径提供全局并发上限、有界等待队列和排队截止时间
+实现规范: SPEC-USER-001, 4.1 性能要求
+
+RateLimiter 按 IP 限流，无法阻止大量不同来源的注册同时涌入。
+准入控制在超出容量时快速拒绝（503 + Retry-After），
+而不是让所有请求排队直到尾延迟失控。
+"""
+import asyncio
+import logging
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
+from prometheus_client import Counter, Gauge, Histogram
+
+from src.domain.exceptions import ServiceOverloadedError
+from src.infrastructure.metrics import register_metric
+
+
+logger = logging.getLogger(__name__)
+
+ADMISSION_IN_FLIGHT = register_metric(
+    Gauge,
+    "admission_in_flight",
+    "已准入且正在执行的任务数",
+    ["name"]
+)
+ADMISSION_QUEUE_DEPTH = register_metric(
+    Gauge,
+    "admission_queue_depth",
+    "等待准入的任务数",
+    ["name"]
+)
+ADMISSION_SATURATION = register_metric(
+    Gauge,
+    "admission_saturation_ratio",
+    "执行中任务数与并发上限之比",
+    ["name"]
+)
+ADMISSION_REJECTIONS = register_metric(
+    Counter,
+    "admission_rejections_total",
+    "被拒绝的任务数",
+    ["name", "reason"]
+)
+ADMISSION_QUEUE_TIME = register_metric(
+    Histogram,
+    "admission_queue_seconds",
+    "任务排队等待准入的时间",
+    ["name"],
+    buckets=(0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0)
+)
+
+# 拒绝原因
+REJECT_QUEUE_FULL = "queue_full"
+REJECT_DEADLINE = "deadline_exceeded"
+
+
+class AdmissionController:
+    """
+    全局准入控制器
+
+    最多 max_in_flight 个任务同时执行；其余任务最多 max_queue 个排队，
+    排队超过 queue_timeout 秒或队列已满时抛出 ServiceOverloadedError。
+    """
+
+    def __init__(
+        self,
+        max_in_flight: int,
+        max_queue: int = 100,
+        queue_timeout: float = 0.3,
+        retry_after: int = 1,
+        name: str = "default"
+    ):
+        """
+        初始化准入控制器
+
+        Args:
+            max_in_flight: 最大并发执行数
+            max_queue: 等待队列容量
+            queue_timeout: 排队截止时间（秒）
+            retry_after: 拒绝时建议客户端重试的等待时间（秒）
+            name: 指标标签，用于区分多个控制器
+        """
+        if max_in_flight < 1:
+            raise ValueError("max_in_flight 必须大于 0")
+
+        self.max_in_flight = max_in_flight
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.retry_after = retry_after
+        self.name = name
+        self._semaphore = asyncio.Semaphore(max_in_flight)
+        self._in_flight = 0
+        self._waiting = 0
+
+    @property
+    def in_flight(self) -> int:
+        """正在执行的任务数"""
+        return self._in_flight
+
+    @property
+    def queue_depth(self) -> int:
+        """等待准入的任务数"""
+        return self._waiting
+
+    @property
+    def saturated(self) -> bool:
+        """等待队列是否已满"""
+        return self._waiting >= self.max_queue
+
+    @asynccontextmanager
+    async def admit(self) -> AsyncIterator[None]:
+        """
+        申请执行许可
+
+        用法:
+            async with controller.admit():
+                await do_cpu_heavy_work()
+
+        Raises:
+            ServiceOverloadedError: 队列已满或排队超时
+        """
+        await self._acquire()
+        self._in_flight += 1
+        self._update_gauges()
+        try:
+            yield
+        finally:
+            self._in_flight -= 1
+            self._semaphore.release()
+            self._update_gauges()
+
+    async def _acquire(self) -> None:
+        """获取许可，必要时排队"""
+        if not self._semaphore.locked():
+            await self._semaphore.acquire()
+            ADMISSION_QUEUE_TIME.labels(name=self.name).observe(0)
+            return
+
+        if self.saturated:
+            self._reject(REJECT_QUEUE_FULL)
+
+        self._waiting += 1
+        self._update_gauges()
+        started_at = time.perf_counter()
+        try:
+            await asyncio.wait_for(self._semaphore.acquire(), timeout=self.queue_timeout)
+        except asyncio.TimeoutError:
+            self._reject(REJECT_DEADLINE)
+        finally:
+            self._waiting -= 1
+            self._update_gauges()
+            ADMISSION_QUEUE_TIME.labels(name=self.name).observe(
+                time.perf_counter() - started_at
+            )
+
+    def _reject(self, reason: str) -> None:
+        """记录拒绝并抛出过载错误"""
+        ADMISSION_REJECTIONS.labels(name=self.name, reason=reason).inc()
+        logger.warning(
+            f"准入控制拒绝请求: name={self.name}, reason={reason}, "
+            f"in_flight={self._in_flight}, queue_depth={self._waiting}"
+        )
+        raise ServiceOverloadedError(
+            "服务繁忙，请稍后再试",
+            retry_after=self.retry_after,
+            reason=reason
+        )
+
+    def _update_gauges(self) -> None:
+        """刷新指标"""
+        ADMISSION_IN_FLIGHT.labels(name=self.name).set(self._in_flight)
+        ADMISSION_QUEUE_DEPTH.labels(name=self.name).set(self._waiting)
+        ADMISSION_SATURATION.labels(name=self.name).set(self._in_flight / self.max_in_flight)
@@ -0,0 +1,104 @@
+"""泄露密码筛查
+
+基于 mmap Bloom 过滤器的弱密码/泄露密码检查
+实现规范: SPEC-USER-001, 4.2 安全要求（密码复杂度验证）
+
+泄露密码库通常有数百万条，不能以 Python 对象形式加载。
+离线用 scripts/build_password_filter.py 把密码库编译成 Bloom 过滤器文件，
+运行时只读映射该文件: 启动为 O(1)，常驻内存与密码库大小无关，单次查询为微秒级。
+"""
+import gzip
+import logging
+from typing import Iterable, Iterator, Optional
+
+from src.domain.validation import COMMON_WEAK_PASSWORDS
+from src.utils.bloom_filter import BloomFilter
+
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_password(password: str) -> str:
+    """
+    规范化密码条目
+
+    与 UserInputValidator 的弱密码检查一致，统一按小写比较
+    """
+    return password.strip().lower()
+
+
+def iter_password_file(path: str) -> Iterator[str]:
+    """逐行读取密码库（支持 .gz），跳过空行，不把整个文件读入内存"""
+    opener = gzip.open if path.endswith(".gz") else open
+    with opener(path, "rt", encoding="utf-8", errors="ignore") as f:
+        for line in f:
+            password = normalize_password(line)
+            if password:
+                yield password
+
+
+def build_password_filter(
+    passwords: Iterable[str],
+    capacity: int,
+    false_positive_rate: float = 0.001
+) -> BloomFilter:
+    """
+    把密码序列编译为 Bloom 过滤器
+
+    Args:
+        passwords: 已规范化的密码序列
+        capacity: 预期条目数（用于确定位数组大小）
+        false_positive_rate: 目标误判率
+
+    Returns:
+        BloomFilter: 内存中的过滤器，调用 save() 写入文件
+    """
+    bloom = BloomFilter.with_capacity(capacity, false_positive_rate)
+    bloom.update(passwords)
+    return bloom
+
+
+class BreachedPasswordChecker:
+    """
+    泄露密码检查器
+
+    可直接作为 UserInputValidator 的 is_weak_password 使用
+    """
+
+    def __init__(self, bloom: Optional[BloomFilter] = None):
+        """
+        初始化检查器
+
+        Args:
+            bloom: 泄露密码过滤器（None 表示只检查内置常见弱密码）
+        """
+        self.bloom = bloom
+
+    @classmethod
+    def from_file(cls, path: str) -> "BreachedPasswordChecker":
+        """以只读 mmap 方式加载过滤器文件"""
+        bloom = BloomFilter.open(path)
+        logger.info(
+            f"泄露密码过滤器已加载: path={path}, entries={bloom.count}, "
+            f"size={bloom.memory_bytes}B, fp_rate={bloom.false_positive_rate:.6f}"
+        )
+        return cls(bloom)
+
+    def __call__(self, password: str) -> bool:
+        """
+        判断密码是否为常见弱密码或已泄露密码
+
+        Args:
+            password: 小写密码
+
+        Returns:
+            是否应拒绝（Bloom 过滤器存在可控的误判，不会漏判）
+        """
+        if password in COMMON_WEAK_PASSWORDS:
+            return True
+        return self.bloom is not None and password in self.bloom
+
+    def close(self) -> None:
+        """释放文件映射"""
+        if self.bloom is not None:
+            self.bloom.close()
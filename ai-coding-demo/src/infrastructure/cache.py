@@ -0,0 +1,235 @@
+"""缓存组件
+
+基于规范: SPEC-USER-001, 4.1 性能要求
+
+- LRUTTLCache: 进程内有界缓存，超过容量淘汰最久未使用的条目，条目到期后失效
+- SharedCache: 共享缓存层协议（Redis 协议的 get / mget / set(ex=) / delete 子集），
+  redis.Redis 直接满足；InMemorySharedCache 是本地开发和测试用的替身
+- SingleFlight: 同一个键的并发加载只执行一次，其余调用等待并共用结果（防缓存击穿）
+"""
+import threading
+import time
+from collections import OrderedDict
+from typing import (
+    Any, Callable, Dict, Hashable, List, Optional, Protocol, Sequence, Tuple, TypeVar, Union
+)
+
+from prometheus_client import Counter, Gauge
+
+from src.infrastructure.metrics import register_metric
+
+
+T = TypeVar("T")
+
+CACHE_REQUESTS = register_metric(
+    Counter,
+    "cache_requests_total",
+    "缓存查询次数",
+    ["cache", "tier", "result"]
+)
+CACHE_EVICTIONS = register_metric(
+    Counter,
+    "cache_evictions_total",
+    "缓存条目淘汰次数（capacity: 超出容量，expired: 到期，invalidated: 写入后失效）",
+    ["cache", "reason"]
+)
+CACHE_ENTRIES = register_metric(
+    Gauge,
+    "cache_entries",
+    "进程内缓存条目数",
+    ["cache"]
+)
+CACHE_COALESCED = register_metric(
+    Counter,
+    "cache_coalesced_loads_total",
+    "等待同一键正在进行的加载、未重复查询的次数",
+    ["cache"]
+)
+
+_MISSING = object()
+
+
+class LRUTTLCache:
+    """进程内 LRU + TTL 缓存（线程安全）"""
+
+    def __init__(
+        self,
+        name: str,
+        max_entries: int = 10000,
+        ttl_seconds: float = 30.0,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        """
+        初始化缓存
+
+        Args:
+            name: 缓存名（指标标签）
+            max_entries: 最大条目数
+            ttl_seconds: 条目有效期
+            clock: 时钟（测试时可替换）
+
+        Raises:
+            ValueError: max_entries 小于 1
+        """
+        if max_entries < 1:
+            raise ValueError("max_entries 必须大于 0")
+
+        self.name = name
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.clock = clock
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """读取条目，未命中或已到期时返回 default"""
+        with self._lock:
+            entry = self._entries.get(key, _MISSING)
+            if entry is _MISSING:
+                return default
+
+            expires_at, value = entry
+            if self.clock() >= expires_at:
+                del self._entries[key]
+                self._record_eviction("expired")
+                return default
+
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """写入条目，超出容量时淘汰最久未使用的条目"""
+        with self._lock:
+            self._entries[key] = (self.clock() + self.ttl_seconds, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._record_eviction("capacity")
+            CACHE_ENTRIES.labels(cache=self.name).set(len(self._entries))
+
+    def delete(self, *keys: Hashable) -> None:
+        """删除条目（写入后失效）"""
+        with self._lock:
+            for key in keys:
+                if self._entries.pop(key, _MISSING) is not _MISSING:
+                    self._record_eviction("invalidated")
+
+    def clear(self) -> None:
+        """清空缓存"""
+        with self._lock:
+            self._entries.clear()
+            CACHE_ENTRIES.labels(cache=self.name).set(0)
+
+    def _record_eviction(self, reason: str) -> None:
+        """记录淘汰（调用方持有锁）"""
+        CACHE_EVICTIONS.labels(cache=self.name, reason=reason).inc()
+        CACHE_ENTRIES.labels(cache=self.name).set(len(self._entries))
+
+
+class SharedCache(Protocol):
+    """共享缓存层协议（redis.Redis 的子集）"""
+
+    def get(self, name: str) -> Optional[Union[bytes, str]]:
+        ...
+
+    def mget(self, keys: Sequence[str]) -> List[Optional[Union[bytes, str]]]:
+        ...
+
+    def set(self, name: str, value: Union[bytes, str], ex: Optional[int] = None) -> Any:
+        ...
+
+    def delete(self, *names: str) -> Any:
+        ...
+
+
+class InMemorySharedCache:
+    """
+    共享缓存层的进程内替身
+
+    行为与 Redis 的 GET / MGET / SET EX / DEL 一致，用于本地开发和测试
+    """
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic):
+        self.clock = clock
+        self._data: Dict[str, Tuple[Optional[float], bytes]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, name: str) -> Optional[bytes]:
+        with self._lock:
+            entry = self._data.get(name)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at is not None and self.clock() >= expires_at:
+                del self._data[name]
+                return None
+            return value
+
+    def mget(self, keys: Sequence[str]) -> List[Optional[bytes]]:
+        return [self.get(name) for name in keys]
+
+    def set(self, name: str, value: Union[bytes, str], ex: Optional[int] = None) -> bool:
+        if isinstance(value, str):
+            value = value.encode("utf-8")
+        with self._lock:
+            self._data[name] = (self.clock() + ex if ex is not None else None, value)
+        return True
+
+    def delete(self, *names: str) -> int:
+        with self._lock:
+            return sum(self._data.pop(name, None) is not None for name in names)
+
+
+class _Call:
+    """进行中的加载"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """同一个键的并发加载合并为一次"""
+
+    def __init__(self, name: str):
+        """
+        Args:
+            name: 缓存名（指标标签）
+        """
+        self.name = name
+        self._calls: Dict[Hashable, _Call] = {}
+        self._lock = threading.Lock()
+
+    def do(self, key: Hashable, load: Callable[[], T]) -> T:
+        """
+        执行加载；同一个键已有加载在进行时等待其结果
+
+        加载失败时异常同样传给所有等待者
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+
+        if not leader:
+            CACHE_COALESCED.labels(cache=self.name).inc()
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = load()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
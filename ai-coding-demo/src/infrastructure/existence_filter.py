@@ -0,0 +1,254 @@
+"""用户名/邮箱存在性过滤器
+
+基于规范: SPEC-USER-001, 4.1 性能要求
+
+注册和用户名建议中的大多数 find_by_username / find_by_email 查询都是查不到的名字。
+内存中的 Bloom 过滤器可以在不访问数据库的情况下回答"一定不存在"，
+只有"可能存在"时才查询数据库。
+
+- 启动时从 users 表构建，创建用户时同步加入
+- Bloom 过滤器不支持删除: 删除的用户仍判定为"可能存在"（只是多一次查询，结果仍正确），
+  由定期重建清除
+- 重建在后台线程中进行，期间新加入的值会在切换前补入新过滤器，不阻塞请求
+- 未构建完成前一律判定为"可能存在"，退化为直接查询数据库
+- 过滤器是进程内的，只知道本进程插入的用户，其他进程新建的用户要到下次重建才会加入，
+  因此只用于 username_exists / email_exists / find_existing_* 这类建议性检查（可能漏报），
+  加载用户（登录等）仍查询数据库，注册唯一性以 create / create_many 的 ON CONFLICT 为准
+"""
+import logging
+import threading
+from typing import Callable, Iterable, List, Optional, Tuple
+
+from prometheus_client import Counter, Gauge
+
+from src.infrastructure.metrics import register_metric
+from src.infrastructure.periodic import PeriodicTask
+from src.utils.bloom_filter import BloomFilter
+
+
+logger = logging.getLogger(__name__)
+
+
+EXISTENCE_FILTER_LOOKUPS = register_metric(
+    Counter,
+    "existence_filter_lookups_total",
+    "存在性过滤器查询次数（absent 表示免去了一次数据库查询）",
+    ["name", "result"]
+)
+EXISTENCE_FILTER_ENTRIES = register_metric(
+    Gauge,
+    "existence_filter_entries",
+    "存在性过滤器中的条目数",
+    ["name"]
+)
+EXISTENCE_FILTER_MEMORY_BYTES = register_metric(
+    Gauge,
+    "existence_filter_memory_bytes",
+    "存在性过滤器位数组占用字节数",
+    ["name"]
+)
+EXISTENCE_FILTER_FALSE_POSITIVE_RATE = register_metric(
+    Gauge,
+    "existence_filter_false_positive_rate",
+    "按当前条目数估算的误判率",
+    ["name"]
+)
+
+
+class ExistenceFilter:
+    """
+    单字段存在性过滤器
+
+    might_contain 返回 False 时值一定不存在；返回 True 时需要查询数据库确认
+    """
+
+    def __init__(
+        self,
+        name: str,
+        capacity: int = 1_000_000,
+        false_positive_rate: float = 0.01
+    ):
+        """
+        初始化过滤器
+
+        Args:
+            name: 字段名（用于指标标签）
+            capacity: 初始容量，重建时按实际条目数扩容
+            false_positive_rate: 目标误判率
+        """
+        self.name = name
+        self.capacity = capacity
+        self.target_false_positive_rate = false_positive_rate
+        self.removed = 0
+        self._bloom: Optional[BloomFilter] = None
+        self._pending: Optional[List[str]] = None
+        self._lock = threading.Lock()
+
+    @property
+    def ready(self) -> bool:
+        """是否已完成首次构建"""
+        return self._bloom is not None
+
+    @property
+    def count(self) -> int:
+        """条目数"""
+        return self._bloom.count if self._bloom is not None else 0
+
+    @property
+    def memory_bytes(self) -> int:
+        """位数组占用字节数"""
+        return self._bloom.memory_bytes if self._bloom is not None else 0
+
+    @property
+    def false_positive_rate(self) -> float:
+        """按当前条目数估算的误判率（未构建时为 1）"""
+        return self._bloom.false_positive_rate if self._bloom is not None else 1.0
+
+    def might_contain(self, value: str) -> bool:
+        """值是否可能存在"""
+        bloom = self._bloom
+        if bloom is None:
+            return True
+
+        present = value in bloom
+        EXISTENCE_FILTER_LOOKUPS.labels(
+            self.name, "maybe_present" if present else "absent"
+        ).inc()
+        return present
+
+    def add(self, value: str) -> None:
+        """加入新值（创建用户后调用）"""
+        with self._lock:
+            if self._bloom is not None:
+                self._bloom.add(value)
+            if self._pending is not None:
+                self._pending.append(value)
+        self._update_metrics()
+
+    def discard(self, value: str) -> None:
+        """记录已删除的值，下次重建时清除"""
+        with self._lock:
+            self.removed += 1
+
+    # ====== 重建 ======
+
+    def _begin_rebuild(self) -> BloomFilter:
+        """创建新过滤器，开始记录重建期间加入的值"""
+        capacity = max(self.capacity, 2 * self.count)
+        with self._lock:
+            self._pending = []
+        return BloomFilter.with_capacity(capacity, self.target_false_positive_rate)
+
+    def _finish_rebuild(self, bloom: BloomFilter) -> None:
+        """补入重建期间加入的值并切换到新过滤器"""
+        with self._lock:
+            bloom.update(self._pending or ())
+            self._bloom = bloom
+            self._pending = None
+            self.removed = 0
+        self._update_metrics()
+
+    def _abort_rebuild(self) -> None:
+        """重建失败，保留旧过滤器"""
+        with self._lock:
+            self._pending = None
+
+    def _update_metrics(self) -> None:
+        """更新指标"""
+        EXISTENCE_FILTER_ENTRIES.labels(self.name).set(self.count)
+        EXISTENCE_FILTER_MEMORY_BYTES.labels(self.name).set(self.memory_bytes)
+        EXISTENCE_FILTER_FALSE_POSITIVE_RATE.labels(self.name).set(self.false_positive_rate)
+
+
+class UserExistenceFilter:
+    """
+    用户名和邮箱存在性过滤器
+
+    两个字段共用一次全表扫描构建
+    """
+
+    def __init__(self, capacity: int = 1_000_000, false_positive_rate: float = 0.01):
+        """
+        初始化过滤器
+
+        Args:
+            capacity: 初始容量
+            false_positive_rate: 目标误判率
+        """
+        self.usernames = ExistenceFilter("username", capacity, false_positive_rate)
+        self.emails = ExistenceFilter("email", capacity, false_positive_rate)
+        self._rebuild_task: Optional[PeriodicTask] = None
+
+    @property
+    def memory_bytes(self) -> int:
+        """两个过滤器合计占用字节数"""
+        return self.usernames.memory_bytes + self.emails.memory_bytes
+
+    def add(self, username: Optional[str], email: Optional[str]) -> None:
+        """加入新用户"""
+        if username:
+            self.usernames.add(username)
+        if email:
+            self.emails.add(email)
+
+    def discard(self, username: Optional[str], email: Optional[str]) -> None:
+        """记录已删除的用户"""
+        if username:
+            self.usernames.discard(username)
+        if email:
+            self.emails.discard(email)
+
+    def rebuild(self, identities: Iterable[Tuple[Optional[str], Optional[str]]]) -> None:
+        """
+        从 (username, email) 序列重建过滤器
+
+        构建期间旧过滤器继续服务查询，完成后原子切换
+        """
+        usernames = self.usernames._begin_rebuild()
+        emails = self.emails._begin_rebuild()
+        try:
+            for username, email in identities:
+                if username:
+                    usernames.add(username)
+                if email:
+                    emails.add(email)
+        except Exception:
+            self.usernames._abort_rebuild()
+            self.emails._abort_rebuild()
+            raise
+
+        self.usernames._finish_rebuild(usernames)
+        self.emails._finish_rebuild(emails)
+        logger.info(
+            f"存在性过滤器已重建: entries={usernames.count}, "
+            f"memory={self.memory_bytes}B, "
+            f"fp_rate={self.usernames.false_positive_rate:.6f}"
+        )
+
+    def start(
+        self,
+        load_identities: Callable[[], Iterable[Tuple[Optional[str], Optional[str]]]],
+        rebuild_interval_seconds: float = 3600
+    ) -> None:
+        """
+        在后台线程中构建，并定期重建
+
+        Args:
+            load_identities: 返回全部 (username, email) 的函数（每次重建调用一次）
+            rebuild_interval_seconds: 重建间隔
+        """
+        if self._rebuild_task is not None:
+            return
+
+        self._rebuild_task = PeriodicTask(
+            "user-existence-filter",
+            lambda: self.rebuild(load_identities()),
+            rebuild_interval_seconds
+        )
+        self._rebuild_task.start()
+
+    def stop(self) -> None:
+        """停止后台重建"""
+        if self._rebuild_task is not None:
+            self._rebuild_task.stop()
+            self._rebuild_task = None
@@ -0,0 +1,162 @@
+"""用户数据导出
+
+基于规范: SPEC-USER-001, 4.1 性能要求
+
+把仓储 iter_users 流式读出的用户编码为 NDJSON 或 CSV，按块产出字节串，
+供 StreamingResponse 逐块发送:
+
+- 内存占用只有仓储的一批行（yield_per）和一个输出块，与表大小无关
+- 生成器只在上一块发送完成后才继续读取，客户端读得慢时数据库游标随之暂停（反压），
+  进程内不会堆积缓冲
+- 导出字段不含密码哈希和验证 token 摘要
+"""
+import csv
+import io
+import json
+from typing import Any, AsyncIterable, AsyncIterator, Dict, Iterable, Iterator
+
+from prometheus_client import Counter
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from domain.models.user import User
+from src.infrastructure.metrics import register_metric
+
+
+USER_EXPORT_ROWS = register_metric(
+    Counter,
+    "user_export_rows_total",
+    "导出的用户行数",
+    ["format"]
+)
+
+# 导出字段（顺序即 CSV 列顺序）
+EXPORT_FIELDS = (
+    "id", "username", "email", "first_name", "last_name", "phone_number",
+    "email_verified", "is_active", "is_deleted", "created_at", "updated_at", "last_login"
+)
+
+# 格式 → 媒体类型
+EXPORT_MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8",
+}
+
+
+def export_record(user: User) -> Dict[str, Any]:
+    """导出字段的 JSON 兼容值（UUID 和时间转为字符串）"""
+    record = {}
+    for name in EXPORT_FIELDS:
+        value = getattr(user, name)
+        if name == "id":
+            value = str(value)
+        elif hasattr(value, "isoformat"):
+            value = value.isoformat()
+        record[name] = value
+    return record
+
+
+class UserExportEncoder:
+    """逐行编码用户（NDJSON 每行一个 JSON 对象，CSV 首行为表头）"""
+
+    def __init__(self, format: str):
+        """
+        Args:
+            format: ndjson / csv
+
+        Raises:
+            ValueError: 不支持的格式
+        """
+        if format not in EXPORT_MEDIA_TYPES:
+            raise ValueError(f"不支持的导出格式: {format}")
+
+        self.format = format
+        self.media_type = EXPORT_MEDIA_TYPES[format]
+        self._buffer = io.StringIO()
+        self._writer = csv.writer(self._buffer, lineterminator="\n")
+
+    def header(self) -> str:
+        """文件开头（CSV 表头，NDJSON 为空）"""
+        return self._csv_line(EXPORT_FIELDS) if self.format == "csv" else ""
+
+    def encode(self, user: User) -> str:
+        """编码一个用户（含换行）"""
+        record = export_record(user)
+        if self.format == "ndjson":
+            return json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n"
+        return self._csv_line(
+            "" if record[name] is None else record[name] for name in EXPORT_FIELDS
+        )
+
+    def _csv_line(self, values: Iterable[Any]) -> str:
+        """按 CSV 规则转义一行（复用同一个缓冲区）"""
+        self._buffer.seek(0)
+        self._buffer.truncate()
+        self._writer.writerow(values)
+        return self._buffer.getvalue()
+
+
+def export_chunks(
+    users: Iterable[User],
+    format: str,
+    chunk_bytes: int = 65536
+) -> Iterator[bytes]:
+    """
+    把用户编码为导出文件的字节块
+
+    Args:
+        users: 用户迭代器（仓储 iter_users）
+        format: ndjson / csv
+        chunk_bytes: 每块的目标大小，攒够后产出（减少逐行发送的开销）
+    """
+    encoder = UserExportEncoder(format)
+    chunk = _Chunk(format, encoder.header())
+    for user in users:
+        if chunk.add(encoder.encode(user)) >= chunk_bytes:
+            yield chunk.flush()
+    if chunk:
+        yield chunk.flush()
+
+
+async def export_chunks_async(
+    users: AsyncIterable[User],
+    format: str,
+    chunk_bytes: int = 65536
+) -> AsyncIterator[bytes]:
+    """把用户编码为导出文件的字节块（异步仓储），见 export_chunks"""
+    encoder = UserExportEncoder(format)
+    chunk = _Chunk(format, encoder.header())
+    async for user in users:
+        if chunk.add(encoder.encode(user)) >= chunk_bytes:
+            yield chunk.flush()
+    if chunk:
+        yield chunk.flush()
+
+
+class _Chunk:
+    """攒行的输出块"""
+
+    def __init__(self, format: str, header: str):
+        self.format = format
+        self.parts = [header] if header else []
+        self.size = len(header)
+        self.rows = 0
+
+    def __bool__(self) -> bool:
+        return bool(self.parts)
+
+    def add(self, line: str) -> int:
+        """追加一行，返回当前大小"""
+        self.parts.append(line)
+        self.size += len(line)
+        self.rows += 1
+        return self.size
+
+    def flush(self) -> bytes:
+        """取出已攒的内容并清空"""
+        USER_EXPORT_ROWS.labels(format=self.format).inc(self.rows)
+        data = "".join(self.parts).encode("utf-8")
+        self.parts, self.size, self.rows = [], 0, 0
+        return data
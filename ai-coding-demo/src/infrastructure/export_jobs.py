@@ -0,0 +1,488 @@
+"""用户快照导出任务（列式文件）
+
+基于规范: SPEC-USER-001, 4.1 性能要求
+
+分析用途需要全量快照文件，而不是 HTTP 流（GET /api/v1/users:export）。
+ExportJobRunner 在后台线程中把未删除用户写成 Parquet 或 Arrow IPC 文件，不占用请求路径:
+
+- 按 (created_at, id) 游标分页读取（find_page），每批 chunk_size 行一个短查询，
+  读取走只读副本，不持有长事务；批之间暂停 pause_seconds，给在线请求让出数据库
+- 攒满 row_group_size 行写一个行组（Arrow IPC 为一个记录批）
+- 输出是一个目录，每 row_groups_per_file 个行组一个分片文件（part-00000.parquet ...）。
+  分片先写入 .tmp 文件，完整关闭后改名，再把游标、分片数和行数写入 export_jobs 表；
+  进程崩溃后从最后一个完成的分片继续，最多重做一个分片
+- 任务状态保存在 export_jobs 表中，任一实例都能查询进度；条件 UPDATE 认领任务，
+  同一任务只由一个实例执行。心跳超过 lease 的运行中任务视为中断，由任一实例接管
+
+游标推进期间新注册的用户会被导出，已导出的行之后的修改不会反映到文件中（非时间点快照）。
+
+依赖 pyarrow；未安装时 ColumnarExportWriter.available() 返回 False
+"""
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from enum import Enum
+from typing import Callable, Iterable, List, Optional, Tuple
+from uuid import UUID, uuid4
+
+from prometheus_client import Counter, Histogram
+from sqlalchemy import Select, Update, and_, func, or_, select, update
+from sqlalchemy.sql.elements import ColumnElement
+from sqlalchemy.orm import Session
+
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from domain.models.user import User
+from domain.repositories.user_repository import CountMode
+from infrastructure.export import EXPORT_FIELDS
+from infrastructure.models.user_sql_model import ExportJobModel
+from infrastructure.repositories.user_repository_impl import SQLAlchemyUserRepository
+from src.infrastructure.metrics import register_metric
+
+
+logger = logging.getLogger(__name__)
+
+USER_EXPORT_JOB_ROWS = register_metric(
+    Counter,
+    "user_export_job_rows_total",
+    "导出任务写入分片文件的用户行数",
+    ["format"]
+)
+USER_EXPORT_JOB_FILE_SECONDS = register_metric(
+    Histogram,
+    "user_export_job_file_seconds",
+    "导出任务写一个分片文件的耗时（含批之间的暂停）",
+    ["format"],
+    buckets=(0.1, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600)
+)
+USER_EXPORT_JOBS = register_metric(
+    Counter,
+    "user_export_jobs_total",
+    "结束的导出任务数",
+    ["status"]
+)
+
+# 格式 → 分片文件扩展名
+EXPORT_FILE_FORMATS = {
+    "parquet": "parquet",
+    "arrow": "arrow",
+}
+
+_BOOLEAN_FIELDS = ("email_verified", "is_active", "is_deleted")
+_TIMESTAMP_FIELDS = ("created_at", "updated_at", "last_login")
+
+
+class ExportJobStatus(str, Enum):
+    """导出任务状态"""
+
+    PENDING = "pending"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+
+@dataclass
+class ExportJob:
+    """导出任务及进度"""
+
+    id: UUID
+    format: str
+    status: ExportJobStatus
+    row_group_size: int
+    files: int
+    rows_exported: int
+    rows_total: Optional[int]
+    error: Optional[str]
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+    @property
+    def progress(self) -> Optional[float]:
+        """完成比例（按已完成分片的行数估算），总数未知时为 None"""
+        if self.status == ExportJobStatus.COMPLETED:
+            return 1.0
+        if not self.rows_total:
+            return None
+        return min(self.rows_exported / self.rows_total, 1.0)
+
+
+def export_schema():
+    """导出文件的 Arrow schema（字段与 EXPORT_FIELDS 一致，时间为 UTC 微秒）"""
+    import pyarrow as pa
+
+    timestamp = pa.timestamp("us", tz="UTC")
+    types = {name: pa.bool_() for name in _BOOLEAN_FIELDS}
+    types.update({name: timestamp for name in _TIMESTAMP_FIELDS})
+    return pa.schema([(name, types.get(name, pa.string())) for name in EXPORT_FIELDS])
+
+
+def part_file_name(index: int, format: str) -> str:
+    """分片文件名"""
+    return f"part-{index:05d}.{EXPORT_FILE_FORMATS[format]}"
+
+
+def list_part_files(directory: str) -> List[str]:
+    """已完成的分片文件（按序号排序，不含未完成的临时文件）"""
+    return sorted(
+        name for name in os.listdir(directory)
+        if name.startswith("part-") and not name.endswith(".tmp")
+    )
+
+
+class ColumnarExportWriter:
+    """
+    把用户写入一个 Parquet / Arrow IPC 文件
+
+    按列缓冲，攒满 row_group_size 行写一个行组，内存占用与文件大小无关
+    """
+
+    def __init__(self, path: str, format: str, row_group_size: int):
+        """
+        Args:
+            path: 文件路径
+            format: parquet / arrow
+            row_group_size: 每个行组（记录批）的行数
+
+        Raises:
+            ValueError: 不支持的格式或 row_group_size 小于 1
+        """
+        if format not in EXPORT_FILE_FORMATS:
+            raise ValueError(f"不支持的导出文件格式: {format}")
+        if row_group_size < 1:
+            raise ValueError("row_group_size 必须大于 0")
+
+        import pyarrow as pa
+
+        self.path = path
+        self.format = format
+        self.row_group_size = row_group_size
+        self.rows = 0
+        self.schema = export_schema()
+        self._columns = {name: [] for name in EXPORT_FIELDS}
+        self._buffered = 0
+        if format == "parquet":
+            import pyarrow.parquet as pq
+
+            self._writer = pq.ParquetWriter(path, self.schema, compression="zstd")
+        else:
+            self._writer = pa.ipc.new_file(path, self.schema)
+
+    @staticmethod
+    def available() -> bool:
+        """pyarrow 是否已安装"""
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError:
+            return False
+        return True
+
+    def write(self, users: Iterable[User]) -> None:
+        """追加用户，攒满一个行组时写出"""
+        for user in users:
+            for name, values in self._columns.items():
+                value = getattr(user, name)
+                values.append(str(value) if name == "id" else value)
+            self._buffered += 1
+            if self._buffered == self.row_group_size:
+                self._flush()
+
+    def close(self) -> None:
+        """写出剩余的行并关闭文件（写入文件尾，之后文件才可读）"""
+        if self._buffered:
+            self._flush()
+        self._writer.close()
+
+    def _flush(self) -> None:
+        """把缓冲的行写为一个行组"""
+        import pyarrow as pa
+
+        batch = pa.RecordBatch.from_pydict(self._columns, schema=self.schema)
+        if self.format == "parquet":
+            self._writer.write_batch(batch, row_group_size=self.row_group_size)
+        else:
+            self._writer.write_batch(batch)
+        self.rows += self._buffered
+        self._columns = {name: [] for name in EXPORT_FIELDS}
+        self._buffered = 0
+
+
+def runnable_jobs_statement(stale_before: datetime, limit: int) -> Select:
+    """待执行的任务: 未开始的，以及心跳过期的运行中任务（按提交顺序）"""
+    return (
+        select(ExportJobModel.id)
+        .where(_runnable_condition(stale_before))
+        .order_by(ExportJobModel.created_at)
+        .limit(limit)
+    )
+
+
+def claim_statement(job_id: UUID, now: datetime, stale_before: datetime) -> Update:
+    """认领任务（条件 UPDATE，影响行数为 1 表示认领成功）"""
+    return (
+        update(ExportJobModel)
+        .where(ExportJobModel.id == job_id, _runnable_condition(stale_before))
+        .values(
+            status=ExportJobStatus.RUNNING.value,
+            started_at=func.coalesce(ExportJobModel.started_at, now),
+            heartbeat_at=now
+        )
+    )
+
+
+def _runnable_condition(stale_before: datetime) -> ColumnElement[bool]:
+    """可认领: 未开始，或运行中但心跳已过期"""
+    return or_(
+        ExportJobModel.status == ExportJobStatus.PENDING.value,
+        and_(
+            ExportJobModel.status == ExportJobStatus.RUNNING.value,
+            ExportJobModel.heartbeat_at < stale_before
+        )
+    )
+
+
+def _to_job(model: ExportJobModel) -> ExportJob:
+    """转换为任务对象"""
+    return ExportJob(
+        id=model.id,
+        format=model.format,
+        status=ExportJobStatus(model.status),
+        row_group_size=model.row_group_size,
+        files=model.files,
+        rows_exported=model.rows_exported,
+        rows_total=model.rows_total,
+        error=model.error,
+        created_at=model.created_at,
+        started_at=model.started_at,
+        finished_at=model.finished_at
+    )
+
+
+class ExportJobRunner:
+    """提交、查询和执行用户快照导出任务"""
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session],
+        output_dir: str,
+        read_session_factory: Optional[Callable[[], Session]] = None,
+        chunk_size: int = 10000,
+        row_groups_per_file: int = 10,
+        pause_seconds: float = 0.1,
+        lease: timedelta = timedelta(minutes=10),
+        repository_factory: Callable[[Session], SQLAlchemyUserRepository] = (
+            SQLAlchemyUserRepository
+        ),
+        clock: Callable[[], datetime] = datetime.utcnow
+    ):
+        """
+        初始化执行器
+
+        Args:
+            session_factory: 主库会话工厂（任务状态的读写）
+            output_dir: 导出根目录，每个任务一个子目录
+            read_session_factory: 读取用户的会话工厂（只读副本），默认同 session_factory
+            chunk_size: 每次读取的行数
+            row_groups_per_file: 每个分片文件的行组数（断点粒度）
+            pause_seconds: 每批读取之后的暂停时间
+            lease: 运行中任务的心跳有效期，超过后视为中断（须大于写一个分片的时间）
+            repository_factory: 按会话创建用户仓储
+            clock: 当前时间（UTC）
+
+        Raises:
+            ValueError: chunk_size 或 row_groups_per_file 小于 1
+        """
+        if chunk_size < 1 or row_groups_per_file < 1:
+            raise ValueError("chunk_size 和 row_groups_per_file 必须大于 0")
+
+        self.session_factory = session_factory
+        self.output_dir = output_dir
+        self.read_session_factory = read_session_factory or session_factory
+        self.chunk_size = chunk_size
+        self.row_groups_per_file = row_groups_per_file
+        self.pause_seconds = pause_seconds
+        self.lease = lease
+        self.repository_factory = repository_factory
+        self.clock = clock
+        self._cancel_event = threading.Event()
+
+    def submit(self, format: str, row_group_size: int) -> ExportJob:
+        """
+        提交导出任务（只写入任务记录，由后台的 run_pending 执行）
+
+        Raises:
+            ValueError: 不支持的格式或 row_group_size 小于 1
+        """
+        if format not in EXPORT_FILE_FORMATS:
+            raise ValueError(f"不支持的导出文件格式: {format}")
+        if row_group_size < 1:
+            raise ValueError("row_group_size 必须大于 0")
+
+        with self.session_factory() as session:
+            job = ExportJobModel(
+                id=uuid4(),
+                format=format,
+                status=ExportJobStatus.PENDING.value,
+                row_group_size=row_group_size,
+                files=0,
+                rows_exported=0,
+                rows_total=self.repository_factory(session).count(mode=CountMode.MAINTAINED),
+                created_at=self.clock()
+            )
+            session.add(job)
+            session.commit()
+            logger.info(f"导出任务已提交: job_id={job.id}, format={format}")
+            return _to_job(job)
+
+    def get(self, job_id: UUID) -> Optional[ExportJob]:
+        """查询任务进度"""
+        with self.session_factory() as session:
+            job = session.get(ExportJobModel, job_id)
+            return _to_job(job) if job is not None else None
+
+    def job_dir(self, job_id: UUID) -> str:
+        """任务的输出目录"""
+        return os.path.join(self.output_dir, str(job_id))
+
+    def run_pending(self) -> int:
+        """
+        依次执行待执行和中断的任务（周期任务调用）
+
+        Returns:
+            本次完成的任务数
+        """
+        self._cancel_event.clear()
+        completed = 0
+        while not self._cancel_event.is_set():
+            job = self._claim_next()
+            if job is None:
+                break
+            completed += self._run_job(job)
+        return completed
+
+    def cancel(self) -> None:
+        """中断正在执行的任务（丢弃未完成的分片，任务放回待执行，下次从断点继续）"""
+        self._cancel_event.set()
+
+    def _claim_next(self) -> Optional[ExportJobModel]:
+        """认领下一个可执行的任务，被其他实例抢先认领时尝试下一个"""
+        now = self.clock()
+        stale_before = now - self.lease
+        with self.session_factory() as session:
+            for job_id in session.scalars(runnable_jobs_statement(stale_before, 10)).all():
+                if session.execute(claim_statement(job_id, now, stale_before)).rowcount == 1:
+                    session.commit()
+                    return session.get(ExportJobModel, job_id)
+                session.rollback()
+        return None
+
+    def _run_job(self, job: ExportJobModel) -> bool:
+        """从断点开始逐个写分片，每个分片完成后记录进度；返回是否完成"""
+        directory = self.job_dir(job.id)
+        os.makedirs(directory, exist_ok=True)
+        for name in os.listdir(directory):
+            if name.endswith(".tmp"):
+                os.remove(os.path.join(directory, name))
+
+        after, files, rows = job.cursor, job.files, job.rows_exported
+        logger.info(f"导出任务开始: job_id={job.id}, files={files}, rows={rows}")
+        try:
+            while True:
+                started_at = time.perf_counter()
+                part = self._write_part(job, directory, files, after)
+                if part is None:
+                    self._update(job.id, status=ExportJobStatus.PENDING.value)
+                    logger.info(f"导出任务已中断，等待继续: job_id={job.id}, files={files}")
+                    return False
+
+                part_rows, after, finished = part
+                if part_rows or files == 0:
+                    files += 1
+                    rows += part_rows
+                    USER_EXPORT_JOB_ROWS.labels(format=job.format).inc(part_rows)
+                    USER_EXPORT_JOB_FILE_SECONDS.labels(format=job.format).observe(
+                        time.perf_counter() - started_at
+                    )
+
+                progress = dict(cursor=after, files=files, rows_exported=rows)
+                if finished:
+                    self._update(
+                        job.id,
+                        status=ExportJobStatus.COMPLETED.value,
+                        finished_at=self.clock(),
+                        **progress
+                    )
+                    USER_EXPORT_JOBS.labels(status=ExportJobStatus.COMPLETED.value).inc()
+                    logger.info(f"导出任务完成: job_id={job.id}, files={files}, rows={rows}")
+                    return True
+                self._update(job.id, **progress)
+        except Exception as e:
+            logger.error(f"导出任务失败: job_id={job.id}, error={str(e)}")
+            self._update(
+                job.id,
+                status=ExportJobStatus.FAILED.value,
+                error=str(e)[:1000],
+                finished_at=self.clock()
+            )
+            USER_EXPORT_JOBS.labels(status=ExportJobStatus.FAILED.value).inc()
+            return False
+
+    def _write_part(
+        self,
+        job: ExportJobModel,
+        directory: str,
+        index: int,
+        after: Optional[str]
+    ) -> Optional[Tuple[int, Optional[str], bool]]:
+        """
+        写一个分片文件
+
+        Returns:
+            (行数, 游标, 是否已读完全部用户)；中断时返回 None（临时文件已删除）。
+            空分片（上一个分片恰好读完）只在它是第一个分片时保留
+        """
+        path = os.path.join(directory, part_file_name(index, job.format))
+        temporary = path + ".tmp"
+        limit = job.row_group_size * self.row_groups_per_file
+        writer = ColumnarExportWriter(temporary, job.format, job.row_group_size)
+        rows, finished, cancelled = 0, False, False
+        try:
+            while rows < limit:
+                with self.read_session_factory() as session:
+                    page = self.repository_factory(session).find_page(
+                        after=after, limit=min(self.chunk_size, limit - rows)
+                    )
+                writer.write(page.items)
+                rows += len(page.items)
+                if page.next_cursor is None:
+                    finished = True
+                    break
+                after = page.next_cursor
+                if self._cancel_event.wait(self.pause_seconds):
+                    cancelled = True
+                    break
+        finally:
+            writer.close()
+
+        if cancelled:
+            os.remove(temporary)
+            return None
+        if rows == 0 and index > 0:
+            os.remove(temporary)
+            return 0, after, True
+        os.replace(temporary, path)
+        return rows, after, finished
+
+    def _update(self, job_id: UUID, **values) -> None:
+        """更新任务记录并刷新心跳"""
+        with self.session_factory() as session:
+            session.execute(
+                update(ExportJobModel)
+                .where(ExportJobModel.id == job_id)
+                .values(heartbeat_at=self.clock(), **values)
+            )
+            session.commit()
@@ -0,0 +1,3 @@
+"""
+密码哈希子系统
+"""
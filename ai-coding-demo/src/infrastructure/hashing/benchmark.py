@@ -0,0 +1,138 @@
+"""密码哈希基准测试
+
+测量各算法参数组合在当前机器上的吞吐量和内存占用，
+用于在 CPU 与内存之间权衡哈希参数
+"""
+import resource
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+from src.infrastructure.hashing.hashers import (
+    Argon2Hasher,
+    BcryptHasher,
+    PasswordHasher,
+    ScryptHasher
+)
+
+
+_BENCHMARK_PASSWORD = "BenchmarkPass123"
+
+
+@dataclass
+class BenchmarkResult:
+    """
+    单个参数组合的基准测试结果
+
+    peak_rss_bytes 为哈希过程中进程峰值 RSS 的增量（独立子进程中测量）
+    """
+
+    scheme: str
+    parameters: Dict[str, int]
+    iterations: int
+    seconds: float
+    memory_bytes: int
+    peak_rss_bytes: int
+
+    @property
+    def ops_per_second(self) -> float:
+        """单核每秒哈希次数"""
+        return self.iterations / self.seconds if self.seconds else 0.0
+
+    @property
+    def latency_ms(self) -> float:
+        """单次哈希平均耗时（毫秒）"""
+        return self.seconds / self.iterations * 1000 if self.iterations else 0.0
+
+    def to_dict(self) -> dict:
+        """转换为字典"""
+        return {
+            "scheme": self.scheme,
+            "parameters": self.parameters,
+            "iterations": self.iterations,
+            "ops_per_second": round(self.ops_per_second, 2),
+            "latency_ms": round(self.latency_ms, 2),
+            "memory_bytes": self.memory_bytes,
+            "peak_rss_bytes": self.peak_rss_bytes
+        }
+
+
+def default_parameter_sets() -> List[PasswordHasher]:
+    """默认参与基准测试的参数组合（argon2 未安装时跳过）"""
+    hashers: List[PasswordHasher] = [
+        BcryptHasher(rounds=10),
+        BcryptHasher(rounds=11),
+        BcryptHasher(rounds=12),
+        BcryptHasher(rounds=13),
+        ScryptHasher(ln=14, r=8, p=1),
+        ScryptHasher(ln=15, r=8, p=1),
+        ScryptHasher(ln=16, r=8, p=1),
+    ]
+    if Argon2Hasher.available():
+        hashers.extend([
+            Argon2Hasher(time_cost=2, memory_cost=19456, parallelism=1),
+            Argon2Hasher(time_cost=3, memory_cost=65536, parallelism=4),
+        ])
+    return hashers
+
+
+def _measure(hasher: PasswordHasher, iterations: int) -> Tuple[float, int]:
+    """
+    在当前进程中测量总耗时和峰值 RSS 增量
+
+    ru_maxrss 只增不减，因此只有在全新进程中测量时增量才准确
+    """
+    baseline_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    started_at = time.perf_counter()
+    for _ in range(iterations):
+        hasher.hash(_BENCHMARK_PASSWORD)
+    seconds = time.perf_counter() - started_at
+
+    peak_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return seconds, max(peak_kb - baseline_kb, 0) * 1024
+
+
+def benchmark_hasher(
+    hasher: PasswordHasher,
+    iterations: int = 5,
+    isolated: bool = True
+) -> BenchmarkResult:
+    """
+    测量单个参数组合
+
+    Args:
+        hasher: 待测算法
+        iterations: 哈希次数
+        isolated: 是否在独立子进程中运行，避免前一组参数抬高峰值 RSS
+
+    Returns:
+        BenchmarkResult: 测试结果
+    """
+    if isolated:
+        with ProcessPoolExecutor(max_workers=1) as executor:
+            seconds, peak_rss = executor.submit(_measure, hasher, iterations).result()
+    else:
+        seconds, peak_rss = _measure(hasher, iterations)
+
+    return BenchmarkResult(
+        scheme=hasher.scheme,
+        parameters=hasher.parameters,
+        iterations=iterations,
+        seconds=seconds,
+        memory_bytes=hasher.memory_bytes,
+        peak_rss_bytes=peak_rss
+    )
+
+
+def run_benchmark(
+    hashers: Optional[List[PasswordHasher]] = None,
+    iterations: int = 5,
+    isolated: bool = True
+) -> List[BenchmarkResult]:
+    """依次测量多个参数组合"""
+    return [
+        benchmark_hasher(hasher, iterations=iterations, isolated=isolated)
+        for hasher in hashers or default_parameter_sets()
+    ]
@@ -0,0 +1,112 @@
+"""bcrypt cost 校准
+
+在当前硬件上测量不同 cost 的哈希耗时，选出满足延迟预算的最高 cost
+实现规范: SPEC-USER-001, 4.1 性能要求 / 4.2 安全要求
+
+bcrypt 每增加 1 个 cost，耗时翻倍。固定 cost 要么在慢机器上拖垮 P95，
+要么在快机器上浪费安全余量；校准后由部署环境决定 cost。
+"""
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Optional
+
+import bcrypt
+
+
+logger = logging.getLogger(__name__)
+
+# bcrypt 允许的 cost 范围
+BCRYPT_MIN_ROUNDS = 4
+BCRYPT_MAX_ROUNDS = 31
+
+_CALIBRATION_PASSWORD = b"CalibrationPass123"
+
+
+@dataclass
+class CalibrationResult:
+    """
+    校准结果
+
+    rounds 为选中的 cost；measurements 记录每个实测 cost 的 P95 耗时（毫秒）
+    """
+
+    rounds: int
+    budget_ms: float
+    measurements: Dict[int, float] = field(default_factory=dict)
+
+    def to_dict(self) -> dict:
+        """转换为字典"""
+        return {
+            "rounds": self.rounds,
+            "budget_ms": self.budget_ms,
+            "measurements": {
+                str(rounds): round(ms, 2) for rounds, ms in self.measurements.items()
+            }
+        }
+
+
+def measure_bcrypt_ms(rounds: int) -> float:
+    """测量单次 bcrypt 哈希耗时（毫秒）"""
+    salt = bcrypt.gensalt(rounds=rounds)
+    started_at = time.perf_counter()
+    bcrypt.hashpw(_CALIBRATION_PASSWORD, salt)
+    return (time.perf_counter() - started_at) * 1000
+
+
+def _percentile(samples: list, percentile: float) -> float:
+    """最近秩法计算百分位数"""
+    ordered = sorted(samples)
+    index = max(0, min(len(ordered) - 1, int(round(percentile * len(ordered))) - 1))
+    return ordered[index]
+
+
+def calibrate_bcrypt_rounds(
+    budget_ms: float,
+    min_rounds: int = 10,
+    max_rounds: int = 16,
+    samples: int = 5,
+    percentile: float = 0.95,
+    measure: Optional[Callable[[int], float]] = None
+) -> CalibrationResult:
+    """
+    选出 P95 耗时不超过预算的最高 cost
+
+    从 min_rounds 开始逐级测量；由于耗时随 cost 翻倍，
+    当上一级 P95 的两倍已超出预算时直接停止，不再测量更昂贵的 cost。
+    即使 min_rounds 也超出预算，仍返回 min_rounds 作为安全下限。
+
+    Args:
+        budget_ms: 单次哈希延迟预算（毫秒）
+        min_rounds: 可接受的最低 cost
+        max_rounds: 可接受的最高 cost
+        samples: 每个 cost 的采样次数
+        percentile: 用于比较预算的百分位
+        measure: 测量函数（默认实测 bcrypt，测试时可替换）
+
+    Returns:
+        CalibrationResult: 校准结果
+    """
+    if not BCRYPT_MIN_ROUNDS <= min_rounds <= max_rounds <= BCRYPT_MAX_ROUNDS:
+        raise ValueError(
+            f"cost 范围无效: min_rounds={min_rounds}, max_rounds={max_rounds}"
+        )
+
+    measure = measure or measure_bcrypt_ms
+    result = CalibrationResult(rounds=min_rounds, budget_ms=budget_ms)
+
+    for rounds in range(min_rounds, max_rounds + 1):
+        previous = result.measurements.get(rounds - 1)
+        if previous is not None and previous * 2 > budget_ms:
+            break
+
+        observed = _percentile([measure(rounds) for _ in range(samples)], percentile)
+        result.measurements[rounds] = observed
+        logger.info(f"bcrypt 校准: rounds={rounds}, p{int(percentile * 100)}={observed:.1f}ms")
+
+        if observed > budget_ms:
+            break
+        result.rounds = rounds
+
+    logger.info(f"bcrypt 校准完成: rounds={result.rounds}, budget={budget_ms}ms")
+    return result
@@ -0,0 +1,249 @@
+"""密码哈希执行器
+
+基于 ProcessPoolExecutor 的密码哈希实现，算法由 PasswordHasherRegistry 决定
+实现规范: SPEC-USER-001, 4.1 性能要求
+
+bcrypt (cost 12) 单次约 250ms CPU。直接在 async 端点中调用会阻塞事件循环，
+这里把哈希计算派发到进程池，事件循环只负责等待结果，单节点可用满全部核心。
+"""
+import asyncio
+import logging
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, List, Optional, Sequence
+
+from prometheus_client import Gauge, Histogram
+
+from src.infrastructure.admission import AdmissionController
+from src.infrastructure.hashing.hashers import (
+    PasswordHasher,
+    PasswordHasherRegistry,
+    UnknownHashFormatError,
+    create_registry
+)
+from src.infrastructure.metrics import register_metric
+
+
+logger = logging.getLogger(__name__)
+
+HASHING_QUEUE_DEPTH = register_metric(
+    Gauge,
+    "password_hashing_queue_depth",
+    "已提交到进程池但尚未完成的哈希任务数"
+)
+HASHING_POOL_SIZE = register_metric(
+    Gauge,
+    "password_hashing_pool_size",
+    "哈希进程池工作进程数"
+)
+HASHING_LATENCY = register_metric(
+    Histogram,
+    "password_hashing_duration_seconds",
+    "哈希任务耗时（含排队时间）",
+    ["operation"],
+    buckets=(0.05, 0.1, 0.25, 0.5, 0.75, 1.0, 2.5, 5.0, 10.0)
+)
+
+
+# ====== 工作进程函数（必须是模块级函数才能被 pickle） ======
+
+def _hash_in_worker(hasher: PasswordHasher, password: str) -> str:
+    """在工作进程中计算密码哈希"""
+    return hasher.hash(password)
+
+
+def _hash_many_in_worker(hasher: PasswordHasher, passwords: Sequence[str]) -> List[str]:
+    """在工作进程中连续计算一组密码哈希（批量注册）"""
+    return [hasher.hash(password) for password in passwords]
+
+
+def _verify_in_worker(hasher: PasswordHasher, password: str, password_hash: str) -> bool:
+    """在工作进程中校验密码哈希"""
+    return hasher.verify(password, password_hash)
+
+
+def _warm_up_worker() -> int:
+    """预热任务：触发工作进程启动并完成哈希模块导入"""
+    return os.getpid()
+
+
+class PasswordHashingExecutor:
+    """
+    进程池密码哈希执行器
+
+    提供可 await 的 hash_password / verify_password 接口，
+    并通过 metrics 模块导出队列深度和耗时指标。
+    """
+
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        hashers: Optional[PasswordHasherRegistry] = None,
+        max_tasks_per_child: Optional[int] = None,
+        admission: Optional[AdmissionController] = None
+    ):
+        """
+        初始化执行器
+
+        Args:
+            max_workers: 工作进程数（None 表示使用全部 CPU 核心）
+            hashers: 密码哈希算法注册表（默认 bcrypt, cost 12）
+            max_tasks_per_child: 单个工作进程处理的最大任务数（None 表示不限制）
+            admission: 准入控制器（None 表示不限制并发，任务全部在进程池内排队）
+        """
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.hashers = hashers or create_registry()
+        self.max_tasks_per_child = max_tasks_per_child
+        self.admission = admission
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._pending = 0
+
+    @property
+    def queue_depth(self) -> int:
+        """已提交但未完成的任务数"""
+        return self._pending
+
+    @property
+    def started(self) -> bool:
+        """进程池是否已创建"""
+        return self._executor is not None
+
+    def start(self) -> None:
+        """创建进程池（幂等）"""
+        if self._executor is not None:
+            return
+
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.max_workers,
+            max_tasks_per_child=self.max_tasks_per_child
+        )
+        HASHING_POOL_SIZE.set(self.max_workers)
+        logger.info(
+            f"密码哈希进程池已创建: workers={self.max_workers}, "
+            f"scheme={self.hashers.default.scheme}, parameters={self.hashers.default.parameters}"
+        )
+
+    async def warm_up(self) -> None:
+        """
+        预热进程池
+
+        ProcessPoolExecutor 按需拉起工作进程，首批请求会承担进程启动开销。
+        应用启动时提交与工作进程数相同的空任务，提前拉起全部进程。
+        """
+        self.start()
+        loop = asyncio.get_running_loop()
+        pids = await asyncio.gather(*[
+            loop.run_in_executor(self._executor, _warm_up_worker)
+            for _ in range(self.max_workers)
+        ])
+        logger.info(f"密码哈希进程池预热完成: processes={len(set(pids))}")
+
+    def shutdown(self, wait: bool = True) -> None:
+        """关闭进程池"""
+        if self._executor is None:
+            return
+
+        self._executor.shutdown(wait=wait, cancel_futures=not wait)
+        self._executor = None
+        HASHING_POOL_SIZE.set(0)
+
+    async def hash_password(self, password: str) -> str:
+        """
+        使用默认算法计算密码哈希
+
+        Args:
+            password: 明文密码
+
+        Returns:
+            哈希字符串
+        """
+        return await self._submit("hash", _hash_in_worker, self.hashers.default, password)
+
+    async def hash_passwords(
+        self,
+        passwords: Sequence[str],
+        chunk_size: int = 8,
+        concurrency: Optional[int] = None
+    ) -> List[str]:
+        """
+        批量计算密码哈希（批量注册）
+
+        每个任务在工作进程中连续计算 chunk_size 个哈希，减少进程间往返；
+        同时进行的任务数不超过 concurrency，给单个注册请求留出进程池容量。
+        每个任务单独申请准入许可，任务较短，许可可以及时让给单个注册请求。
+
+        Args:
+            passwords: 明文密码
+            chunk_size: 每个任务计算的哈希数
+            concurrency: 同时进行的任务数（默认工作进程数的一半）
+
+        Returns:
+            与输入顺序一致的哈希字符串
+
+        Raises:
+            ValueError: chunk_size 小于 1
+        """
+        if chunk_size < 1:
+            raise ValueError("chunk_size 必须大于 0")
+
+        semaphore = asyncio.Semaphore(concurrency or max(self.max_workers // 2, 1))
+
+        async def hash_chunk(chunk: Sequence[str]) -> List[str]:
+            async with semaphore:
+                return await self._submit(
+                    "hash_many", _hash_many_in_worker, self.hashers.default, chunk
+                )
+
+        chunks = [
+            list(passwords[start:start + chunk_size])
+            for start in range(0, len(passwords), chunk_size)
+        ]
+        hashed = await asyncio.gather(*(hash_chunk(chunk) for chunk in chunks))
+        return [password_hash for chunk in hashed for password_hash in chunk]
+
+    async def verify_password(self, password: str, password_hash: str) -> bool:
+        """
+        校验密码，按哈希前缀选择算法
+
+        Args:
+            password: 明文密码
+            password_hash: 已存储的哈希
+
+        Returns:
+            密码是否匹配（无法识别的哈希视为不匹配）
+        """
+        try:
+            hasher = self.hashers.identify(password_hash)
+        except UnknownHashFormatError:
+            return False
+        return await self._submit("verify", _verify_in_worker, hasher, password, password_hash)
+
+    async def _submit(self, operation: str, fn: Callable[..., Any], *args: Any) -> Any:
+        """
+        提交任务到进程池
+
+        配置了准入控制时先申请许可，超出容量时抛出 ServiceOverloadedError
+        """
+        if self.admission is None:
+            return await self._run(operation, fn, *args)
+
+        async with self.admission.admit():
+            return await self._run(operation, fn, *args)
+
+    async def _run(self, operation: str, fn: Callable[..., Any], *args: Any) -> Any:
+        """在进程池中执行任务并记录指标"""
+        self.start()
+        loop = asyncio.get_running_loop()
+
+        self._pending += 1
+        HASHING_QUEUE_DEPTH.inc()
+        started_at = time.perf_counter()
+        try:
+            return await loop.run_in_executor(self._executor, fn, *args)
+        finally:
+            self._pending -= 1
+            HASHING_QUEUE_DEPTH.dec()
+            HASHING_LATENCY.labels(operation=operation).observe(
+                time.perf_counter() - started_at
+            )
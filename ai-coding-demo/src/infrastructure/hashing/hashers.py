@@ -0,0 +1,365 @@
+"""密码哈希算法
+
+PasswordHasher 抽象及 bcrypt / scrypt / argon2 实现，
+以及按哈希前缀识别算法的注册表
+实现规范: SPEC-USER-001, 4.2 安全要求
+
+注册表让多种算法的哈希共存：新密码使用默认算法，
+旧哈希按前缀找到对应算法校验，登录时再透明升级，迁移无需停机切换。
+"""
+import base64
+import hashlib
+import hmac
+import os
+from abc import ABC, abstractmethod
+from typing import Dict, List, Optional, Tuple
+
+import bcrypt
+
+
+class PasswordHasher(ABC):
+    """
+    密码哈希算法接口
+
+    实现类需可被 pickle，以便在哈希进程池的工作进程中执行
+    """
+
+    # 算法标识（配置中使用）
+    scheme: str = ""
+
+    # 该算法生成的哈希前缀，注册表据此识别算法
+    prefixes: Tuple[str, ...] = ()
+
+    @abstractmethod
+    def hash(self, password: str) -> str:
+        """计算密码哈希"""
+        pass
+
+    @abstractmethod
+    def verify(self, password: str, password_hash: str) -> bool:
+        """校验密码"""
+        pass
+
+    @abstractmethod
+    def needs_rehash(self, password_hash: str) -> bool:
+        """哈希参数与当前配置不一致时返回 True"""
+        pass
+
+    @property
+    @abstractmethod
+    def memory_bytes(self) -> int:
+        """单次哈希的理论内存占用（字节）"""
+        pass
+
+    @property
+    @abstractmethod
+    def parameters(self) -> Dict[str, int]:
+        """当前参数（用于日志和基准测试报告）"""
+        pass
+
+    def identify(self, password_hash: str) -> bool:
+        """判断哈希是否由本算法生成"""
+        return password_hash.startswith(self.prefixes)
+
+
+def get_bcrypt_rounds(password_hash: str) -> Optional[int]:
+    """
+    从 bcrypt 哈希中解析 cost
+
+    哈希格式: $2b$<cost>$<salt+hash>，无法解析时返回 None
+    """
+    parts = password_hash.split('$')
+    if len(parts) < 4 or not parts[2].isdigit():
+        return None
+    return int(parts[2])
+
+
+class BcryptHasher(PasswordHasher):
+    """bcrypt 实现（规范: SPEC-USER-001, 3.3 默认算法）"""
+
+    scheme = "bcrypt"
+    prefixes = ("$2b$", "$2a$", "$2y$")
+
+    def __init__(self, rounds: int = 12):
+        self.rounds = rounds
+
+    def hash(self, password: str) -> str:
+        salt = bcrypt.gensalt(rounds=self.rounds)
+        return bcrypt.hashpw(password.encode('utf-8'), salt).decode('utf-8')
+
+    def verify(self, password: str, password_hash: str) -> bool:
+        return bcrypt.checkpw(password.encode('utf-8'), password_hash.encode('utf-8'))
+
+    def needs_rehash(self, password_hash: str) -> bool:
+        """
+        cost 低于当前配置时返回 True
+
+        只升级不降级: BCRYPT_AUTO_CALIBRATE 下各进程的 cost 可能不同，
+        按不等判断会让低 cost 的节点降级更强的哈希，哈希在节点之间来回切换
+        """
+        rounds = get_bcrypt_rounds(password_hash)
+        return rounds is None or rounds < self.rounds
+
+    @property
+    def memory_bytes(self) -> int:
+        # Blowfish 状态: 4 个 S-box (4 x 256 x 4 字节) + P-array
+        return 4168
+
+    @property
+    def parameters(self) -> Dict[str, int]:
+        return {"rounds": self.rounds}
+
+
+def _b64encode(data: bytes) -> str:
+    """无填充 base64 编码"""
+    return base64.b64encode(data).decode('ascii').rstrip('=')
+
+
+def _b64decode(data: str) -> bytes:
+    """无填充 base64 解码"""
+    return base64.b64decode(data + '=' * (-len(data) % 4))
+
+
+class ScryptHasher(PasswordHasher):
+    """
+    scrypt 实现（基于 hashlib.scrypt，内存困难型）
+
+    哈希格式: $scrypt$ln=<log2 N>,r=<r>,p=<p>$<salt>$<hash>
+    """
+
+    scheme = "scrypt"
+    prefixes = ("$scrypt$",)
+
+    SALT_BYTES = 16
+    KEY_BYTES = 32
+
+    def __init__(self, ln: int = 15, r: int = 8, p: int = 1):
+        """
+        Args:
+            ln: CPU/内存代价 N 的以 2 为底对数
+            r: 块大小
+            p: 并行度
+        """
+        self.ln = ln
+        self.r = r
+        self.p = p
+
+    def hash(self, password: str) -> str:
+        salt = os.urandom(self.SALT_BYTES)
+        key = self._derive(password, salt, self.ln, self.r, self.p)
+        return f"$scrypt$ln={self.ln},r={self.r},p={self.p}${_b64encode(salt)}${_b64encode(key)}"
+
+    def verify(self, password: str, password_hash: str) -> bool:
+        parsed = self._parse(password_hash)
+        if parsed is None:
+            return False
+        (ln, r, p), salt, key = parsed
+        return hmac.compare_digest(self._derive(password, salt, ln, r, p, len(key)), key)
+
+    def needs_rehash(self, password_hash: str) -> bool:
+        parsed = self._parse(password_hash)
+        return parsed is None or parsed[0] != (self.ln, self.r, self.p)
+
+    @property
+    def memory_bytes(self) -> int:
+        return 128 * self.r * (1 << self.ln) * self.p
+
+    @property
+    def parameters(self) -> Dict[str, int]:
+        return {"ln": self.ln, "r": self.r, "p": self.p}
+
+    def _derive(
+        self,
+        password: str,
+        salt: bytes,
+        ln: int,
+        r: int,
+        p: int,
+        dklen: int = KEY_BYTES
+    ) -> bytes:
+        """派生密钥"""
+        memory = 128 * r * (1 << ln) * p
+        return hashlib.scrypt(
+            password.encode('utf-8'),
+            salt=salt,
+            n=1 << ln,
+            r=r,
+            p=p,
+            maxmem=memory * 2,
+            dklen=dklen
+        )
+
+    @staticmethod
+    def _parse(password_hash: str) -> Optional[Tuple[Tuple[int, int, int], bytes, bytes]]:
+        """解析哈希字符串，格式无效时返回 None"""
+        parts = password_hash.split('$')
+        if len(parts) != 5 or parts[1] != "scrypt":
+            return None
+        try:
+            params = dict(item.split('=') for item in parts[2].split(','))
+            return (
+                (int(params['ln']), int(params['r']), int(params['p'])),
+                _b64decode(parts[3]),
+                _b64decode(parts[4])
+            )
+        except (KeyError, ValueError):
+            return None
+
+
+class Argon2Hasher(PasswordHasher):
+    """
+    argon2id 实现（内存困难型）
+
+    依赖 argon2-cffi；未安装时 Argon2Hasher.available() 返回 False
+    """
+
+    scheme = "argon2"
+    prefixes = ("$argon2id$", "$argon2i$", "$argon2d$")
+
+    def __init__(self, time_cost: int = 3, memory_cost: int = 65536, parallelism: int = 4):
+        """
+        Args:
+            time_cost: 迭代次数
+            memory_cost: 内存代价（KiB）
+            parallelism: 并行度
+        """
+        from argon2 import PasswordHasher as _Argon2PasswordHasher
+
+        self.time_cost = time_cost
+        self.memory_cost = memory_cost
+        self.parallelism = parallelism
+        self._hasher = _Argon2PasswordHasher(
+            time_cost=time_cost,
+            memory_cost=memory_cost,
+            parallelism=parallelism
+        )
+
+    @staticmethod
+    def available() -> bool:
+        """argon2-cffi 是否已安装"""
+        try:
+            import argon2  # noqa: F401
+        except ImportError:
+            return False
+        return True
+
+    def hash(self, password: str) -> str:
+        return self._hasher.hash(password)
+
+    def verify(self, password: str, password_hash: str) -> bool:
+        from argon2.exceptions import InvalidHashError, VerificationError
+
+        try:
+            return self._hasher.verify(password_hash, password)
+        except (VerificationError, InvalidHashError):
+            return False
+
+    def needs_rehash(self, password_hash: str) -> bool:
+        return self._hasher.check_needs_rehash(password_hash)
+
+    @property
+    def memory_bytes(self) -> int:
+        return self.memory_cost * 1024
+
+    @property
+    def parameters(self) -> Dict[str, int]:
+        return {
+            "time_cost": self.time_cost,
+            "memory_cost": self.memory_cost,
+            "parallelism": self.parallelism
+        }
+
+
+class UnknownHashFormatError(ValueError):
+    """哈希前缀不属于任何已注册算法"""
+
+
+class PasswordHasherRegistry:
+    """
+    密码哈希算法注册表
+
+    新密码使用默认算法；校验时按哈希前缀选择算法；
+    由非默认算法（按前缀判断）或弱于当前配置的参数生成的哈希 needs_rehash 返回 True。
+    """
+
+    def __init__(self, default: PasswordHasher, others: Optional[List[PasswordHasher]] = None):
+        self._hashers: Dict[str, PasswordHasher] = {}
+        self.default = default
+        self.register(default)
+        for hasher in others or []:
+            self.register(hasher)
+
+    def register(self, hasher: PasswordHasher) -> None:
+        """注册算法（同名算法以先注册的为准，保证默认算法不被覆盖）"""
+        self._hashers.setdefault(hasher.scheme, hasher)
+
+    @property
+    def schemes(self) -> List[str]:
+        """已注册的算法标识"""
+        return list(self._hashers)
+
+    def get(self, scheme: str) -> PasswordHasher:
+        """按标识获取算法"""
+        return self._hashers[scheme]
+
+    def identify(self, password_hash: str) -> PasswordHasher:
+        """
+        按哈希前缀识别算法
+
+        Raises:
+            UnknownHashFormatError: 没有算法能识别该哈希
+        """
+        for hasher in self._hashers.values():
+            if hasher.identify(password_hash):
+                return hasher
+        raise UnknownHashFormatError("无法识别的密码哈希格式")
+
+    def hash(self, password: str) -> str:
+        """使用默认算法计算哈希"""
+        return self.default.hash(password)
+
+    def verify(self, password: str, password_hash: str) -> bool:
+        """按哈希前缀选择算法校验，无法识别的哈希视为校验失败"""
+        try:
+            hasher = self.identify(password_hash)
+        except UnknownHashFormatError:
+            return False
+        return hasher.verify(password, password_hash)
+
+    def needs_rehash(self, password_hash: str) -> bool:
+        """哈希不是由默认算法或当前参数生成时返回 True"""
+        if not self.default.identify(password_hash):
+            return True
+        return self.default.needs_rehash(password_hash)
+
+
+def create_hasher(scheme: str, **parameters: int) -> PasswordHasher:
+    """
+    按标识创建算法实例
+
+    Raises:
+        ValueError: 未知算法
+    """
+    hasher_classes = {
+        BcryptHasher.scheme: BcryptHasher,
+        ScryptHasher.scheme: ScryptHasher,
+        Argon2Hasher.scheme: Argon2Hasher,
+    }
+    if scheme not in hasher_classes:
+        raise ValueError(f"未知的密码哈希算法: {scheme}")
+    return hasher_classes[scheme](**parameters)
+
+
+def create_registry(default: Optional[PasswordHasher] = None) -> PasswordHasherRegistry:
+    """
+    创建注册表
+
+    除默认算法外，同时注册其余可用算法（使用默认参数），
+    使历史上以其他算法生成的哈希仍可校验并在登录时升级。
+    """
+    registry = PasswordHasherRegistry(default or BcryptHasher())
+    registry.register(BcryptHasher())
+    registry.register(ScryptHasher())
+    if Argon2Hasher.available():
+        registry.register(Argon2Hasher())
+    return registry
@@ -0,0 +1,46 @@
+"""指标注册表
+
+基于 prometheus_client 的服务指标，供各基础设施组件登记
+实现规范: SPEC-USER-001, 4.3 可观测性要求
+"""
+import threading
+from typing import Any, Dict, Sequence, Type, TypeVar
+
+from prometheus_client import CONTENT_TYPE_LATEST, CollectorRegistry, generate_latest
+from prometheus_client.metrics import MetricWrapperBase
+
+# 服务专用注册表，避免与进程默认注册表中的指标混在一起
+REGISTRY = CollectorRegistry(auto_describe=True)
+
+METRICS_CONTENT_TYPE = CONTENT_TYPE_LATEST
+
+MetricT = TypeVar("MetricT", bound=MetricWrapperBase)
+
+_metrics: Dict[str, MetricWrapperBase] = {}
+_metrics_lock = threading.Lock()
+
+
+def register_metric(
+    metric_class: Type[MetricT],
+    name: str,
+    documentation: str,
+    labelnames: Sequence[str] = (),
+    **kwargs: Any
+) -> MetricT:
+    """
+    登记指标，同名指标已登记时返回已有的指标
+
+    部分模块会以 infrastructure.x 和 src.infrastructure.x 两种路径各导入一次，
+    两份模块共用同一个指标对象，而不是重复登记
+    """
+    with _metrics_lock:
+        if name not in _metrics:
+            _metrics[name] = metric_class(
+                name, documentation, labelnames, registry=REGISTRY, **kwargs
+            )
+        return _metrics[name]
+
+
+def render_metrics() -> bytes:
+    """以 Prometheus 文本格式导出全部指标"""
+    return generate_latest(REGISTRY)
@@ -3,25 +3,77 @@
 基于规范: SPEC-DATA-USER-001
 实现用户数据的持久化
 """
-from sqlalchemy import Column, String, Boolean, DateTime
-from sqlalchemy.dialects.postgresql import UUID
-from sqlalchemy.sql import func
+from datetime import datetime
+
+from sqlalchemy import (
+    BigInteger, Column, Computed, String, Boolean, DateTime, Index, Integer, Uuid
+)
+from sqlalchemy.sql import false, func
 import uuid
 
-from ..infrastructure.database import Base
+from ..database import Base
 
 
 class UserModel(Base):
-    """SQLAlchemy 用户模型"""
+    """
+    SQLAlchemy 用户模型
+
+    用户名/邮箱的唯一性由规范形式（小写）生成列上的部分唯一索引保证，
+    索引只包含未删除的用户: 索引大小与活跃账户数成正比，软删除用户的用户名/邮箱可重新注册
+    """
     __tablename__ = "users"
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    email = Column(String(255), unique=True, nullable=False, index=True)
+    id = Column(Uuid(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    email = Column(String(255), nullable=False)
     password_hash = Column(String(255), nullable=False)
-    username = Column(String(50), unique=True, nullable=True, index=True)
+    username = Column(String(50), nullable=True)
+    # 规范形式由数据库生成，绕过领域模型的写入也保持一致（规范: SPEC-USER-001, 4.1 性能要求）
+    email_canonical = Column(String(255), Computed("lower(email)", persisted=True))
+    username_canonical = Column(String(50), Computed("lower(username)", persisted=True))
+    first_name = Column(String(50), nullable=True)
+    last_name = Column(String(50), nullable=True)
+    phone_number = Column(String(20), nullable=True)
+    email_verified = Column(Boolean, default=False, nullable=False, index=True)
+    # 验证 token 的 SHA-256 摘要（不保存原始 token），唯一索引支持按 token 点查
+    email_verification_token_hash = Column(String(64), unique=True, nullable=True, index=True)
+    email_verification_expires = Column(DateTime(timezone=True), nullable=True)
+    last_login = Column(DateTime(timezone=True), nullable=True)
     is_active = Column(Boolean, default=True, nullable=False)
+    is_deleted = Column(Boolean, default=False, nullable=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
-    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+    # 未显式写入时由应用时钟维护（与领域模型一致，微秒精度），每次更新都会变化，
+    # 作为条件请求的版本（ETag / Last-Modified）
+    updated_at = Column(
+        DateTime(timezone=True), server_default=func.now(), onupdate=datetime.utcnow
+    )
+
+    __table_args__ = (
+        # 游标分页排序键（规范: SPEC-USER-001, 4.1 性能要求）
+        Index("idx_user_created_at_id", "created_at", "id"),
+        # 未删除用户的用户名/邮箱唯一；查询条件需包含 is_deleted = false 才能命中
+        Index(
+            "uq_user_username_canonical_live",
+            username_canonical,
+            unique=True,
+            postgresql_where=is_deleted == false(),
+            sqlite_where=is_deleted == false()
+        ),
+        Index(
+            "uq_user_email_canonical_live",
+            email_canonical,
+            unique=True,
+            postgresql_where=is_deleted == false(),
+            sqlite_where=is_deleted == false()
+        ),
+        # 清理任务按 (过期时间, id) 顺序分批扫描未验证用户
+        Index(
+            "idx_user_unverified_expires_id",
+            email_verification_expires,
+            id,
+            postgresql_where=email_verified == false(),
+            sqlite_where=email_verified == false()
+        ),
+    )
 
     def to_dict(self):
         """转换为字典"""
@@ -29,7 +81,58 @@ class UserModel(Base):
             "id": str(self.id),
             "email": self.email,
             "username": self.username,
+            "email_verified": self.email_verified,
             "is_active": self.is_active,
             "created_at": self.created_at.isoformat() if self.created_at else None,
             "updated_at": self.updated_at.isoformat() if self.updated_at else None
         }
+
+
+class UserCountModel(Base):
+    """
+    用户数量计数器，每种 (is_active, is_deleted) 组合一行
+
+    用户写入时在同一事务中增减，定期按实际数据校准（规范: SPEC-USER-001, 4.1 性能要求）
+    """
+    __tablename__ = "user_counts"
+
+    is_active = Column(Boolean, primary_key=True)
+    is_deleted = Column(Boolean, primary_key=True)
+    count = Column(BigInteger, nullable=False, default=0)
+
+
+class MaintenanceCheckpointModel(Base):
+    """
+    后台维护任务的断点，每个任务一行
+
+    分批执行的任务每批提交后记录进度，中断后从断点继续
+    """
+    __tablename__ = "maintenance_checkpoints"
+
+    name = Column(String(100), primary_key=True)
+    cursor = Column(String(255), nullable=True)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+
+class ExportJobModel(Base):
+    """
+    用户快照导出任务，每个任务一行
+
+    每个分片文件完成后记录游标和进度，运行中的任务定期刷新心跳，
+    中断后（心跳过期或进程停止时释放）从最后一个完成的分片继续
+    """
+    __tablename__ = "export_jobs"
+
+    id = Column(Uuid(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    format = Column(String(20), nullable=False)
+    status = Column(String(20), nullable=False, index=True)
+    row_group_size = Column(Integer, nullable=False)
+    cursor = Column(String(255), nullable=True)  # 最后一个完成分片的分页游标
+    files = Column(Integer, nullable=False, default=0)  # 已完成的分片数
+    rows_exported = Column(BigInteger, nullable=False, default=0)
+    rows_total = Column(BigInteger, nullable=True)  # 提交时的用户数（计数器），用于估算进度
+    error = Column(String(1000), nullable=True)
+    created_at = Column(DateTime(timezone=True), nullable=False)
+    started_at = Column(DateTime(timezone=True), nullable=True)
+    heartbeat_at = Column(DateTime(timezone=True), nullable=True)
+    finished_at = Column(DateTime(timezone=True), nullable=True)
@@ -0,0 +1,71 @@
+"""周期任务
+
+在后台守护线程中按固定间隔执行维护任务（过滤器重建、计数校准等），
+任务异常只记录日志，不终止循环
+"""
+import logging
+import threading
+from typing import Callable, Optional
+
+
+logger = logging.getLogger(__name__)
+
+
+class PeriodicTask:
+    """后台周期任务"""
+
+    def __init__(
+        self,
+        name: str,
+        func: Callable[[], None],
+        interval_seconds: float,
+        run_immediately: bool = True
+    ):
+        """
+        初始化任务
+
+        Args:
+            name: 任务名（线程名和日志）
+            func: 每次执行的函数
+            interval_seconds: 执行间隔
+            run_immediately: 启动后是否立即执行一次
+        """
+        self.name = name
+        self.func = func
+        self.interval_seconds = interval_seconds
+        self.run_immediately = run_immediately
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def running(self) -> bool:
+        """是否已启动"""
+        return self._thread is not None
+
+    def start(self) -> None:
+        """启动后台线程（重复调用无效）"""
+        if self._thread is not None:
+            return
+
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5) -> None:
+        """停止后台线程"""
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout=timeout)
+            self._thread = None
+
+    def _run(self) -> None:
+        """执行循环"""
+        if not self.run_immediately:
+            self._stop_event.wait(self.interval_seconds)
+
+        while not self._stop_event.is_set():
+            try:
+                self.func()
+            except Exception as e:
+                logger.error(f"周期任务执行失败: name={self.name}, error={str(e)}")
+            self._stop_event.wait(self.interval_seconds)
@@ -0,0 +1,139 @@
+"""数据库连接池监控
+
+基于规范: SPEC-USER-001, 4.1 性能要求 / 4.3 可观测性要求
+
+连接池耗尽时请求在获取连接处排队，延迟体现在每个查询上却看不出原因。
+这里记录获取连接的等待时间和超时次数、当前借出/溢出连接数以及连接失效次数，
+通过 /metrics 导出，并在 /health 中报告各连接池的占用情况。
+
+- 获取连接耗时由 InstrumentedQueuePool / InstrumentedAsyncQueuePool 记录，
+  引擎需以 poolclass=... 和 pool_logging_name=<名称> 创建（名称作为指标标签）
+- 借出/溢出连接数在导出指标时从连接池实时读取
+- 连接失效（包括 pre-ping 发现的断开连接）通过连接池事件计数
+"""
+import time
+from typing import Any, Dict, List
+
+from prometheus_client import Counter, Gauge, Histogram
+from sqlalchemy import event, exc
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+from src.infrastructure.metrics import register_metric
+
+
+DB_POOL_CHECKOUT_SECONDS = register_metric(
+    Histogram,
+    "db_pool_checkout_seconds",
+    "从连接池获取连接的耗时（含排队等待、新建连接和 pre-ping）",
+    ["pool"],
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+)
+DB_POOL_CHECKOUT_TIMEOUTS = register_metric(
+    Counter,
+    "db_pool_checkout_timeouts_total",
+    "等待连接超过 pool_timeout 的次数",
+    ["pool"]
+)
+DB_POOL_CHECKED_OUT = register_metric(
+    Gauge,
+    "db_pool_checked_out",
+    "当前借出的连接数",
+    ["pool"]
+)
+DB_POOL_OVERFLOW = register_metric(
+    Gauge,
+    "db_pool_overflow",
+    "当前使用的溢出连接数（超出 pool_size 的部分）",
+    ["pool"]
+)
+DB_POOL_SIZE = register_metric(
+    Gauge,
+    "db_pool_size",
+    "连接池常驻连接数上限（pool_size）",
+    ["pool"]
+)
+DB_POOL_INVALIDATIONS = register_metric(
+    Counter,
+    "db_pool_invalidations_total",
+    "连接失效次数（soft 表示到期回收等软失效）",
+    ["pool", "soft"]
+)
+
+# 已登记的引擎（名称 → 引擎），供 /health 报告
+_ENGINES: Dict[str, Engine] = {}
+
+
+class _CheckoutTimingMixin:
+    """记录获取连接的耗时和超时"""
+
+    def connect(self):
+        start = time.perf_counter()
+        pool_name = self.logging_name or "default"
+        try:
+            return super().connect()
+        except exc.TimeoutError:
+            DB_POOL_CHECKOUT_TIMEOUTS.labels(pool=pool_name).inc()
+            raise
+        finally:
+            DB_POOL_CHECKOUT_SECONDS.labels(pool=pool_name).observe(time.perf_counter() - start)
+
+
+class InstrumentedQueuePool(_CheckoutTimingMixin, QueuePool):
+    """记录获取连接耗时的 QueuePool（同步引擎）"""
+
+
+class InstrumentedAsyncQueuePool(_CheckoutTimingMixin, AsyncAdaptedQueuePool):
+    """记录获取连接耗时的 AsyncAdaptedQueuePool（异步引擎）"""
+
+
+def instrument_engine(engine: Engine, name: str) -> None:
+    """
+    登记引擎的连接池指标
+
+    Args:
+        engine: 同步引擎（异步引擎传入 sync_engine）
+        name: 指标标签，应与创建引擎时的 pool_logging_name 一致
+    """
+    _ENGINES[name] = engine
+
+    @event.listens_for(engine.pool, "invalidate")
+    def on_invalidate(dbapi_connection, connection_record, exception):
+        DB_POOL_INVALIDATIONS.labels(pool=name, soft="false").inc()
+
+    @event.listens_for(engine.pool, "soft_invalidate")
+    def on_soft_invalidate(dbapi_connection, connection_record, exception):
+        DB_POOL_INVALIDATIONS.labels(pool=name, soft="true").inc()
+
+    # 按引擎读取当前连接池: dispose() 后引擎会换用新的连接池对象
+    if isinstance(engine.pool, QueuePool):
+        DB_POOL_CHECKED_OUT.labels(pool=name).set_function(lambda: engine.pool.checkedout())
+        DB_POOL_OVERFLOW.labels(pool=name).set_function(lambda: max(engine.pool.overflow(), 0))
+        DB_POOL_SIZE.labels(pool=name).set_function(lambda: engine.pool.size())
+
+
+def pool_status(engine: Engine) -> Dict[str, Any]:
+    """
+    连接池当前占用情况
+
+    saturated 表示常驻和溢出连接都已借出，新的请求需要排队等待
+    """
+    pool = engine.pool
+    if not isinstance(pool, QueuePool):
+        return {"pool": type(pool).__name__}
+
+    checked_out = pool.checkedout()
+    capacity = pool.size() + max(pool._max_overflow, 0)
+    return {
+        "pool": type(pool).__name__,
+        "size": pool.size(),
+        "checked_out": checked_out,
+        "overflow": max(pool.overflow(), 0),
+        "timeout_seconds": pool.timeout(),
+        "saturated": pool._max_overflow > -1 and checked_out >= capacity,
+    }
+
+
+def pool_statuses() -> List[Dict[str, Any]]:
+    """全部已登记连接池的占用情况"""
+    return [{"name": name, **pool_status(engine)} for name, engine in _ENGINES.items()]
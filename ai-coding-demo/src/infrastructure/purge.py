@@ -0,0 +1,219 @@
+"""过期注册数据清理任务
+
+基于规范: SPEC-USER-001, 3.3 业务规则 / 4.1 性能要求
+
+从未完成邮箱验证的注册会一直留在 users 表中，使表和每个索引持续膨胀。
+UserPurgeJob 分两步清理:
+
+- verification_tokens: 清除过期超过 token_retention 的验证 token 摘要
+- unverified_users: 删除验证过期超过 account_retention 的未验证用户（可先归档）
+
+一条覆盖全部过期数据的 DELETE 会长时间持有行锁并产生大量 WAL，拖慢注册路径。
+这里按 (email_verification_expires, id) 顺序分批处理: 每批一个短事务，
+批之间暂停，每次运行最多处理 max_chunks_per_run 批；
+每批提交后把扫描位置写入 maintenance_checkpoints，中断或达到批数上限后下次从断点继续，
+一轮扫描结束时清除断点。断点在本批提交之后写入，重复处理同一批是安全的（已处理的行不再匹配）。
+"""
+import logging
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional
+from uuid import UUID
+
+from prometheus_client import Counter, Gauge, Histogram
+from sqlalchemy.orm import Session
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from domain.models.user import User
+from infrastructure.models.user_sql_model import MaintenanceCheckpointModel
+from infrastructure.repositories.user_repository_impl import PurgeKey, SQLAlchemyUserRepository
+from src.infrastructure.metrics import register_metric
+
+
+logger = logging.getLogger(__name__)
+
+USER_PURGE_ROWS = register_metric(
+    Counter,
+    "user_purge_rows_total",
+    "清理任务处理的行数",
+    ["task"]
+)
+USER_PURGE_CHUNK_SECONDS = register_metric(
+    Histogram,
+    "user_purge_chunk_seconds",
+    "清理任务每批的耗时（一个事务）",
+    ["task"],
+    buckets=(0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+)
+USER_PURGE_LAST_COMPLETED = register_metric(
+    Gauge,
+    "user_purge_last_completed_timestamp_seconds",
+    "清理任务最近一次扫描完全部过期数据的时间",
+    ["task"]
+)
+
+TOKENS_TASK = "verification_tokens"
+ACCOUNTS_TASK = "unverified_users"
+
+
+def encode_checkpoint(key: Optional[PurgeKey]) -> Optional[str]:
+    """编码扫描位置"""
+    if key is None:
+        return None
+    expires, user_id = key
+    return f"{expires.isoformat()}|{user_id}"
+
+
+def decode_checkpoint(value: Optional[str]) -> Optional[PurgeKey]:
+    """解码扫描位置，无法解析时从头开始"""
+    if not value:
+        return None
+    try:
+        expires, user_id = value.split("|")
+        return datetime.fromisoformat(expires), UUID(user_id)
+    except ValueError:
+        logger.warning(f"清理任务断点无效，从头开始: checkpoint={value}")
+        return None
+
+
+def load_checkpoint(session: Session, name: str) -> Optional[str]:
+    """读取任务断点"""
+    checkpoint = session.get(MaintenanceCheckpointModel, name)
+    return checkpoint.cursor if checkpoint is not None else None
+
+
+def save_checkpoint(session: Session, name: str, cursor: Optional[str]) -> None:
+    """写入任务断点（None 表示一轮扫描已结束）"""
+    session.merge(MaintenanceCheckpointModel(name=name, cursor=cursor))
+    session.commit()
+
+
+class UserPurgeJob:
+    """分批清理过期验证 token 和未验证用户"""
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session],
+        token_retention: timedelta = timedelta(days=7),
+        account_retention: timedelta = timedelta(days=30),
+        chunk_size: int = 500,
+        pause_seconds: float = 0.5,
+        max_chunks_per_run: int = 100,
+        archive: Optional[Callable[[List[User]], None]] = None,
+        repository_factory: Callable[[Session], SQLAlchemyUserRepository] = (
+            SQLAlchemyUserRepository
+        ),
+        clock: Callable[[], datetime] = datetime.utcnow
+    ):
+        """
+        初始化任务
+
+        Args:
+            session_factory: 主库会话工厂（加锁选取和删除不能走只读副本）
+            token_retention: 验证 token 过期多久后清除摘要
+            account_retention: 验证过期多久后删除未验证用户
+            chunk_size: 每批行数
+            pause_seconds: 批之间的暂停时间
+            max_chunks_per_run: 每次运行每个步骤最多处理的批数
+            archive: 删除前归档用户（与删除同一事务，失败时回滚本批）
+            repository_factory: 按会话创建用户仓储（传入存在性过滤器等）
+            clock: 当前时间（UTC，与验证过期时间一致）
+
+        Raises:
+            ValueError: chunk_size 或 max_chunks_per_run 小于 1
+        """
+        if chunk_size < 1 or max_chunks_per_run < 1:
+            raise ValueError("chunk_size 和 max_chunks_per_run 必须大于 0")
+
+        self.session_factory = session_factory
+        self.token_retention = token_retention
+        self.account_retention = account_retention
+        self.chunk_size = chunk_size
+        self.pause_seconds = pause_seconds
+        self.max_chunks_per_run = max_chunks_per_run
+        self.archive = archive
+        self.repository_factory = repository_factory
+        self.clock = clock
+        self._cancel_event = threading.Event()
+
+    def run(self) -> Dict[str, int]:
+        """
+        执行一次清理
+
+        Returns:
+            各步骤处理的行数
+        """
+        self._cancel_event.clear()
+        now = self.clock()
+        return {
+            TOKENS_TASK: self._run_task(
+                TOKENS_TASK, now - self.token_retention, self._clear_tokens
+            ),
+            ACCOUNTS_TASK: self._run_task(
+                ACCOUNTS_TASK, now - self.account_retention, self._purge_accounts
+            ),
+        }
+
+    def cancel(self) -> None:
+        """中断正在进行的清理（当前批提交后停止，断点保留）"""
+        self._cancel_event.set()
+
+    def _run_task(
+        self,
+        task: str,
+        expired_before: datetime,
+        process: Callable[[SQLAlchemyUserRepository, datetime, Optional[PurgeKey]], List[Any]]
+    ) -> int:
+        """分批执行一个步骤，每批提交后记录断点"""
+        with self.session_factory() as session:
+            after = decode_checkpoint(load_checkpoint(session, task))
+
+        processed = 0
+        for _ in range(self.max_chunks_per_run):
+            if self._cancel_event.is_set():
+                break
+
+            started_at = time.perf_counter()
+            with self.session_factory() as session:
+                keys = process(self.repository_factory(session), expired_before, after)
+                finished = len(keys) < self.chunk_size
+                if keys:
+                    after = keys[-1]
+                save_checkpoint(session, task, None if finished else encode_checkpoint(after))
+            USER_PURGE_CHUNK_SECONDS.labels(task=task).observe(time.perf_counter() - started_at)
+            USER_PURGE_ROWS.labels(task=task).inc(len(keys))
+            processed += len(keys)
+
+            if finished:
+                USER_PURGE_LAST_COMPLETED.labels(task=task).set_to_current_time()
+                break
+            self._cancel_event.wait(self.pause_seconds)
+
+        if processed:
+            logger.info(f"清理任务完成: task={task}, rows={processed}")
+        return processed
+
+    def _clear_tokens(
+        self,
+        repository: SQLAlchemyUserRepository,
+        expired_before: datetime,
+        after: Optional[PurgeKey]
+    ) -> List[PurgeKey]:
+        """清除一批过期 token 摘要"""
+        return repository.clear_expired_verification_tokens(expired_before, after, self.chunk_size)
+
+    def _purge_accounts(
+        self,
+        repository: SQLAlchemyUserRepository,
+        expired_before: datetime,
+        after: Optional[PurgeKey]
+    ) -> List[PurgeKey]:
+        """删除一批未验证用户"""
+        users = repository.purge_unverified_users(
+            expired_before, after, self.chunk_size, archive=self.archive
+        )
+        return [(user.email_verification_expires, user.id) for user in users]
@@ -0,0 +1,428 @@
+"""异步用户仓储实现
+
+基于 SQLAlchemy AsyncSession（asyncpg / aiosqlite）的用户数据访问实现
+实现 AsyncUserRepository 接口，查询期间不阻塞事件循环
+
+语句构造和模型转换与 SQLAlchemyUserRepository 共用
+"""
+from datetime import datetime
+from typing import Any, AsyncIterator, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+from uuid import UUID
+
+from sqlalchemy import func, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from src.domain.exceptions import ConflictError
+from domain.models.user import BulkCreateResult, User, UserPage, hash_verification_token
+from domain.repositories.user_repository import AsyncUserRepository, CountMode
+from infrastructure.existence_filter import UserExistenceFilter
+from infrastructure.models.user_sql_model import UserModel
+from infrastructure.repositories.user_repository_impl import (
+    SQLAlchemyUserRepository,
+    actual_counts_statement,
+    atomic_insert_statement,
+    bulk_conflict_errors,
+    bulk_conflicting_usernames_statement,
+    build_user_page,
+    bulk_insert_statement,
+    canonical,
+    changed_columns_statement,
+    conflict_error,
+    conflicting_usernames_statement,
+    count_delta_statements,
+    count_deltas,
+    counters_statement,
+    estimated_count_statement,
+    existing_emails_statement,
+    existing_usernames_statement,
+    identities_statement,
+    keyset_page_statement,
+    live_email_condition,
+    live_username_condition,
+    lock_counters_statement,
+    order_by_ids,
+    plan_rows,
+    reconcile_statements,
+    status_change_deltas,
+    stream_users_statement,
+    sum_counters,
+    users_by_ids_statement,
+    version_statement
+)
+
+
+# 模型转换与同步实现共用
+_to_values = SQLAlchemyUserRepository._to_values
+_to_domain = SQLAlchemyUserRepository._to_domain
+_filter_status = SQLAlchemyUserRepository._filter_status
+
+
+class AsyncSQLAlchemyUserRepository(AsyncUserRepository):
+    """SQLAlchemy 异步用户仓储实现"""
+
+    def __init__(
+        self,
+        session: AsyncSession,
+        existence_filter: Optional[UserExistenceFilter] = None
+    ):
+        """
+        初始化仓储
+
+        Args:
+            session: 异步数据库会话（应设置 expire_on_commit=False）
+            existence_filter: 用户名/邮箱存在性过滤器（可选，"一定不存在"时跳过查询）
+        """
+        self.session = session
+        self.existence_filter = existence_filter
+
+    async def create(self, user: User) -> User:
+        """
+        创建新用户，单条 INSERT ... ON CONFLICT DO NOTHING ... RETURNING
+
+        Raises:
+            ConflictError: 用户名（USERNAME_TAKEN）或邮箱（EMAIL_ALREADY_REGISTERED）已存在
+        """
+        values = _to_values(user)
+
+        statement = atomic_insert_statement(self.session.get_bind().dialect.name, values)
+        if statement is not None:
+            user_model = (await self.session.scalars(statement)).first()
+        else:
+            user_model = await self._insert_or_none(values)
+
+        if user_model is None:
+            raise await self._conflict_error(user.username, user.email)
+
+        created_user = _to_domain(user_model)
+        await self._apply_count_deltas(count_deltas([created_user]))
+        await self.session.commit()
+
+        if self.existence_filter is not None:
+            self.existence_filter.add(created_user.username, created_user.email)
+        return created_user
+
+    async def create_many(
+        self,
+        users: Sequence[User],
+        chunk_size: int = 1000
+    ) -> BulkCreateResult:
+        """
+        批量创建用户，每个分块一个事务，见 SQLAlchemyUserRepository.create_many
+
+        Raises:
+            ValueError: chunk_size 小于 1
+        """
+        if chunk_size < 1:
+            raise ValueError("chunk_size 必须大于 0")
+
+        result = BulkCreateResult()
+        for start in range(0, len(users), chunk_size):
+            result.merge(await self._create_chunk(users[start:start + chunk_size], start))
+        return result
+
+    async def find_by_id(self, user_id: UUID) -> Optional[User]:
+        """根据ID查找用户"""
+        return await self._find_one(UserModel.id == user_id)
+
+    async def find_by_ids(self, user_ids: Sequence[UUID]) -> List[User]:
+        """根据ID批量查找用户（一次查询，按请求顺序返回）"""
+        if not user_ids:
+            return []
+
+        user_models = (await self.session.scalars(users_by_ids_statement(set(user_ids)))).all()
+        return order_by_ids((_to_domain(model) for model in user_models), user_ids)
+
+    async def find_version(self, user_id: UUID) -> Optional[datetime]:
+        """查询未删除用户的版本（只读一列）"""
+        return await self.session.scalar(version_statement(user_id))
+
+    async def find_by_email(self, email: str) -> Optional[User]:
+        """根据邮箱查找未删除用户（不区分大小写）"""
+        return await self._find_one(live_email_condition(email))
+
+    async def find_by_username(self, username: str) -> Optional[User]:
+        """根据用户名查找未删除用户（不区分大小写）"""
+        return await self._find_one(live_username_condition(username))
+
+    async def find_by_verification_token(self, token: str) -> Optional[User]:
+        """根据邮箱验证 token 查找用户"""
+        return await self._find_one(
+            UserModel.email_verification_token_hash == hash_verification_token(token)
+        )
+
+    async def email_exists(self, email: str) -> bool:
+        """检查邮箱是否被未删除用户使用（只读索引）"""
+        if not self._might_exist_email(email):
+            return False
+        return await self._exists(UserModel.email_canonical, live_email_condition(email))
+
+    async def username_exists(self, username: str) -> bool:
+        """检查用户名是否被未删除用户使用（只读索引）"""
+        if not self._might_exist_username(username):
+            return False
+        return await self._exists(
+            UserModel.username_canonical, live_username_condition(username)
+        )
+
+    async def find_existing_usernames(self, usernames: Iterable[str]) -> Set[str]:
+        """批量检查用户名是否存在，存在性过滤器排除的候选不进入查询"""
+        candidates = [
+            username for username in dict.fromkeys(usernames)
+            if self._might_exist_username(username)
+        ]
+        if not candidates:
+            return set()
+
+        taken = set(await self.session.scalars(existing_usernames_statement(candidates)))
+        return {username for username in candidates if canonical(username) in taken}
+
+    async def find_existing_emails(self, emails: Iterable[str]) -> Set[str]:
+        """批量检查邮箱是否存在，存在性过滤器排除的候选不进入查询"""
+        candidates = [email for email in dict.fromkeys(emails) if self._might_exist_email(email)]
+        if not candidates:
+            return set()
+
+        taken = set(await self.session.scalars(existing_emails_statement(candidates)))
+        return {email for email in candidates if canonical(email) in taken}
+
+    async def update(self, user: User) -> User:
+        """
+        更新用户（只写入修改过的列，没有修改时不访问数据库）
+
+        未记录修改的实体（不是从仓储加载的）加锁读取后整行写入
+        """
+        changed = user.changed_fields
+        if changed is None:
+            return await self._update_row(user)
+        if not changed:
+            return user
+
+        user_model = await self._update_columns(user, changed)
+        if user_model is None:
+            return None
+
+        updated_user = _to_domain(user_model)
+        await self._apply_count_deltas(status_change_deltas(
+            (user.persisted_value("is_active"), user.persisted_value("is_deleted")),
+            (updated_user.is_active, updated_user.is_deleted)
+        ))
+        await self.session.commit()
+        user.mark_persisted()
+
+        if self.existence_filter is not None and changed & {"username", "email"}:
+            # 用户名/邮箱被修改，新值必须可查到
+            self.existence_filter.add(updated_user.username, updated_user.email)
+        return updated_user
+
+    async def delete(self, user_id: UUID) -> bool:
+        """删除用户（加锁读取，读写分离时在主库上执行）"""
+        user_model = await self.session.get(UserModel, user_id, with_for_update=True)
+
+        if user_model:
+            username, email = user_model.username, user_model.email
+            await self._apply_count_deltas({(user_model.is_active, user_model.is_deleted): -1})
+            await self.session.delete(user_model)
+            await self.session.commit()
+            if self.existence_filter is not None:
+                self.existence_filter.discard(username, email)
+            return True
+
+        return False
+
+    async def find_many(
+        self,
+        offset: int = 0,
+        limit: int = 100,
+        is_active: Optional[bool] = None,
+        is_deleted: Optional[bool] = False
+    ) -> List[User]:
+        """分页查找用户"""
+        statement = _filter_status(select(UserModel), is_active, is_deleted)
+        user_models = await self.session.scalars(
+            statement.order_by(UserModel.created_at).offset(offset).limit(limit)
+        )
+        return [_to_domain(um) for um in user_models]
+
+    async def find_page(
+        self,
+        after: Optional[str] = None,
+        limit: int = 100,
+        is_active: Optional[bool] = None,
+        is_deleted: Optional[bool] = False
+    ) -> UserPage:
+        """按 (created_at, id) 游标分页查找用户"""
+        statement = _filter_status(select(UserModel), is_active, is_deleted)
+        user_models = await self.session.scalars(keyset_page_statement(statement, after, limit))
+        return build_user_page([_to_domain(um) for um in user_models], limit)
+
+    async def iter_users(
+        self,
+        batch_size: int = 1000,
+        is_active: Optional[bool] = None,
+        is_deleted: Optional[bool] = False
+    ) -> AsyncIterator[User]:
+        """按 (created_at, id) 顺序流式读取用户（服务端游标，yield_per）"""
+        statement = _filter_status(stream_users_statement(batch_size), is_active, is_deleted)
+        result = await self.session.stream_scalars(statement)
+        async for user_model in result:
+            yield _to_domain(user_model)
+
+    async def count(
+        self,
+        is_active: Optional[bool] = None,
+        is_deleted: Optional[bool] = False,
+        mode: CountMode = CountMode.EXACT
+    ) -> int:
+        """统计用户数量，计数方式见 SQLAlchemyUserRepository.count"""
+        if mode == CountMode.MAINTAINED:
+            total = sum_counters(
+                await self.session.execute(counters_statement()), is_active, is_deleted
+            )
+            if total is not None:
+                return total
+            mode = CountMode.EXACT
+
+        if mode == CountMode.ESTIMATED and self.session.get_bind().dialect.name == "postgresql":
+            statement = _filter_status(select(UserModel.id), is_active, is_deleted)
+            return plan_rows(await self.session.scalar(estimated_count_statement(statement)))
+
+        statement = _filter_status(select(func.count(UserModel.id)), is_active, is_deleted)
+        return await self.session.scalar(statement)
+
+    async def reconcile_counts(self) -> None:
+        """按 (is_active, is_deleted) 分组统计实际用户数，重写计数器（见 SQLAlchemyUserRepository）"""
+        try:
+            existing = (await self.session.execute(lock_counters_statement())).all()
+            rows = (await self.session.execute(actual_counts_statement())).all()
+            for statement in reconcile_statements(rows, existing):
+                await self.session.execute(statement)
+            await self.session.commit()
+        except Exception:
+            await self.session.rollback()
+            raise
+
+    async def iter_identities(self, batch_size: int = 10000) -> AsyncIterator[Tuple[str, str]]:
+        """流式读取未删除用户的用户名和邮箱（规范形式，用于构建存在性过滤器）"""
+        result = await self.session.stream(
+            identities_statement().execution_options(yield_per=batch_size)
+        )
+        async for row in result:
+            yield row.username_canonical, row.email_canonical
+
+    async def _find_one(self, condition) -> Optional[User]:
+        """按条件查找单个用户"""
+        user_model = await self.session.scalar(select(UserModel).where(condition).limit(1))
+        return _to_domain(user_model) if user_model else None
+
+    async def _exists(self, column, condition) -> bool:
+        """按条件检查用户是否存在（只查询索引列）"""
+        value = await self.session.scalar(select(column).where(condition).limit(1))
+        return value is not None
+
+    def _might_exist_username(self, username: str) -> bool:
+        """存在性过滤器判定用户名可能存在（未配置过滤器时总是 True）"""
+        if self.existence_filter is None:
+            return True
+        return self.existence_filter.usernames.might_contain(canonical(username))
+
+    def _might_exist_email(self, email: str) -> bool:
+        """存在性过滤器判定邮箱可能存在（未配置过滤器时总是 True）"""
+        if self.existence_filter is None:
+            return True
+        return self.existence_filter.emails.might_contain(canonical(email))
+
+    async def _create_chunk(self, users: Sequence[User], offset: int) -> BulkCreateResult:
+        """在一个事务中插入一个分块"""
+        try:
+            statement = bulk_insert_statement(self.session.get_bind().dialect.name)
+            values = [_to_values(user) for user in users]
+            if statement is not None:
+                inserted_ids = set(await self.session.scalars(statement, values))
+            else:
+                inserted_ids = set()
+                for row in values:
+                    user_model = await self._insert_or_none(row)
+                    if user_model is not None:
+                        inserted_ids.add(user_model.id)
+
+            rejected = [
+                (offset + i, user) for i, user in enumerate(users) if user.id not in inserted_ids
+            ]
+            conflicts = {}
+            if rejected:
+                taken_usernames = set(await self.session.scalars(
+                    bulk_conflicting_usernames_statement([user for _, user in rejected])
+                ))
+                conflicts = bulk_conflict_errors(rejected, taken_usernames)
+
+            created = [user for user in users if user.id in inserted_ids]
+            await self._apply_count_deltas(count_deltas(created))
+            await self.session.commit()
+        except Exception:
+            await self.session.rollback()
+            raise
+
+        if self.existence_filter is not None:
+            for user in created:
+                self.existence_filter.add(user.username, user.email)
+        return BulkCreateResult(created=created, conflicts=conflicts)
+
+    async def _apply_count_deltas(self, deltas: Dict[Tuple[bool, bool], int]) -> None:
+        """在当前事务中更新计数器"""
+        for statement in count_delta_statements(deltas):
+            await self.session.execute(statement)
+
+    async def _update_columns(self, user: User, changed: Set[str]) -> Optional[UserModel]:
+        """写入修改的列并取回整行（方言不支持 UPDATE ... RETURNING 时再查询一次）"""
+        statement = changed_columns_statement(user, changed)
+        if self.session.get_bind().dialect.update_returning:
+            return (await self.session.scalars(statement.returning(UserModel))).first()
+
+        if (await self.session.execute(statement)).rowcount == 0:
+            return None
+        return await self.session.get(UserModel, user.id, populate_existing=True)
+
+    async def _update_row(self, user: User) -> Optional[User]:
+        """加锁读取后整行写入（读写分离时在主库上执行）"""
+        user_model = await self.session.get(UserModel, user.id, with_for_update=True)
+
+        if user_model is None:
+            return None
+
+        status_before = (user_model.is_active, user_model.is_deleted)
+        for name, value in _to_values(user).items():
+            if name not in ("id", "created_at"):
+                setattr(user_model, name, value)
+
+        await self._apply_count_deltas(
+            status_change_deltas(status_before, (user.is_active, user.is_deleted))
+        )
+        await self.session.commit()
+        await self.session.refresh(user_model)
+
+        if self.existence_filter is not None:
+            # 用户名/邮箱可能被修改，新值必须可查到
+            self.existence_filter.add(user_model.username, user_model.email)
+        return _to_domain(user_model)
+
+    async def _insert_or_none(self, values: Dict[str, Any]) -> Optional[UserModel]:
+        """不支持 ON CONFLICT 的方言: 在 savepoint 中插入，违反唯一约束时返回 None"""
+        user_model = UserModel(**values)
+        try:
+            async with self.session.begin_nested():
+                self.session.add(user_model)
+        except IntegrityError:
+            return None
+        return user_model
+
+    async def _conflict_error(self, username: str, email: str) -> ConflictError:
+        """查询冲突的唯一字段，用户名冲突优先于邮箱冲突"""
+        taken_usernames = (
+            await self.session.scalars(conflicting_usernames_statement(username, email))
+        ).all()
+        return conflict_error(username, email, taken_usernames)
@@ -0,0 +1,518 @@
+"""带缓存的用户仓储
+
+基于规范: SPEC-USER-001, 4.1 性能要求
+
+用户行读多写少，CachedUserRepository 包装任意 UserRepository，
+find_by_id / find_by_ids / find_by_username / find_by_email 先查缓存（读穿透）:
+
+- 进程内 LRU+TTL 层，可选共享层（Redis），共享层故障时按未命中处理
+- 每个用户只缓存一份实体（按 id），用户名和邮箱是指向 id 的索引，三种查找共用同一份实体
+- update / delete 后删除实体和索引；其他进程的进程内层无法通知，由 TTL 限定其过期时间
+- 同一个键的并发未命中只查询一次数据库（防缓存击穿）
+- find_by_ids 一次 MGET 查共享层，两层都未命中的 id 一次 IN 查询加载
+- find_version（条件请求）优先取缓存实体的 updated_at，其次是单独缓存的版本，
+  都未命中时只查询版本列，不加载实体
+- 不缓存"不存在": 刚注册的用户不会因为缓存而查不到
+- 未命中时从主库加载（不走只读副本）: 失效后从延迟的副本读到修改前的行会被写回
+  共享层并保留 shared_ttl_seconds；只有未命中走主库，命中率越高主库负担越小
+"""
+import json
+import logging
+import time
+from dataclasses import fields, replace
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Set
+from uuid import UUID
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from domain.models.user import BulkCreateResult, User, UserPage
+from domain.repositories.user_repository import CountMode, UserRepository
+from infrastructure.cache import CACHE_REQUESTS, LRUTTLCache, SharedCache, SingleFlight
+from infrastructure.repositories.user_repository_impl import canonical
+from infrastructure.routing import read_your_writes
+
+
+logger = logging.getLogger(__name__)
+
+# 需要特殊序列化的字段
+_UUID_FIELDS = {"id"}
+_DATETIME_FIELDS = {
+    "email_verification_expires", "created_at", "updated_at", "last_login"
+}
+
+
+def encode_user(user: User) -> str:
+    """序列化用户实体（共享层存储格式）"""
+    payload = {}
+    for field in fields(User):
+        value = getattr(user, field.name)
+        if value is not None and field.name in _UUID_FIELDS:
+            value = str(value)
+        elif value is not None and field.name in _DATETIME_FIELDS:
+            value = value.isoformat()
+        payload[field.name] = value
+    return json.dumps(payload, separators=(",", ":"))
+
+
+def decode_user(data: Any) -> User:
+    """反序列化用户实体"""
+    payload = json.loads(data)
+    for name in _UUID_FIELDS:
+        if payload.get(name) is not None:
+            payload[name] = UUID(payload[name])
+    for name in _DATETIME_FIELDS:
+        if payload.get(name) is not None:
+            payload[name] = datetime.fromisoformat(payload[name])
+    return User(**payload)
+
+
+class UserCache:
+    """
+    用户实体缓存，由各请求的 CachedUserRepository 共用
+
+    通过索引取到实体后核对字段值: 用户名/邮箱修改后残留的旧索引按未命中处理
+    """
+
+    INDEXED_FIELDS = ("username", "email")
+
+    def __init__(
+        self,
+        max_entries: int = 10000,
+        ttl_seconds: float = 30.0,
+        shared: Optional[SharedCache] = None,
+        shared_ttl_seconds: int = 300,
+        key_prefix: str = "user:v1:",
+        clock: Callable[[], float] = time.monotonic
+    ):
+        """
+        初始化缓存
+
+        Args:
+            max_entries: 进程内层最大条目数（实体和索引各占一条）
+            ttl_seconds: 进程内层有效期，即其他进程写入后本进程最长的过期时间
+            shared: 共享层（如 redis.Redis），None 表示只用进程内层
+            shared_ttl_seconds: 共享层有效期
+            key_prefix: 共享层键前缀（实体格式变化时更换版本号）
+            clock: 进程内层时钟
+        """
+        self.local = LRUTTLCache("user", max_entries, ttl_seconds, clock)
+        self.shared = shared
+        self.shared_ttl_seconds = shared_ttl_seconds
+        self.key_prefix = key_prefix
+        self._single_flight = SingleFlight("user")
+
+    def get_or_load(
+        self,
+        field: str,
+        value: Any,
+        load: Callable[[], Optional[User]]
+    ) -> Optional[User]:
+        """
+        按 id / username / email 读取用户，未命中时加载并写入缓存
+
+        Returns:
+            用户实体的副本（调用方修改不影响缓存；记录修改的字段，更新时只写入修改的列）
+        """
+        user = self._get_local(field, value)
+        if user is None:
+            user = self._single_flight.do(
+                (field, value), lambda: self._load(field, value, load)
+            )
+        if user is None:
+            return None
+
+        return _tracked_copy(user)
+
+    def get_many_or_load(
+        self,
+        user_ids: Sequence[UUID],
+        load: Callable[[List[UUID]], List[User]]
+    ) -> List[User]:
+        """
+        按 id 批量读取用户，两层都未命中的 id 一次加载并写入缓存
+
+        批量加载不与并发请求合并（各请求的 id 集合一般不同）
+
+        Args:
+            user_ids: 用户ID列表
+            load: 按未命中的 id 列表加载用户
+
+        Returns:
+            存在的用户副本，按 user_ids 中首次出现的顺序排列
+        """
+        user_ids = list(dict.fromkeys(user_ids))
+        found: Dict[UUID, User] = {}
+        for user_id in user_ids:
+            user = self._get_local("id", user_id)
+            if user is not None:
+                found[user_id] = user
+
+        for user in self._get_many_shared([i for i in user_ids if i not in found]):
+            self._put_local(user)
+            found[user.id] = user
+
+        missing = [user_id for user_id in user_ids if user_id not in found]
+        if missing:
+            for user in load(missing):
+                self._put_shared(user)
+                self._put_local(user)
+                found[user.id] = user
+
+        return [_tracked_copy(found[user_id]) for user_id in user_ids if user_id in found]
+
+    def get_version(
+        self,
+        user_id: UUID,
+        load: Callable[[], Optional[datetime]]
+    ) -> Optional[datetime]:
+        """
+        读取未删除用户的版本（updated_at），不复制实体
+
+        依次查进程内层的实体和版本、共享层的版本，都未命中时加载版本列并写入两层
+
+        Args:
+            user_id: 用户ID
+            load: 只查询版本列
+
+        Returns:
+            版本，用户不存在或已删除时返回 None
+        """
+        user = self.local.get(("id", user_id))
+        if user is not None:
+            hit, version = True, None if user.is_deleted else user.updated_at
+        else:
+            version = self.local.get(("version", user_id))
+            hit = version is not None
+        CACHE_REQUESTS.labels(
+            cache="user_version", tier="local", result="hit" if hit else "miss"
+        ).inc()
+        if hit:
+            return version
+
+        version = self._get_shared_version(user_id)
+        if version is None:
+            version = load()
+            if version is None:
+                return None
+            self._put_shared_version(user_id, version)
+
+        self.local.set(("version", user_id), version)
+        return version
+
+    def invalidate(self, user_id: UUID, *users: Optional[User]) -> None:
+        """
+        删除用户的实体和索引
+
+        Args:
+            user_id: 用户ID
+            users: 已知的用户版本（修改前后），用于删除对应的用户名/邮箱索引
+        """
+        versions = [user for user in (self.local.get(("id", user_id)), *users) if user]
+        index_keys = {
+            (field, getattr(user, field))
+            for user in versions for field in self.INDEXED_FIELDS
+        }
+        self.local.delete(("id", user_id), ("version", user_id), *index_keys)
+
+        if self.shared is not None:
+            try:
+                self.shared.delete(
+                    self._shared_key("id", user_id),
+                    self._shared_key("version", user_id),
+                    *(self._shared_key(field, value) for field, value in index_keys)
+                )
+            except Exception as e:
+                logger.warning(f"共享缓存失效失败: user_id={user_id}, error={str(e)}")
+
+    def _load(self, field: str, value: Any, load: Callable[[], Optional[User]]) -> Optional[User]:
+        """查共享层，再查数据库，并写入缓存"""
+        user = self._get_shared(field, value)
+        if user is None:
+            user = load()
+            if user is None:
+                return None
+            self._put_shared(user)
+
+        self._put_local(user)
+        return user
+
+    def _get_local(self, field: str, value: Any) -> Optional[User]:
+        """查进程内层"""
+        user_id = value if field == "id" else self.local.get((field, value))
+        user = self.local.get(("id", user_id)) if user_id is not None else None
+        if user is not None and getattr(user, field) != value:
+            user = None
+
+        CACHE_REQUESTS.labels(
+            cache="user", tier="local", result="miss" if user is None else "hit"
+        ).inc()
+        return user
+
+    def _put_local(self, user: User) -> None:
+        """写入进程内层"""
+        self.local.set(("id", user.id), replace(user))
+        for field in self.INDEXED_FIELDS:
+            self.local.set((field, getattr(user, field)), user.id)
+
+    def _get_shared(self, field: str, value: Any) -> Optional[User]:
+        """查共享层，故障时按未命中处理"""
+        if self.shared is None:
+            return None
+
+        try:
+            if field == "id":
+                data = self.shared.get(self._shared_key("id", value))
+            else:
+                user_id = self.shared.get(self._shared_key(field, value))
+                data = self.shared.get(self._shared_key("id", _text(user_id))) if user_id else None
+            user = decode_user(data) if data else None
+        except Exception as e:
+            logger.warning(f"共享缓存读取失败: {field}={value}, error={str(e)}")
+            user = None
+
+        if user is not None and getattr(user, field) != value:
+            user = None
+
+        CACHE_REQUESTS.labels(
+            cache="user", tier="shared", result="miss" if user is None else "hit"
+        ).inc()
+        return user
+
+    def _get_many_shared(self, user_ids: List[UUID]) -> List[User]:
+        """批量查共享层（一次 MGET），故障时按未命中处理"""
+        if self.shared is None or not user_ids:
+            return []
+
+        try:
+            values = self.shared.mget([self._shared_key("id", user_id) for user_id in user_ids])
+            users = [decode_user(data) for data in values if data]
+        except Exception as e:
+            logger.warning(f"共享缓存批量读取失败: count={len(user_ids)}, error={str(e)}")
+            users = []
+
+        CACHE_REQUESTS.labels(cache="user", tier="shared", result="hit").inc(len(users))
+        CACHE_REQUESTS.labels(
+            cache="user", tier="shared", result="miss"
+        ).inc(len(user_ids) - len(users))
+        return users
+
+    def _put_shared(self, user: User) -> None:
+        """写入共享层，故障时只记录日志"""
+        if self.shared is None:
+            return
+
+        try:
+            self.shared.set(
+                self._shared_key("id", user.id), encode_user(user), ex=self.shared_ttl_seconds
+            )
+            for field in self.INDEXED_FIELDS:
+                self.shared.set(
+                    self._shared_key(field, getattr(user, field)),
+                    str(user.id),
+                    ex=self.shared_ttl_seconds
+                )
+        except Exception as e:
+            logger.warning(f"共享缓存写入失败: user_id={user.id}, error={str(e)}")
+            return
+
+        if not user.is_deleted:
+            self._put_shared_version(user.id, user.updated_at)
+
+    def _get_shared_version(self, user_id: UUID) -> Optional[datetime]:
+        """查共享层的版本，故障时按未命中处理"""
+        if self.shared is None:
+            return None
+
+        try:
+            data = self.shared.get(self._shared_key("version", user_id))
+            version = datetime.fromisoformat(_text(data)) if data else None
+        except Exception as e:
+            logger.warning(f"共享缓存版本读取失败: user_id={user_id}, error={str(e)}")
+            version = None
+
+        CACHE_REQUESTS.labels(
+            cache="user_version", tier="shared", result="miss" if version is None else "hit"
+        ).inc()
+        return version
+
+    def _put_shared_version(self, user_id: UUID, version: datetime) -> None:
+        """写入共享层的版本，故障时只记录日志"""
+        if self.shared is None:
+            return
+
+        try:
+            self.shared.set(
+                self._shared_key("version", user_id),
+                version.isoformat(),
+                ex=self.shared_ttl_seconds
+            )
+        except Exception as e:
+            logger.warning(f"共享缓存版本写入失败: user_id={user_id}, error={str(e)}")
+
+    def _shared_key(self, field: str, value: Any) -> str:
+        """共享层的键"""
+        return f"{self.key_prefix}{field}:{value}"
+
+
+def _tracked_copy(user: User) -> User:
+    """缓存实体的副本（调用方修改不影响缓存；记录修改的字段）"""
+    copy = replace(user)
+    copy.mark_persisted()
+    return copy
+
+
+def _from_primary(load: Callable[..., Any]) -> Callable[..., Any]:
+    """
+    缓存填充走主库
+
+    只读副本可能落后于刚提交的更新: 失效后立即从副本加载会读到修改前的行，
+    写入缓存后在有效期内一直返回旧值
+    """
+    def load_from_primary(*args: Any) -> Any:
+        with read_your_writes(sticky=True):
+            return load(*args)
+    return load_from_primary
+
+
+def _text(value: Any) -> str:
+    """Redis 客户端默认返回 bytes"""
+    return value.decode("utf-8") if isinstance(value, bytes) else str(value)
+
+
+class CachedUserRepository(UserRepository):
+    """读穿透缓存的用户仓储装饰器"""
+
+    def __init__(self, repository: UserRepository, cache: UserCache):
+        """
+        初始化仓储
+
+        Args:
+            repository: 被包装的仓储（每个请求一个）
+            cache: 用户实体缓存（进程内共用）
+        """
+        self.repository = repository
+        self.cache = cache
+
+    def create(self, user: User) -> User:
+        """创建新用户（不预热缓存，注册路径不增加缓存写入）"""
+        return self.repository.create(user)
+
+    def create_many(self, users: Sequence[User], chunk_size: int = 1000) -> BulkCreateResult:
+        """批量创建用户"""
+        return self.repository.create_many(users, chunk_size)
+
+    def update(self, user: User) -> User:
+        """更新用户，提交后删除缓存"""
+        try:
+            return self.repository.update(user)
+        finally:
+            self.cache.invalidate(user.id, user)
+
+    def delete(self, user_id: UUID) -> bool:
+        """删除用户，提交后删除缓存"""
+        try:
+            return self.repository.delete(user_id)
+        finally:
+            self.cache.invalidate(user_id)
+
+    def find_by_id(self, user_id: UUID) -> Optional[User]:
+        """根据ID查找用户（缓存）"""
+        try:
+            key = user_id if isinstance(user_id, UUID) else UUID(str(user_id))
+        except ValueError:
+            return self.repository.find_by_id(user_id)
+        return self.cache.get_or_load(
+            "id", key, _from_primary(lambda: self.repository.find_by_id(key))
+        )
+
+    def find_by_ids(self, user_ids: Sequence[UUID]) -> List[User]:
+        """根据ID批量查找用户（缓存，未命中的ID一次查询）"""
+        return self.cache.get_many_or_load(
+            user_ids, _from_primary(self.repository.find_by_ids)
+        )
+
+    def find_version(self, user_id: UUID) -> Optional[datetime]:
+        """查询未删除用户的版本（缓存，未命中时只查询版本列）"""
+        return self.cache.get_version(
+            user_id, _from_primary(lambda: self.repository.find_version(user_id))
+        )
+
+    def find_by_username(self, username: str) -> Optional[User]:
+        """根据用户名查找用户（缓存，按规范形式作键）"""
+        username = canonical(username)
+        return self.cache.get_or_load(
+            "username", username,
+            _from_primary(lambda: self.repository.find_by_username(username))
+        )
+
+    def find_by_email(self, email: str) -> Optional[User]:
+        """根据邮箱查找用户（缓存，按规范形式作键）"""
+        email = canonical(email)
+        return self.cache.get_or_load(
+            "email", email, _from_primary(lambda: self.repository.find_by_email(email))
+        )
+
+    def find_by_verification_token(self, token: str) -> Optional[User]:
+        """根据邮箱验证 token 查找用户（一次性查询，不缓存）"""
+        return self.repository.find_by_verification_token(token)
+
+    def find_many(
+        self,
+        offset: int = 0,
+        limit: int = 100,
+        is_active: Optional[bool] = None,
+        is_deleted: Optional[bool] = False
+    ) -> List[User]:
+        """分页查找用户"""
+        return self.repository.find_many(offset, limit, is_active, is_deleted)
+
+    def find_page(
+        self,
+        after: Optional[str] = None,
+        limit: int = 100,
+        is_active: Optional[bool] = None,
+        is_deleted: Optional[bool] = False
+    ) -> UserPage:
+        """按游标分页查找用户"""
+        return self.repository.find_page(after, limit, is_active, is_deleted)
+
+    def iter_users(
+        self,
+        batch_size: int = 1000,
+        is_active: Optional[bool] = None,
+        is_deleted: Optional[bool] = False
+    ) -> Iterator[User]:
+        """流式读取用户（全量扫描，不经过缓存）"""
+        return self.repository.iter_users(batch_size, is_active, is_deleted)
+
+    def count(
+        self,
+        is_active: Optional[bool] = None,
+        is_deleted: Optional[bool] = False,
+        mode: CountMode = CountMode.EXACT
+    ) -> int:
+        """统计用户数量"""
+        return self.repository.count(is_active, is_deleted, mode)
+
+    def reconcile_counts(self) -> None:
+        """校准用户数量计数器"""
+        self.repository.reconcile_counts()
+
+    def username_exists(self, username: str) -> bool:
+        """检查用户名是否存在"""
+        return self.repository.username_exists(username)
+
+    def find_existing_usernames(self, usernames: Iterable[str]) -> Set[str]:
+        """批量检查用户名是否存在"""
+        return self.repository.find_existing_usernames(usernames)
+
+    def find_existing_emails(self, emails: Iterable[str]) -> Set[str]:
+        """批量检查邮箱是否存在"""
+        return self.repository.find_existing_emails(emails)
+
+    def email_exists(self, email: str) -> bool:
+        """检查邮箱是否存在"""
+        return self.repository.email_exists(email)
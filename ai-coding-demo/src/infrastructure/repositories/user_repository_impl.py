@@ -3,25 +3,478 @@
 基于 SQLAlchemy 的用户数据访问实现
 实现 UserRepository 接口
 """
-from typing import Optional, List
+import json
+from collections import Counter
+from datetime import datetime
+from typing import (
+    Any, Callable, Collection, Dict, Iterable, Iterator, Optional, List, Sequence, Set, Tuple
+)
 from uuid import UUID
 
+from sqlalchemy import (
+    ColumnElement, Select, TextClause, Update, and_, delete, false, func, insert, or_, select,
+    text, tuple_, update
+)
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
 import sys
 import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 
-from domain.models.user import User
-from domain.repositories.user_repository import UserRepository
-from infrastructure.models.user_sql_model import UserModel
+from src.domain.exceptions import ConflictError
+from domain.models.user import BulkCreateResult, User, UserPage, hash_verification_token
+from domain.pagination import PageCursor
+from domain.repositories.user_repository import CountMode, UserRepository
+from infrastructure.existence_filter import UserExistenceFilter
+from infrastructure.models.user_sql_model import UserCountModel, UserModel
+
+
+# 支持 INSERT ... ON CONFLICT DO NOTHING ... RETURNING 的方言
+_CONFLICT_AWARE_INSERTS = {
+    "postgresql": postgresql_insert,
+    "sqlite": sqlite_insert,
+}
+
+# 清理任务的扫描位置: (email_verification_expires, id)
+PurgeKey = Tuple[datetime, UUID]
+
+# 计数器覆盖的全部 (is_active, is_deleted) 组合
+COUNT_BUCKETS = [
+    (is_active, is_deleted) for is_active in (True, False) for is_deleted in (True, False)
+]
+
+
+def atomic_insert_statement(dialect_name: str, values: Dict[str, Any]):
+    """
+    构造 INSERT ... ON CONFLICT DO NOTHING ... RETURNING 语句
+
+    Returns:
+        插入语句；方言不支持时返回 None
+    """
+    dialect_insert = _CONFLICT_AWARE_INSERTS.get(dialect_name)
+    if dialect_insert is None:
+        return None
+    return (
+        dialect_insert(UserModel)
+        .values(**values)
+        .on_conflict_do_nothing()
+        .returning(UserModel)
+    )
+
+
+def bulk_insert_statement(dialect_name: str):
+    """
+    构造批量插入语句: 按参数列表执行（executemany），冲突行跳过，返回插入成功的 id
+
+    SQLAlchemy 会把参数列表合并为多行 VALUES 语句（insertmanyvalues），
+    每批只需一次往返
+
+    Returns:
+        插入语句；方言不支持时返回 None
+    """
+    dialect_insert = _CONFLICT_AWARE_INSERTS.get(dialect_name)
+    if dialect_insert is None:
+        return None
+    table = UserModel.__table__
+    return dialect_insert(table).on_conflict_do_nothing().returning(table.c.id)
+
+
+def canonical(value: str) -> str:
+    """用户名/邮箱的规范形式，与 UserModel 生成列的 lower() 一致"""
+    return value.lower()
+
+
+def live_username_condition(username: str) -> ColumnElement[bool]:
+    """
+    按规范形式匹配未删除用户的用户名
+
+    is_deleted = false 以字面量形式出现，与部分唯一索引的条件一致才能命中索引
+    """
+    return and_(
+        UserModel.username_canonical == canonical(username), UserModel.is_deleted == false()
+    )
+
+
+def live_email_condition(email: str) -> ColumnElement[bool]:
+    """按规范形式匹配未删除用户的邮箱（命中部分唯一索引）"""
+    return and_(UserModel.email_canonical == canonical(email), UserModel.is_deleted == false())
+
+
+def users_by_ids_statement(user_ids: Collection[UUID]) -> Select:
+    """按ID批量查询用户（一次 IN 查询，走主键索引）"""
+    return select(UserModel).where(UserModel.id.in_(user_ids))
+
+
+def version_statement(user_id: UUID) -> Select:
+    """未删除用户的版本（updated_at，未设置时取 created_at），按主键点查"""
+    return select(func.coalesce(UserModel.updated_at, UserModel.created_at)).where(
+        UserModel.id == user_id, UserModel.is_deleted == false()
+    )
+
+
+def order_by_ids(users: Iterable[User], user_ids: Iterable[UUID]) -> List[User]:
+    """按请求的ID顺序排列用户，重复的ID只保留一次，不存在的ID跳过"""
+    by_id = {user.id: user for user in users}
+    return [by_id[user_id] for user_id in dict.fromkeys(user_ids) if user_id in by_id]
+
+
+def existing_usernames_statement(usernames: Collection[str]) -> Select:
+    """查询已被未删除用户使用的用户名（规范形式，只读索引）"""
+    return select(UserModel.username_canonical).where(
+        UserModel.username_canonical.in_({canonical(username) for username in usernames}),
+        UserModel.is_deleted == false()
+    )
+
+
+def existing_emails_statement(emails: Collection[str]) -> Select:
+    """查询已被未删除用户使用的邮箱（规范形式，只读索引）"""
+    return select(UserModel.email_canonical).where(
+        UserModel.email_canonical.in_({canonical(email) for email in emails}),
+        UserModel.is_deleted == false()
+    )
+
+
+def conflicting_usernames_statement(username: str, email: str) -> Select:
+    """查询与待插入用户名或邮箱冲突的已有用户名（规范形式）"""
+    return select(UserModel.username_canonical).where(
+        or_(live_username_condition(username), live_email_condition(email))
+    )
+
+
+def bulk_conflicting_usernames_statement(users: Sequence[User]) -> Select:
+    """查询与一批待插入用户名或邮箱冲突的已有用户名（规范形式）"""
+    return select(UserModel.username_canonical).where(
+        or_(
+            UserModel.username_canonical.in_({canonical(user.username) for user in users}),
+            UserModel.email_canonical.in_({canonical(user.email) for user in users})
+        ),
+        UserModel.is_deleted == false()
+    )
+
+
+def identities_statement() -> Select:
+    """未删除用户的规范用户名和邮箱"""
+    return select(UserModel.username_canonical, UserModel.email_canonical).where(
+        UserModel.is_deleted == false()
+    )
+
+
+def bulk_conflict_errors(
+    rejected: Sequence[Tuple[int, User]],
+    taken_usernames: Collection[str]
+) -> Dict[int, ConflictError]:
+    """为批量插入中被跳过的行构造冲突错误（输入下标 → 错误）"""
+    return {
+        index: conflict_error(user.username, user.email, taken_usernames)
+        for index, user in rejected
+    }
+
+
+def conflict_error(
+    username: str,
+    email: str,
+    taken_usernames: Collection[str]
+) -> ConflictError:
+    """按冲突查询结果（规范形式的用户名）构造冲突错误，用户名冲突优先于邮箱冲突"""
+    if canonical(username) in taken_usernames:
+        return ConflictError(
+            message=f"用户名 '{username}' 已被使用",
+            code="USERNAME_TAKEN"
+        )
+    return ConflictError(
+        message=f"邮箱 '{email}' 已被注册",
+        code="EMAIL_ALREADY_REGISTERED"
+    )
+
+
+def changed_columns_statement(user: User, changed: Collection[str]) -> Update:
+    """
+    构造只写入修改列的 UPDATE 语句（updated_at 未修改时由列的 onupdate 维护）
+
+    支持时由调用方追加 .returning(UserModel)，一次往返取回更新后的整行
+    """
+    return (
+        update(UserModel)
+        .where(UserModel.id == user.id)
+        .values({name: getattr(user, name) for name in changed})
+        .execution_options(synchronize_session=False, populate_existing=True)
+    )
+
+
+def keyset_page_statement(statement: Select, after: Optional[str], limit: int) -> Select:
+    """
+    为查询加上 (created_at, id) 游标条件和排序，多取一行用于判断是否有下一页
+
+    由 idx_user_created_at_id 复合索引支撑，每页都是一次索引范围扫描
+
+    Raises:
+        ValidationError: 游标无效
+    """
+    if after is not None:
+        cursor = PageCursor.decode(after)
+        statement = statement.where(
+            tuple_(UserModel.created_at, UserModel.id) > (cursor.created_at, cursor.id)
+        )
+    return statement.order_by(UserModel.created_at, UserModel.id).limit(limit + 1)
+
+
+def stream_users_statement(batch_size: int) -> Select:
+    """按 (created_at, id) 顺序读取用户，服务端游标每次取 batch_size 行"""
+    return (
+        select(UserModel)
+        .order_by(UserModel.created_at, UserModel.id)
+        .execution_options(yield_per=batch_size)
+    )
+
+
+def build_user_page(users: List[User], limit: int) -> UserPage:
+    """按多取的一行判断是否有下一页，生成下一页游标"""
+    if len(users) <= limit:
+        return UserPage(items=users)
+
+    items = users[:limit]
+    last = items[-1]
+    return UserPage(
+        items=items,
+        next_cursor=PageCursor(created_at=last.created_at, id=last.id).encode()
+    )
+
+
+def expired_unverified_statement(
+    columns: Sequence[Any],
+    expired_before: datetime,
+    after: Optional[PurgeKey],
+    limit: int,
+    with_token: bool = False
+) -> Select:
+    """
+    按 (email_verification_expires, id) 顺序加锁选取一批验证已过期的未验证用户
+
+    由 idx_user_unverified_expires_id 部分索引支撑；从上一批的位置继续扫描，
+    不必每批重新跨过已删除（尚未清理）的索引项。
+    SKIP LOCKED: 正在验证或更新的行留给下一轮，不等待也不阻塞注册和验证请求
+
+    Args:
+        columns: 选取的列
+        expired_before: 过期时间早于该时间的用户
+        after: 上一批最后一行的位置
+        limit: 每批行数
+        with_token: 只选取仍保存验证 token 摘要的用户
+    """
+    conditions = [
+        UserModel.email_verified == false(),
+        UserModel.email_verification_expires < expired_before,
+    ]
+    if with_token:
+        conditions.append(UserModel.email_verification_token_hash.is_not(None))
+    if after is not None:
+        conditions.append(
+            tuple_(UserModel.email_verification_expires, UserModel.id) > tuple_(*after)
+        )
+    return (
+        select(*columns)
+        .where(*conditions)
+        .order_by(UserModel.email_verification_expires, UserModel.id)
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+    )
+
+
+def count_deltas(users: Iterable[User], sign: int = 1) -> Dict[Tuple[bool, bool], int]:
+    """按 (is_active, is_deleted) 组合汇总一批用户对计数器的增减"""
+    deltas = Counter()
+    for user in users:
+        deltas[(user.is_active, user.is_deleted)] += sign
+    return deltas
+
+
+def status_change_deltas(
+    before: Tuple[bool, bool],
+    after: Tuple[bool, bool]
+) -> Dict[Tuple[bool, bool], int]:
+    """状态变更对计数器的增减（状态未变时为空）"""
+    if before == after:
+        return {}
+    return {before: -1, after: 1}
+
+
+def count_delta_statements(deltas: Dict[Tuple[bool, bool], int]) -> List[Update]:
+    """
+    构造计数器增减语句，与用户写入在同一事务中执行
+
+    只更新已有的计数器行: 计数器由 reconcile_counts 初始化，初始化前的增减没有意义
+    """
+    return [
+        update(UserCountModel)
+        .where(UserCountModel.is_active == is_active, UserCountModel.is_deleted == is_deleted)
+        .values(count=UserCountModel.count + delta)
+        for (is_active, is_deleted), delta in deltas.items()
+        if delta
+    ]
+
+
+def counters_statement() -> Select:
+    """读取全部计数器（最多 len(COUNT_BUCKETS) 行）"""
+    return select(UserCountModel.is_active, UserCountModel.is_deleted, UserCountModel.count)
+
+
+def sum_counters(
+    rows: Iterable[Any],
+    is_active: Optional[bool],
+    is_deleted: Optional[bool]
+) -> Optional[int]:
+    """
+    汇总匹配过滤条件的计数器
+
+    Returns:
+        用户数量；计数器尚未初始化（缺少组合）时返回 None
+    """
+    counters = {(row.is_active, row.is_deleted): row.count for row in rows}
+    if len(counters) < len(COUNT_BUCKETS):
+        return None
+    return sum(
+        count for (active, deleted), count in counters.items()
+        if (is_active is None or active == is_active)
+        and (is_deleted is None or deleted == is_deleted)
+    )
+
+
+def actual_counts_statement() -> Select:
+    """按 (is_active, is_deleted) 分组统计实际用户数（校准计数器用）"""
+    return select(
+        UserModel.is_active, UserModel.is_deleted, func.count(UserModel.id).label("count")
+    ).group_by(UserModel.is_active, UserModel.is_deleted)
+
+
+def lock_counters_statement() -> Select:
+    """锁定已有的计数器行，串行化并发的校准"""
+    return counters_statement().with_for_update()
+
+
+def reconcile_statements(rows: Iterable[Any], existing: Iterable[Any]) -> List[Any]:
+    """
+    构造用实际统计结果重写计数器的语句
+
+    已有的计数器行原地更新（不删除，持有行锁的校准之间互相等待），缺少的组合补插。
+    调用方先锁定计数器行再统计，统计期间提交的写入要等校准提交后才能更新计数器，
+    不会被统计结果覆盖（代价是统计期间注册事务在计数器更新处等待）
+
+    Args:
+        rows: actual_counts_statement 的结果
+        existing: lock_counters_statement 的结果
+    """
+    counts = {bucket: 0 for bucket in COUNT_BUCKETS}
+    counts.update({(row.is_active, row.is_deleted): row.count for row in rows})
+    present = {(row.is_active, row.is_deleted) for row in existing}
+    statements: List[Any] = [
+        update(UserCountModel)
+        .where(UserCountModel.is_active == is_active, UserCountModel.is_deleted == is_deleted)
+        .values(count=count)
+        for (is_active, is_deleted), count in counts.items()
+        if (is_active, is_deleted) in present
+    ]
+    missing = [
+        {"is_active": is_active, "is_deleted": is_deleted, "count": count}
+        for (is_active, is_deleted), count in counts.items()
+        if (is_active, is_deleted) not in present
+    ]
+    if missing:
+        statements.append(insert(UserCountModel).values(missing))
+    return statements
+
+
+def estimated_count_statement(statement: Select) -> TextClause:
+    """
+    构造 EXPLAIN 语句读取查询规划器对过滤后行数的估计（仅 PostgreSQL）
+
+    过滤条件只有布尔常量，可以安全地内联为字面量
+    """
+    compiled = statement.compile(
+        dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}
+    )
+    return text(f"EXPLAIN (FORMAT JSON) {compiled}")
+
+
+def plan_rows(plan: Any) -> int:
+    """从 EXPLAIN (FORMAT JSON) 的结果中取出估计行数（驱动可能返回未解析的 JSON 文本）"""
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
 
 
 class SQLAlchemyUserRepository(UserRepository):
     """SQLAlchemy 用户仓储实现"""
 
-    def __init__(self, session: Session):
+    def __init__(
+        self,
+        session: Session,
+        existence_filter: Optional[UserExistenceFilter] = None
+    ):
+        """
+        初始化仓储
+
+        Args:
+            session: 数据库会话
+            existence_filter: 用户名/邮箱存在性过滤器（可选，"一定不存在"时跳过查询）
+        """
         self.session = session
+        self.existence_filter = existence_filter
+
+    def create(self, user: User) -> User:
+        """
+        创建新用户（规范: SPEC-USER-001, 2.3 边缘情况处理）
+
+        一条 INSERT ... ON CONFLICT DO NOTHING ... RETURNING 完成插入和唯一性检测，
+        取代"先查用户名、再查邮箱、再插入、再 refresh"的四次往返；
+        并发注册相同用户名/邮箱时由唯一约束保证只有一条成功。
+        只有发生冲突时才额外查询一次，区分是用户名还是邮箱冲突。
+
+        Raises:
+            ConflictError: 用户名（USERNAME_TAKEN）或邮箱（EMAIL_ALREADY_REGISTERED）已存在
+        """
+        values = self._to_values(user)
+
+        statement = atomic_insert_statement(self.session.get_bind().dialect.name, values)
+        if statement is not None:
+            user_model = self.session.scalars(statement).first()
+        else:
+            user_model = self._insert_or_none(values)
+
+        if user_model is None:
+            raise self._conflict_error(user.username, user.email)
+
+        # 提交前转换，避免提交后过期的属性触发 refresh 查询
+        created_user = self._to_domain(user_model)
+        self._apply_count_deltas(count_deltas([created_user]))
+        self.session.commit()
+
+        if self.existence_filter is not None:
+            self.existence_filter.add(created_user.username, created_user.email)
+        return created_user
+
+    def create_many(self, users: Sequence[User], chunk_size: int = 1000) -> BulkCreateResult:
+        """
+        批量创建用户（用于数据迁移和批量导入）
+
+        每个分块一次 executemany 形式的 INSERT ... ON CONFLICT DO NOTHING ... RETURNING id，
+        并在独立事务中提交；未返回 id 的行即为冲突行，
+        每个分块最多再查询一次区分用户名/邮箱冲突。
+        某个分块出现非冲突错误时回滚该分块并抛出，之前的分块已提交。
+
+        Raises:
+            ValueError: chunk_size 小于 1
+        """
+        if chunk_size < 1:
+            raise ValueError("chunk_size 必须大于 0")
+
+        result = BulkCreateResult()
+        for start in range(0, len(users), chunk_size):
+            result.merge(self._create_chunk(users[start:start + chunk_size], start))
+        return result
 
     def save(self, user: User) -> User:
         """保存用户"""
@@ -35,9 +488,12 @@ class SQLAlchemyUserRepository(UserRepository):
         )
 
         self.session.add(user_model)
+        self._apply_count_deltas(count_deltas([user]))
         self.session.commit()
         self.session.refresh(user_model)
 
+        if self.existence_filter is not None:
+            self.existence_filter.add(user_model.username, user_model.email)
         return self._to_domain(user_model)
 
     def find_by_id(self, user_id: UUID) -> Optional[User]:
@@ -48,62 +504,120 @@ class SQLAlchemyUserRepository(UserRepository):
 
         return self._to_domain(user_model) if user_model else None
 
+    def find_by_ids(self, user_ids: Sequence[UUID]) -> List[User]:
+        """根据ID批量查找用户（一次查询，按请求顺序返回）"""
+        if not user_ids:
+            return []
+
+        user_models = self.session.scalars(users_by_ids_statement(set(user_ids))).all()
+        return order_by_ids((self._to_domain(model) for model in user_models), user_ids)
+
+    def find_version(self, user_id: UUID) -> Optional[datetime]:
+        """查询未删除用户的版本（只读一列）"""
+        return self.session.scalar(version_statement(user_id))
+
     def find_by_email(self, email: str) -> Optional[User]:
-        """根据邮箱查找用户"""
+        """根据邮箱查找未删除用户（不区分大小写）"""
         user_model = self.session.query(UserModel).filter(
-            UserModel.email == email
+            live_email_condition(email)
         ).first()
 
         return self._to_domain(user_model) if user_model else None
 
     def find_by_username(self, username: str) -> Optional[User]:
-        """根据用户名查找用户"""
+        """根据用户名查找未删除用户（不区分大小写）"""
         user_model = self.session.query(UserModel).filter(
-            UserModel.username == username
+            live_username_condition(username)
         ).first()
 
         return self._to_domain(user_model) if user_model else None
 
     def email_exists(self, email: str) -> bool:
-        """检查邮箱是否存在"""
-        return self.session.query(UserModel).filter(
-            UserModel.email == email
-        ).first() is not None
+        """检查邮箱是否被未删除用户使用（只读索引）"""
+        if not self._might_exist_email(email):
+            return False
+
+        return self.session.scalar(
+            select(UserModel.email_canonical).where(live_email_condition(email)).limit(1)
+        ) is not None
 
     def username_exists(self, username: str) -> bool:
-        """检查用户名是否存在"""
-        return self.session.query(UserModel).filter(
-            UserModel.username == username
-        ).first() is not None
+        """检查用户名是否被未删除用户使用（只读索引）"""
+        if not self._might_exist_username(username):
+            return False
+
+        return self.session.scalar(
+            select(UserModel.username_canonical).where(live_username_condition(username)).limit(1)
+        ) is not None
+
+    def find_existing_usernames(self, usernames: Iterable[str]) -> Set[str]:
+        """批量检查用户名是否存在，存在性过滤器排除的候选不进入查询"""
+        candidates = [
+            username for username in dict.fromkeys(usernames)
+            if self._might_exist_username(username)
+        ]
+        if not candidates:
+            return set()
+
+        taken = set(self.session.scalars(existing_usernames_statement(candidates)))
+        return {username for username in candidates if canonical(username) in taken}
+
+    def find_existing_emails(self, emails: Iterable[str]) -> Set[str]:
+        """批量检查邮箱是否存在，存在性过滤器排除的候选不进入查询"""
+        candidates = [email for email in dict.fromkeys(emails) if self._might_exist_email(email)]
+        if not candidates:
+            return set()
+
+        taken = set(self.session.scalars(existing_emails_statement(candidates)))
+        return {email for email in candidates if canonical(email) in taken}
 
     def update(self, user: User) -> User:
-        """更新用户"""
-        user_model = self.session.query(UserModel).filter(
-            UserModel.id == user.id
-        ).first()
+        """
+        更新用户（规范: SPEC-USER-001, 4.1 性能要求）
 
-        if user_model:
-            user_model.email = user.email
-            user_model.password_hash = user.password_hash
-            user_model.username = user.username
-            user_model.is_active = user.is_active
+        从仓储加载的实体只写入修改过的列: 一条 UPDATE ... SET <修改的列> ... RETURNING，
+        没有修改时不访问数据库；计数器按加载时的状态计算增减。
+        未记录修改的实体（不是从仓储加载的）加锁读取后整行写入。
 
-            self.session.commit()
-            self.session.refresh(user_model)
+        Returns:
+            更新后的用户；用户不存在时返回 None
+        """
+        changed = user.changed_fields
+        if changed is None:
+            return self._update_row(user)
+        if not changed:
+            return user
 
-            return self._to_domain(user_model)
+        user_model = self._update_columns(user, changed)
+        if user_model is None:
+            return None
 
-        return None
+        updated_user = self._to_domain(user_model)
+        self._apply_count_deltas(status_change_deltas(
+            (user.persisted_value("is_active"), user.persisted_value("is_deleted")),
+            (updated_user.is_active, updated_user.is_deleted)
+        ))
+        self.session.commit()
+        user.mark_persisted()
+
+        if self.existence_filter is not None and changed & {"username", "email"}:
+            # 用户名/邮箱被修改，新值必须可查到
+            self.existence_filter.add(updated_user.username, updated_user.email)
+        return updated_user
 
     def delete(self, user_id: UUID) -> bool:
-        """删除用户"""
+        """删除用户（加锁读取，读写分离时在主库上执行）"""
         user_model = self.session.query(UserModel).filter(
             UserModel.id == user_id
-        ).first()
+        ).with_for_update().first()
 
         if user_model:
+            username, email = user_model.username, user_model.email
+            self._apply_count_deltas({(user_model.is_active, user_model.is_deleted): -1})
             self.session.delete(user_model)
             self.session.commit()
+            if self.existence_filter is not None:
+                self.existence_filter.discard(username, email)
             return True
 
         return False
@@ -113,17 +627,328 @@ class SQLAlchemyUserRepository(UserRepository):
         user_models = self.session.query(UserModel).limit(limit).offset(offset).all()
         return [self._to_domain(um) for um in user_models]
 
+    def find_by_verification_token(self, token: str) -> Optional[User]:
+        """根据邮箱验证 token 查找用户（按摘要走唯一索引点查）"""
+        user_model = self.session.query(UserModel).filter(
+            UserModel.email_verification_token_hash == hash_verification_token(token)
+        ).first()
+
+        return self._to_domain(user_model) if user_model else None
+
+    def find_many(
+        self,
+        offset: int = 0,
+        limit: int = 100,
+        is_active: Optional[bool] = None,
+        is_deleted: Optional[bool] = False
+    ) -> List[User]:
+        """分页查找用户"""
+        query = self._filter_status(self.session.query(UserModel), is_active, is_deleted)
+        user_models = query.order_by(UserModel.created_at).offset(offset).limit(limit).all()
+        return [self._to_domain(um) for um in user_models]
+
+    def find_page(
+        self,
+        after: Optional[str] = None,
+        limit: int = 100,
+        is_active: Optional[bool] = None,
+        is_deleted: Optional[bool] = False
+    ) -> UserPage:
+        """按 (created_at, id) 游标分页查找用户"""
+        statement = self._filter_status(select(UserModel), is_active, is_deleted)
+        user_models = self.session.scalars(keyset_page_statement(statement, after, limit))
+        return build_user_page([self._to_domain(um) for um in user_models], limit)
+
+    def iter_users(
+        self,
+        batch_size: int = 1000,
+        is_active: Optional[bool] = None,
+        is_deleted: Optional[bool] = False
+    ) -> Iterator[User]:
+        """按 (created_at, id) 顺序流式读取用户（服务端游标，yield_per）"""
+        statement = self._filter_status(stream_users_statement(batch_size), is_active, is_deleted)
+        for user_model in self.session.scalars(statement):
+            yield self._to_domain(user_model)
+
+    def count(
+        self,
+        is_active: Optional[bool] = None,
+        is_deleted: Optional[bool] = False,
+        mode: CountMode = CountMode.EXACT
+    ) -> int:
+        """
+        统计用户数量（规范: SPEC-USER-001, 4.1 性能要求）
+
+        ESTIMATED 在 PostgreSQL 上读取 EXPLAIN 的行数估计（精度取决于 ANALYZE 统计信息），
+        其他方言退回精确计数；MAINTAINED 只读取计数器表（读取路径不写入，会话可能路由到副本），
+        计数器尚未由后台校准初始化时退回精确计数
+        """
+        if mode == CountMode.MAINTAINED:
+            total = sum_counters(self.session.execute(counters_statement()), is_active, is_deleted)
+            if total is not None:
+                return total
+            mode = CountMode.EXACT
+
+        if mode == CountMode.ESTIMATED and self.session.get_bind().dialect.name == "postgresql":
+            statement = self._filter_status(select(UserModel.id), is_active, is_deleted)
+            return plan_rows(self.session.scalar(estimated_count_statement(statement)))
+
+        query = self.session.query(func.count(UserModel.id))
+        return self._filter_status(query, is_active, is_deleted).scalar()
+
+    def reconcile_counts(self) -> None:
+        """
+        按 (is_active, is_deleted) 分组统计实际用户数，重写计数器
+
+        写入操作，由后台任务在主库会话上调用；在同一事务中先锁定计数器行，再统计、重写
+        """
+        try:
+            existing = self.session.execute(lock_counters_statement()).all()
+            rows = self.session.execute(actual_counts_statement()).all()
+            for statement in reconcile_statements(rows, existing):
+                self.session.execute(statement)
+            self.session.commit()
+        except Exception:
+            self.session.rollback()
+            raise
+
+    def clear_expired_verification_tokens(
+        self,
+        expired_before: datetime,
+        after: Optional[PurgeKey] = None,
+        limit: int = 500
+    ) -> List[PurgeKey]:
+        """
+        清除一批过期验证 token 的摘要（后台清理任务使用，一批一个短事务）
+
+        Returns:
+            本批处理的行的位置（按扫描顺序），少于 limit 表示已处理完
+        """
+        try:
+            rows = self.session.execute(expired_unverified_statement(
+                [UserModel.email_verification_expires, UserModel.id],
+                expired_before, after, limit, with_token=True
+            )).all()
+            if rows:
+                self.session.execute(
+                    update(UserModel)
+                    .where(UserModel.id.in_([row.id for row in rows]))
+                    .values(email_verification_token_hash=None)
+                    .execution_options(synchronize_session=False)
+                )
+            self.session.commit()
+        except Exception:
+            self.session.rollback()
+            raise
+
+        return [(row.email_verification_expires, row.id) for row in rows]
+
+    def purge_unverified_users(
+        self,
+        expired_before: datetime,
+        after: Optional[PurgeKey] = None,
+        limit: int = 500,
+        archive: Optional[Callable[[List[User]], None]] = None
+    ) -> List[User]:
+        """
+        删除一批验证已过期的未验证用户（后台清理任务使用，一批一个短事务）
+
+        计数器在同一事务中更新
+
+        Args:
+            archive: 提交删除前调用，用于归档被删除的用户；抛出异常时回滚本批
+
+        Returns:
+            本批删除的用户（按扫描顺序），少于 limit 表示已处理完
+        """
+        try:
+            user_models = self.session.scalars(expired_unverified_statement(
+                [UserModel], expired_before, after, limit
+            )).all()
+            users = [self._to_domain(user_model) for user_model in user_models]
+            if users:
+                self.session.execute(
+                    delete(UserModel)
+                    .where(UserModel.id.in_([user.id for user in users]))
+                    .execution_options(synchronize_session=False)
+                )
+                self._apply_count_deltas(count_deltas(users, sign=-1))
+                if archive is not None:
+                    archive(users)
+            self.session.commit()
+        except Exception:
+            self.session.rollback()
+            raise
+
+        if self.existence_filter is not None:
+            for user in users:
+                self.existence_filter.discard(user.username, user.email)
+        return users
+
+    def iter_identities(self, batch_size: int = 10000) -> Iterator[Tuple[str, str]]:
+        """流式读取未删除用户的用户名和邮箱（规范形式，用于构建存在性过滤器）"""
+        result = self.session.execute(
+            identities_statement().execution_options(yield_per=batch_size)
+        )
+        for row in result:
+            yield row.username_canonical, row.email_canonical
+
+    def _might_exist_username(self, username: str) -> bool:
+        """存在性过滤器判定用户名可能存在（未配置过滤器时总是 True）"""
+        if self.existence_filter is None:
+            return True
+        return self.existence_filter.usernames.might_contain(canonical(username))
+
+    def _might_exist_email(self, email: str) -> bool:
+        """存在性过滤器判定邮箱可能存在（未配置过滤器时总是 True）"""
+        if self.existence_filter is None:
+            return True
+        return self.existence_filter.emails.might_contain(canonical(email))
+
+    def _create_chunk(self, users: Sequence[User], offset: int) -> BulkCreateResult:
+        """在一个事务中插入一个分块"""
+        try:
+            statement = bulk_insert_statement(self.session.get_bind().dialect.name)
+            values = [self._to_values(user) for user in users]
+            if statement is not None:
+                inserted_ids = set(self.session.scalars(statement, values))
+            else:
+                inserted_ids = {
+                    user_model.id for user_model in map(self._insert_or_none, values)
+                    if user_model is not None
+                }
+
+            rejected = [
+                (offset + i, user) for i, user in enumerate(users) if user.id not in inserted_ids
+            ]
+            conflicts = {}
+            if rejected:
+                taken_usernames = set(self.session.scalars(
+                    bulk_conflicting_usernames_statement([user for _, user in rejected])
+                ))
+                conflicts = bulk_conflict_errors(rejected, taken_usernames)
+
+            created = [user for user in users if user.id in inserted_ids]
+            self._apply_count_deltas(count_deltas(created))
+            self.session.commit()
+        except Exception:
+            self.session.rollback()
+            raise
+
+        if self.existence_filter is not None:
+            for user in created:
+                self.existence_filter.add(user.username, user.email)
+        return BulkCreateResult(created=created, conflicts=conflicts)
+
+    def _apply_count_deltas(self, deltas: Dict[Tuple[bool, bool], int]) -> None:
+        """在当前事务中更新计数器"""
+        for statement in count_delta_statements(deltas):
+            self.session.execute(statement)
+
+    def _update_columns(self, user: User, changed: Set[str]) -> Optional[UserModel]:
+        """写入修改的列并取回整行（方言不支持 UPDATE ... RETURNING 时再查询一次）"""
+        statement = changed_columns_statement(user, changed)
+        if self.session.get_bind().dialect.update_returning:
+            return self.session.scalars(statement.returning(UserModel)).first()
+
+        if self.session.execute(statement).rowcount == 0:
+            return None
+        return self.session.get(UserModel, user.id, populate_existing=True)
+
+    def _update_row(self, user: User) -> Optional[User]:
+        """加锁读取后整行写入（读写分离时在主库上执行）"""
+        user_model = self.session.query(UserModel).filter(
+            UserModel.id == user.id
+        ).with_for_update().first()
+
+        if user_model is None:
+            return None
+
+        status_before = (user_model.is_active, user_model.is_deleted)
+        for name, value in self._to_values(user).items():
+            if name not in ("id", "created_at"):
+                setattr(user_model, name, value)
+
+        self._apply_count_deltas(
+            status_change_deltas(status_before, (user.is_active, user.is_deleted))
+        )
+        self.session.commit()
+        self.session.refresh(user_model)
+
+        if self.existence_filter is not None:
+            # 用户名/邮箱可能被修改，新值必须可查到
+            self.existence_filter.add(user_model.username, user_model.email)
+        return self._to_domain(user_model)
+
+    def _insert_or_none(self, values: Dict[str, Any]) -> Optional[UserModel]:
+        """不支持 ON CONFLICT 的方言: 在 savepoint 中插入，违反唯一约束时返回 None"""
+        user_model = UserModel(**values)
+        try:
+            with self.session.begin_nested():
+                self.session.add(user_model)
+        except IntegrityError:
+            return None
+        return user_model
+
+    def _conflict_error(self, username: str, email: str) -> ConflictError:
+        """查询冲突的唯一字段，用户名冲突优先于邮箱冲突"""
+        taken_usernames = self.session.scalars(
+            conflicting_usernames_statement(username, email)
+        ).all()
+        return conflict_error(username, email, taken_usernames)
+
+    @staticmethod
+    def _filter_status(query, is_active: Optional[bool], is_deleted: Optional[bool]):
+        """按账户状态过滤（None 表示不过滤）"""
+        if is_active is not None:
+            query = query.filter(UserModel.is_active == is_active)
+        if is_deleted is not None:
+            query = query.filter(UserModel.is_deleted == is_deleted)
+        return query
+
+    @staticmethod
+    def _to_values(user: User) -> Dict[str, Any]:
+        """将领域模型转换为插入用的列值"""
+        return {
+            "id": user.id,
+            "username": user.username,
+            "email": user.email,
+            "password_hash": user.password_hash,
+            "first_name": user.first_name,
+            "last_name": user.last_name,
+            "phone_number": user.phone_number,
+            "email_verified": user.email_verified,
+            "email_verification_token_hash": user.email_verification_token_hash,
+            "email_verification_expires": user.email_verification_expires,
+            "created_at": user.created_at,
+            "updated_at": user.updated_at,
+            "last_login": user.last_login,
+            "is_active": user.is_active,
+            "is_deleted": user.is_deleted,
+        }
+
     @staticmethod
     def _to_domain(user_model: UserModel) -> User:
-        """将 SQL 模型转换为领域模型"""
+        """将 SQL 模型转换为领域模型（开始记录修改的字段）"""
         if not user_model:
             return None
 
-        return User(
+        user = User(
             id=user_model.id,
             email=user_model.email,
             password_hash=user_model.password_hash,
             username=user_model.username,
+            first_name=user_model.first_name,
+            last_name=user_model.last_name,
+            phone_number=user_model.phone_number,
+            email_verified=user_model.email_verified,
+            email_verification_token_hash=user_model.email_verification_token_hash,
+            email_verification_expires=user_model.email_verification_expires,
+            created_at=user_model.created_at,
+            updated_at=user_model.updated_at,
+            last_login=user_model.last_login,
             is_active=user_model.is_active,
-            created_at=user_model.created_at
+            is_deleted=user_model.is_deleted
         )
+        user.mark_persisted()
+        return user
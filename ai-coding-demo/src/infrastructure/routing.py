@@ -0,0 +1,226 @@
+"""数据库读写分离
+
+基于规范: SPEC-USER-001, 4.1 性能要求
+
+只读查询（普通 SELECT）路由到只读副本，写入和写入之后的读取路由到主库，
+为注册写路径让出主库容量。
+
+- 会话一旦写入（INSERT / UPDATE / DELETE / flush），之后的读取都走主库
+- SELECT ... FOR UPDATE 这类加锁读取走主库
+- 请求内写入后，同一请求的其他会话也走主库；跨请求的写后读一致性由调用方
+  在粘滞窗口内以 read_your_writes(sticky=True) 处理请求（见 api.main 的中间件）
+- 副本延迟定期探测，超过阈值或无法连接的副本不参与路由；
+  没有可用副本时读取退回主库
+"""
+import itertools
+import logging
+import math
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Any, Callable, Iterator, List, Optional, Sequence
+
+from prometheus_client import Counter, Gauge
+from sqlalchemy import Select, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from src.infrastructure.metrics import register_metric
+
+
+logger = logging.getLogger(__name__)
+
+
+DATABASE_ROUTED_STATEMENTS = register_metric(
+    Counter,
+    "database_routed_statements_total",
+    "按目标统计的路由语句数",
+    ["target"]
+)
+DATABASE_REPLICA_LAG_SECONDS = register_metric(
+    Gauge,
+    "database_replica_lag_seconds",
+    "最近一次探测到的副本复制延迟（无法连接时为 +Inf）",
+    ["replica"]
+)
+
+# 副本已回放全部接收到的 WAL 时延迟为 0，否则为距最后一次回放事务的时间；
+# 在主库上执行时两个函数都返回 NULL
+POSTGRESQL_REPLICA_LAG_SQL = """
+SELECT CASE
+    WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+    ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp())
+END
+"""
+
+
+def replica_lag_seconds(engine: Engine) -> float:
+    """
+    探测副本复制延迟
+
+    非 PostgreSQL 数据库没有流复制，按 0 处理
+    """
+    if engine.dialect.name != "postgresql":
+        return 0.0
+    with engine.connect() as connection:
+        lag = connection.scalar(text(POSTGRESQL_REPLICA_LAG_SQL))
+    return float(lag or 0)
+
+
+class ReplicaPool:
+    """
+    只读副本池
+
+    按下标管理副本的延迟状态，同一组副本的同步/异步引擎共用一个池
+    """
+
+    def __init__(
+        self,
+        engines: Sequence[Engine],
+        max_lag_seconds: float = 5.0,
+        lag_probe: Callable[[Engine], float] = replica_lag_seconds
+    ):
+        """
+        初始化副本池
+
+        Args:
+            engines: 副本的同步引擎（用于探测延迟）
+            max_lag_seconds: 允许的最大复制延迟，超过时不再路由到该副本
+            lag_probe: 延迟探测函数
+        """
+        self.engines = list(engines)
+        self.max_lag_seconds = max_lag_seconds
+        self.lag_probe = lag_probe
+        # None 表示尚未探测: 探测前不路由到副本
+        self._lags: List[Optional[float]] = [None] * len(self.engines)
+        self._round_robin = itertools.count()
+
+    def __len__(self) -> int:
+        return len(self.engines)
+
+    @property
+    def lags(self) -> List[Optional[float]]:
+        """最近一次探测到的各副本延迟"""
+        return list(self._lags)
+
+    def check(self) -> None:
+        """探测全部副本的延迟（由后台周期任务调用）"""
+        for index, engine in enumerate(self.engines):
+            try:
+                lag = self.lag_probe(engine)
+            except Exception as e:
+                logger.warning(f"副本延迟探测失败: replica={index}, error={str(e)}")
+                lag = math.inf
+            self._lags[index] = lag
+            DATABASE_REPLICA_LAG_SECONDS.labels(replica=str(index)).set(lag)
+
+    def choose(self) -> Optional[int]:
+        """
+        轮询选择一个延迟在阈值内的副本
+
+        Returns:
+            副本下标；没有可用副本时返回 None
+        """
+        available = [
+            index for index, lag in enumerate(self._lags)
+            if lag is not None and lag <= self.max_lag_seconds
+        ]
+        if not available:
+            return None
+        return available[next(self._round_robin) % len(available)]
+
+
+@dataclass
+class ReadYourWrites:
+    """一次请求的读写路由状态"""
+
+    sticky: bool = False  # 请求开始时仍处于上次写入后的粘滞窗口内
+    wrote: bool = False  # 本次请求已写入主库
+
+
+_read_your_writes: ContextVar[Optional[ReadYourWrites]] = ContextVar(
+    "read_your_writes", default=None
+)
+
+
+@contextmanager
+def read_your_writes(sticky: bool = False) -> Iterator[ReadYourWrites]:
+    """
+    在上下文内跟踪写入，使同一请求中写入后的读取走主库
+
+    Args:
+        sticky: 整个上下文的读取都走主库
+    """
+    state = ReadYourWrites(sticky=sticky)
+    token = _read_your_writes.set(state)
+    try:
+        yield state
+    finally:
+        _read_your_writes.reset(token)
+
+
+class RoutingSession(Session):
+    """按语句类型在主库和只读副本之间路由的会话"""
+
+    def __init__(
+        self,
+        primary: Engine,
+        replicas: Sequence[Engine] = (),
+        replica_pool: Optional[ReplicaPool] = None,
+        **kwargs: Any
+    ):
+        """
+        初始化会话
+
+        Args:
+            primary: 主库引擎
+            replicas: 副本引擎，与 replica_pool 中的副本一一对应
+                （异步会话传入异步引擎的 sync_engine）
+            replica_pool: 副本池；为 None 时全部走主库
+        """
+        super().__init__(**kwargs)
+        self.primary = primary
+        self.replicas = list(replicas)
+        self.replica_pool = replica_pool
+        self._wrote = False
+
+    def get_bind(self, mapper=None, *, clause=None, **kwargs):
+        """选择执行语句的引擎（未指定语句时返回主库，如读取方言）"""
+        if clause is None and not self._flushing:
+            return self.primary
+
+        if self._is_write(clause):
+            self._wrote = True
+            state = _read_your_writes.get()
+            if state is not None:
+                state.wrote = True
+            return self._routed(self.primary, "primary")
+
+        if not self._is_replica_read(clause):
+            return self._routed(self.primary, "primary")
+
+        index = self.replica_pool.choose()
+        if index is None:
+            return self._routed(self.primary, "primary_fallback")
+        return self._routed(self.replicas[index], "replica")
+
+    def _is_write(self, clause) -> bool:
+        """是否为写入语句"""
+        return self._flushing or getattr(clause, "is_dml", False)
+
+    def _is_replica_read(self, clause) -> bool:
+        """是否可以在副本上执行"""
+        if self.replica_pool is None or not self.replica_pool.engines:
+            return False
+        if not isinstance(clause, Select) or clause._for_update_arg is not None:
+            return False
+        if self._wrote:
+            return False
+        state = _read_your_writes.get()
+        return state is None or not (state.sticky or state.wrote)
+
+    @staticmethod
+    def _routed(engine: Engine, target: str) -> Engine:
+        """记录路由目标"""
+        DATABASE_ROUTED_STATEMENTS.labels(target=target).inc()
+        return engine
@@ -0,0 +1,184 @@
+"""
+Bloom 过滤器
+
+固定内存的近似集合: 判定"不存在"一定准确，判定"存在"有可控的误判率。
+位数组可保存为文件，并通过 mmap 只读打开，
+查询只触及少数页面，启动时间和常驻内存与数据量无关。
+
+文件格式: 头部（magic, 版本, 位数, 哈希函数个数, 元素个数）+ 位数组
+"""
+
+import hashlib
+import math
+import mmap
+import os
+import struct
+from typing import Iterable, Iterator, Optional, Union
+
+
+class BloomFilter:
+    """
+    Bloom 过滤器
+
+    使用 blake2b 双重哈希: index_i = (h1 + i * h2) mod num_bits
+    """
+
+    MAGIC = b"BLMF"
+    VERSION = 1
+    HEADER = struct.Struct("<4sBQIQ")
+
+    def __init__(
+        self,
+        num_bits: int,
+        num_hashes: int,
+        count: int = 0,
+        buffer: Optional[Union[bytearray, mmap.mmap]] = None,
+        offset: int = 0
+    ):
+        """
+        初始化过滤器
+
+        Args:
+            num_bits: 位数组长度
+            num_hashes: 哈希函数个数
+            count: 已插入元素个数
+            buffer: 位数组存储（默认新建 bytearray；mmap 表示只读文件映射）
+            offset: 位数组在 buffer 中的起始偏移
+        """
+        if num_bits < 1 or num_hashes < 1:
+            raise ValueError("num_bits 和 num_hashes 必须大于 0")
+
+        self.num_bits = num_bits
+        self.num_hashes = num_hashes
+        self.count = count
+        self._offset = offset
+        self._buffer = buffer if buffer is not None else bytearray((num_bits + 7) // 8)
+        self._mmap = buffer if isinstance(buffer, mmap.mmap) else None
+
+    # ====== 构造 ======
+
+    @staticmethod
+    def optimal_parameters(capacity: int, false_positive_rate: float) -> tuple:
+        """
+        按预期容量和误判率计算位数组长度和哈希函数个数
+
+        m = -n ln(p) / (ln 2)^2，k = m / n * ln 2
+        """
+        if capacity < 1:
+            capacity = 1
+        if not 0 < false_positive_rate < 1:
+            raise ValueError("false_positive_rate 必须在 (0, 1) 区间内")
+
+        num_bits = math.ceil(-capacity * math.log(false_positive_rate) / (math.log(2) ** 2))
+        num_hashes = max(1, round(num_bits / capacity * math.log(2)))
+        return num_bits, num_hashes
+
+    @classmethod
+    def with_capacity(cls, capacity: int, false_positive_rate: float = 0.001) -> "BloomFilter":
+        """按预期容量和误判率创建空过滤器"""
+        num_bits, num_hashes = cls.optimal_parameters(capacity, false_positive_rate)
+        return cls(num_bits, num_hashes)
+
+    @classmethod
+    def open(cls, path: str) -> "BloomFilter":
+        """
+        以只读 mmap 方式打开过滤器文件
+
+        Raises:
+            ValueError: 文件格式无效
+        """
+        with open(path, "rb") as f:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if len(mapped) < cls.HEADER.size:
+            mapped.close()
+            raise ValueError(f"Bloom 过滤器文件无效: {path}")
+
+        magic, version, num_bits, num_hashes, count = cls.HEADER.unpack_from(mapped, 0)
+        expected_size = cls.HEADER.size + (num_bits + 7) // 8
+        if magic != cls.MAGIC or version != cls.VERSION or len(mapped) != expected_size:
+            mapped.close()
+            raise ValueError(f"Bloom 过滤器文件无效: {path}")
+
+        return cls(num_bits, num_hashes, count=count, buffer=mapped, offset=cls.HEADER.size)
+
+    def save(self, path: str) -> None:
+        """保存到文件（先写临时文件再原子替换）"""
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(self.HEADER.pack(
+                self.MAGIC, self.VERSION, self.num_bits, self.num_hashes, self.count
+            ))
+            f.write(self._buffer[self._offset:self._offset + self.byte_size])
+        os.replace(tmp_path, path)
+
+    def close(self) -> None:
+        """释放文件映射"""
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+
+    def __enter__(self) -> "BloomFilter":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    # ====== 读写 ======
+
+    @property
+    def read_only(self) -> bool:
+        """是否为只读文件映射"""
+        return self._mmap is not None
+
+    @property
+    def byte_size(self) -> int:
+        """位数组字节数"""
+        return (self.num_bits + 7) // 8
+
+    def _indexes(self, item: Union[str, bytes]) -> Iterator[int]:
+        """计算元素对应的位下标"""
+        if isinstance(item, str):
+            item = item.encode("utf-8")
+        digest = hashlib.blake2b(item, digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        for i in range(self.num_hashes):
+            yield (h1 + i * h2) % self.num_bits
+
+    def add(self, item: Union[str, bytes]) -> None:
+        """添加元素"""
+        if self.read_only:
+            raise ValueError("只读 Bloom 过滤器不能添加元素")
+
+        buffer, offset = self._buffer, self._offset
+        for index in self._indexes(item):
+            buffer[offset + (index >> 3)] |= 1 << (index & 7)
+        self.count += 1
+
+    def update(self, items: Iterable[Union[str, bytes]]) -> None:
+        """批量添加元素"""
+        for item in items:
+            self.add(item)
+
+    def __contains__(self, item: Union[str, bytes]) -> bool:
+        buffer, offset = self._buffer, self._offset
+        return all(
+            buffer[offset + (index >> 3)] & (1 << (index & 7))
+            for index in self._indexes(item)
+        )
+
+    def __len__(self) -> int:
+        return self.count
+
+    # ====== 统计 ======
+
+    @property
+    def memory_bytes(self) -> int:
+        """位数组占用字节数"""
+        return self.byte_size
+
+    @property
+    def false_positive_rate(self) -> float:
+        """按当前元素个数估算的误判率: (1 - e^(-kn/m))^k"""
+        return (1 - math.exp(-self.num_hashes * self.count / self.num_bits)) ** self.num_hashes
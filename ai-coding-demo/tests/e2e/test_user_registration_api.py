@@ -3,21 +3,42 @@
 测试完整的用户注册流程
 """
 import pytest
+from contextlib import AsyncExitStack
+from unittest.mock import Mock
 from httpx import AsyncClient, ASGITransport
+from sqlalchemy import event
 from fastapi import FastAPI
 
 import sys
 import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 
-from api.main import app
+import api.dependencies
+import api.main
+from api.main import app, get_user_service, hashing_admission, password_hasher
+from domain.services.user_service import UserService
+from infrastructure.database import get_db
+from infrastructure.existence_filter import UserExistenceFilter
+
+
+@pytest.fixture
+def registration_backend(test_db, monkeypatch):
+    """请求使用测试数据库会话，邮件服务和速率限制器替换为模拟对象"""
+    rate_limiter = Mock()
+    rate_limiter.check_limit.return_value = True
+    monkeypatch.setattr(api.main, "rate_limiter", rate_limiter)
+    monkeypatch.setattr(api.main, "email_service", Mock())
+    app.dependency_overrides[get_db] = lambda: test_db
+    yield test_db
+    app.dependency_overrides.pop(get_db, None)
 
 
 @pytest.mark.e2e
 class TestUserRegistrationE2E:
     """用户注册端到端测试"""
 
-    async def test_register_user_success(self):
+    @pytest.mark.asyncio
+    async def test_register_user_success(self, registration_backend):
         """测试成功注册用户"""
         transport = ASGITransport(app=app)
         async with AsyncClient(transport=transport, base_url="http://test") as client:
@@ -37,6 +58,7 @@ class TestUserRegistrationE2E:
             assert data["is_active"] is True
             assert "id" in data
 
+    @pytest.mark.asyncio
     async def test_register_user_invalid_email(self):
         """测试注册时使用无效邮箱"""
         transport = ASGITransport(app=app)
@@ -51,6 +73,7 @@ class TestUserRegistrationE2E:
 
             assert response.status_code == 422  # Pydantic validation error
 
+    @pytest.mark.asyncio
     async def test_register_user_weak_password(self):
         """测试注册时使用弱密码"""
         transport = ASGITransport(app=app)
@@ -65,6 +88,7 @@ class TestUserRegistrationE2E:
 
             assert response.status_code == 422  # Pydantic validation error
 
+    @pytest.mark.asyncio
     async def test_health_check(self):
         """测试健康检查端点"""
         transport = ASGITransport(app=app)
@@ -74,3 +98,95 @@ class TestUserRegistrationE2E:
             assert response.status_code == 200
             data = response.json()
             assert data["status"] == "healthy"
+
+    @pytest.mark.asyncio
+    async def test_batch_register_skips_lookups_for_absent_names(
+        self, registration_backend, monkeypatch
+    ):
+        """存在性过滤器判定不存在的用户名/邮箱不查询 users 表，新用户加入过滤器"""
+        existence_filter = UserExistenceFilter(capacity=100)
+        existence_filter.rebuild([])
+        monkeypatch.setattr(api.dependencies, "user_existence_filter", existence_filter)
+        statements = []
+
+        def record(conn, cursor, statement, *args):
+            statements.append(statement)
+
+        engine = registration_backend.get_bind()
+        event.listen(engine, "before_cursor_execute", record)
+        try:
+            transport = ASGITransport(app=app)
+            async with AsyncClient(transport=transport, base_url="http://test") as client:
+                response = await client.post(
+                    "/api/v1/users:batchRegister",
+                    json={"users": [{
+                        "email": "alice@example.com",
+                        "password": "SecurePass123",
+                        "username": "alice"
+                    }]}
+                )
+        finally:
+            event.remove(engine, "before_cursor_execute", record)
+
+        assert response.status_code == 200
+        assert response.json()["created"] == 1
+        assert not [
+            statement for statement in statements
+            if statement.lstrip().upper().startswith("SELECT") and "FROM users" in statement
+        ]
+        assert existence_filter.usernames.might_contain("alice")
+
+
+@pytest.mark.e2e
+class TestRegistrationOverloadE2E:
+    """密码哈希准入控制饱和时的注册端点（规范: SPEC-USER-001, 4.1 性能要求）"""
+
+    @pytest.fixture
+    def user_service(self, monkeypatch):
+        """使用应用的哈希进程池、模拟仓储和外部服务的用户服务；等待队列容量为 0"""
+        rate_limiter = Mock()
+        rate_limiter.check_limit.return_value = True
+        service = UserService(Mock(), Mock(), rate_limiter, password_hasher=password_hasher)
+        monkeypatch.setattr(hashing_admission, "max_queue", 0)
+        app.dependency_overrides[get_user_service] = lambda: service
+        yield service
+        app.dependency_overrides.pop(get_user_service, None)
+
+    async def _post_while_saturated(self, url, payload):
+        """占满全部执行许可后发送请求"""
+        async with AsyncExitStack() as stack:
+            for _ in range(hashing_admission.max_in_flight):
+                await stack.enter_async_context(hashing_admission.admit())
+            transport = ASGITransport(app=app)
+            async with AsyncClient(transport=transport, base_url="http://test") as client:
+                return await client.post(url, json=payload)
+
+    @pytest.mark.asyncio
+    async def test_register_returns_503_with_retry_after(self, user_service):
+        """哈希准入被拒绝时返回 503 和 Retry-After，不写入用户"""
+        response = await self._post_while_saturated(
+            "/api/v1/users/register",
+            {"email": "test@example.com", "password": "SecurePass123", "username": "testuser"}
+        )
+
+        assert response.status_code == 503
+        assert response.headers["Retry-After"] == str(hashing_admission.retry_after)
+        assert response.json()["detail"]["error"] == "SERVICE_OVERLOADED"
+        user_service.user_repository.create.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_batch_register_returns_503_with_retry_after(self, user_service):
+        """批量注册整批被拒绝时返回 503 和 Retry-After"""
+        user_service.user_repository.find_existing_usernames.return_value = set()
+        user_service.user_repository.find_existing_emails.return_value = set()
+
+        response = await self._post_while_saturated(
+            "/api/v1/users:batchRegister",
+            {"users": [
+                {"email": "alice@example.com", "password": "SecurePass123", "username": "alice"}
+            ]}
+        )
+
+        assert response.status_code == 503
+        assert response.headers["Retry-After"] == str(hashing_admission.retry_after)
+        user_service.user_repository.create_many.assert_not_called()
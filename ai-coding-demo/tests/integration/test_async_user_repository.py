@@ -0,0 +1,289 @@
+"""集成测试: 异步用户仓储
+
+测试 AsyncSession 仓储实现（aiosqlite）
+"""
+import pytest
+import pytest_asyncio
+from uuid import UUID, uuid4
+
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import StaticPool
+
+from src.domain.exceptions import ConflictError
+from src.domain.services.user_service import UserService
+from src.infrastructure.hashing.hashers import BcryptHasher, create_registry
+from domain.models.user import User
+from domain.repositories.user_repository import CountMode
+from infrastructure.database import Base, to_async_url
+from infrastructure.existence_filter import UserExistenceFilter
+from infrastructure.repositories.async_user_repository_impl import AsyncSQLAlchemyUserRepository
+
+
+TEST_ASYNC_DATABASE_URL = "sqlite+aiosqlite:///:memory:"
+
+
+@pytest_asyncio.fixture
+async def async_session():
+    """创建异步测试数据库会话"""
+    engine = create_async_engine(TEST_ASYNC_DATABASE_URL, poolclass=StaticPool)
+    async with engine.begin() as connection:
+        await connection.run_sync(Base.metadata.create_all)
+
+    session_factory = async_sessionmaker(engine, expire_on_commit=False)
+    async with session_factory() as session:
+        yield session
+
+    await engine.dispose()
+
+
+@pytest.fixture
+def async_user_repository(async_session):
+    """创建异步用户仓储"""
+    return AsyncSQLAlchemyUserRepository(async_session)
+
+
+def _new_user(username: str = "testuser", email: str = "test@example.com") -> User:
+    """构造待创建的领域用户"""
+    return User(
+        id=uuid4(),
+        username=username,
+        email=email,
+        password_hash="hashed_password_123"
+    )
+
+
+@pytest.mark.integration
+class TestAsyncSQLAlchemyUserRepository:
+    """异步用户仓储集成测试"""
+
+    @pytest.mark.asyncio
+    async def test_create_and_find(self, async_user_repository):
+        """创建后可按ID、用户名、邮箱查找"""
+        user = await async_user_repository.create(_new_user())
+
+        assert (await async_user_repository.find_by_id(user.id)).username == "testuser"
+        assert (await async_user_repository.find_by_username("testuser")).id == user.id
+        assert (await async_user_repository.find_by_email("test@example.com")).id == user.id
+        assert await async_user_repository.find_by_username("nobody") is None
+
+    @pytest.mark.asyncio
+    async def test_create_conflicts(self, async_user_repository):
+        """唯一约束冲突映射为领域冲突错误"""
+        await async_user_repository.create(_new_user())
+
+        with pytest.raises(ConflictError) as exc_info:
+            await async_user_repository.create(_new_user(email="other@example.com"))
+        assert exc_info.value.code == "USERNAME_TAKEN"
+
+        with pytest.raises(ConflictError) as exc_info:
+            await async_user_repository.create(_new_user(username="otheruser"))
+        assert exc_info.value.code == "EMAIL_ALREADY_REGISTERED"
+
+    @pytest.mark.asyncio
+    async def test_create_many_reports_conflicts(self, async_user_repository):
+        """批量创建，冲突行按输入下标报告"""
+        await async_user_repository.create(_new_user("taken", "taken@example.com"))
+        users = [
+            _new_user("fresh1", "fresh1@example.com"),
+            _new_user("taken", "other@example.com"),
+            _new_user("fresh2", "fresh2@example.com"),
+        ]
+
+        result = await async_user_repository.create_many(users, chunk_size=2)
+
+        assert [u.username for u in result.created] == ["fresh1", "fresh2"]
+        assert result.conflicts[1].code == "USERNAME_TAKEN"
+        assert await async_user_repository.count() == 3
+
+    @pytest.mark.asyncio
+    async def test_find_page(self, async_user_repository):
+        """游标分页"""
+        users = [_new_user(f"user{i}", f"user{i}@example.com") for i in range(3)]
+        await async_user_repository.create_many(users)
+
+        first = await async_user_repository.find_page(limit=2)
+        second = await async_user_repository.find_page(after=first.next_cursor, limit=2)
+
+        assert len(first.items) == 2
+        assert len(second.items) == 1
+        assert second.next_cursor is None
+
+    @pytest.mark.asyncio
+    async def test_exists_and_batch_exists(self, async_user_repository):
+        """存在性检查"""
+        await async_user_repository.create(_new_user())
+
+        assert await async_user_repository.username_exists("testuser") is True
+        assert await async_user_repository.email_exists("missing@example.com") is False
+        assert await async_user_repository.find_existing_usernames(
+            ["testuser", "testuser1"]
+        ) == {"testuser"}
+
+    @pytest.mark.asyncio
+    async def test_update_delete_and_count(self, async_user_repository):
+        """更新、删除和统计"""
+        user = await async_user_repository.create(_new_user())
+        user.is_active = False
+
+        updated = await async_user_repository.update(user)
+
+        assert updated.is_active is False
+        assert await async_user_repository.count(is_active=False) == 1
+        assert len(await async_user_repository.find_many()) == 1
+        assert await async_user_repository.delete(user.id) is True
+        assert await async_user_repository.count() == 0
+
+    @pytest.mark.asyncio
+    async def test_update_writes_changed_columns(self, async_user_repository):
+        """只写入修改的列，没有修改时直接返回"""
+        user = await async_user_repository.create(_new_user())
+        assert await async_user_repository.update(user) is user
+
+        user.verify_email()
+        updated = await async_user_repository.update(user)
+
+        assert updated.email_verified is True
+        assert (await async_user_repository.find_by_id(user.id)).email_verified is True
+
+    @pytest.mark.asyncio
+    async def test_lookups_use_live_canonical_identity(self, async_user_repository):
+        """查找不区分大小写，软删除用户的用户名/邮箱可重新注册"""
+        user = await async_user_repository.create(_new_user())
+        assert (await async_user_repository.find_by_email("TEST@example.com")).id == user.id
+
+        user.soft_delete()
+        await async_user_repository.update(user)
+
+        assert await async_user_repository.username_exists("testuser") is False
+        again = await async_user_repository.create(_new_user())
+        assert (await async_user_repository.find_by_username("TestUser")).id == again.id
+
+    @pytest.mark.asyncio
+    async def test_find_by_ids(self, async_user_repository):
+        """按请求顺序批量查找，跳过不存在的ID"""
+        first = await async_user_repository.create(_new_user("first", "first@example.com"))
+        second = await async_user_repository.create(_new_user("second", "second@example.com"))
+
+        users = await async_user_repository.find_by_ids([second.id, uuid4(), first.id])
+
+        assert [user.id for user in users] == [second.id, first.id]
+        assert await async_user_repository.find_by_ids([]) == []
+
+    @pytest.mark.asyncio
+    async def test_find_version(self, async_user_repository):
+        """只查询版本列，不存在的用户返回 None"""
+        user = await async_user_repository.create(_new_user())
+
+        version = await async_user_repository.find_version(user.id)
+
+        assert version == (await async_user_repository.find_by_id(user.id)).updated_at
+        assert await async_user_repository.find_version(uuid4()) is None
+
+    @pytest.mark.asyncio
+    async def test_iter_users(self, async_user_repository):
+        """流式读取未删除用户"""
+        await async_user_repository.create(_new_user("first", "first@example.com"))
+        await async_user_repository.create(_new_user("second", "second@example.com"))
+
+        usernames = [user.username async for user in async_user_repository.iter_users(1)]
+
+        assert sorted(usernames) == ["first", "second"]
+
+    @pytest.mark.asyncio
+    async def test_maintained_count(self, async_user_repository):
+        """计数器随写入更新，与精确计数一致"""
+        await async_user_repository.reconcile_counts()
+        user = await async_user_repository.create(_new_user())
+        await async_user_repository.create_many([_new_user("other", "other@example.com")])
+        user.is_active = False
+        await async_user_repository.update(user)
+
+        assert await async_user_repository.count(mode=CountMode.MAINTAINED) == 2
+        assert await async_user_repository.count(
+            is_active=False, mode=CountMode.MAINTAINED
+        ) == 1
+        assert await async_user_repository.count(mode=CountMode.ESTIMATED) == 2
+
+    @pytest.mark.asyncio
+    async def test_iter_identities_builds_existence_filter(self, async_session):
+        """流式读取用户名和邮箱构建存在性过滤器"""
+        existence_filter = UserExistenceFilter(capacity=100)
+        repository = AsyncSQLAlchemyUserRepository(async_session, existence_filter)
+        await repository.create(_new_user())
+
+        existence_filter.rebuild([row async for row in repository.iter_identities()])
+
+        assert existence_filter.usernames.might_contain("testuser")
+
+
+@pytest.mark.integration
+class TestUserServiceWithAsyncRepository:
+    """用户服务的异步方法使用异步仓储（DATABASE_ASYNC）"""
+
+    @pytest.fixture
+    def user_service(self, async_user_repository, mocker):
+        """不限流、使用低 cost 哈希的用户服务"""
+        rate_limiter = mocker.Mock()
+        rate_limiter.check_limit.return_value = True
+        service = UserService(async_user_repository, mocker.Mock(), rate_limiter)
+        service.password_hashers = create_registry(BcryptHasher(rounds=4))
+        return service
+
+    @pytest.mark.asyncio
+    async def test_register_and_conflict_suggestions(self, user_service, async_user_repository):
+        """注册通过异步仓储写入；用户名冲突时返回建议"""
+        result = await user_service.register_user_async(
+            username="john_doe", email="john@example.com", password="SecurePass123"
+        )
+
+        assert (await async_user_repository.find_by_id(UUID(result.user_id))) is not None
+        with pytest.raises(ConflictError) as exc_info:
+            await user_service.register_user_async(
+                username="john_doe", email="other@example.com", password="SecurePass123"
+            )
+        assert exc_info.value.code == "USERNAME_TAKEN"
+        assert exc_info.value.suggestions
+
+    @pytest.mark.asyncio
+    async def test_register_many(self, user_service, async_user_repository):
+        """批量注册的冲突预检和插入通过异步仓储执行"""
+        await async_user_repository.create(_new_user("taken", "taken@example.com"))
+
+        items = await user_service.register_many_async([
+            {"username": "alice", "email": "alice@example.com", "password": "SecurePass123"},
+            {"username": "taken", "email": "bob@example.com", "password": "SecurePass123"},
+        ])
+
+        assert items[0].succeeded
+        assert [error.code for error in items[1].errors] == ["USERNAME_TAKEN"]
+        assert await async_user_repository.count() == 2
+
+    @pytest.mark.asyncio
+    async def test_authenticate(self, user_service, async_user_repository):
+        """登录通过异步仓储查询用户并保存登录时间"""
+        user = _new_user()
+        user.password_hash = user_service.password_hashers.hash("SecurePass123")
+        user.email_verified = True
+        await async_user_repository.create(user)
+
+        authenticated = await user_service.authenticate_user_async(
+            "test@example.com", "SecurePass123"
+        )
+
+        assert authenticated.id == user.id
+        assert (await async_user_repository.find_by_id(user.id)).last_login is not None
+
+
+@pytest.mark.integration
+class TestAsyncDatabaseUrl:
+    """异步驱动 URL 转换测试"""
+
+    def test_postgresql_uses_asyncpg(self):
+        """PostgreSQL 使用 asyncpg"""
+        assert to_async_url("postgresql://user:pw@localhost:5432/userdb") == (
+            "postgresql+asyncpg://user:pw@localhost:5432/userdb"
+        )
+
+    def test_sqlite_uses_aiosqlite(self):
+        """SQLite 使用 aiosqlite"""
+        assert to_async_url("sqlite:///./test.db") == "sqlite+aiosqlite:///./test.db"
@@ -0,0 +1,293 @@
+"""集成测试: 带缓存的用户仓储
+
+共享层使用 InMemorySharedCache 代替 Redis
+"""
+import threading
+from dataclasses import replace
+from datetime import datetime, timedelta
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from domain.models.user import User, hash_verification_token
+from infrastructure.cache import InMemorySharedCache
+from infrastructure.database import Base
+from infrastructure.repositories.cached_user_repository import (
+    CachedUserRepository,
+    UserCache,
+    decode_user,
+    encode_user
+)
+from infrastructure.repositories.user_repository_impl import SQLAlchemyUserRepository
+from infrastructure.routing import ReplicaPool, RoutingSession
+
+
+def _new_user(username: str = "testuser", email: str = "test@example.com") -> User:
+    """构造待创建的领域用户"""
+    return User(
+        id=uuid4(),
+        username=username,
+        email=email,
+        password_hash="hashed_password_123"
+    )
+
+
+@pytest.fixture
+def shared():
+    """共享缓存层"""
+    return InMemorySharedCache()
+
+
+@pytest.fixture
+def cached_repository(test_user_repository, shared):
+    """带缓存的仓储"""
+    return CachedUserRepository(test_user_repository, UserCache(shared=shared))
+
+
+@pytest.fixture
+def queries(test_engine):
+    """记录执行的 SELECT 语句"""
+    statements = []
+
+    def before_execute(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            statements.append(statement)
+
+    event.listen(test_engine, "before_cursor_execute", before_execute)
+    yield statements
+    event.remove(test_engine, "before_cursor_execute", before_execute)
+
+
+@pytest.mark.integration
+class TestCachedUserRepository:
+    """带缓存的用户仓储集成测试"""
+
+    def test_lookups_share_one_entity(self, cached_repository, queries):
+        """按 id 加载一次后，按用户名和邮箱查找也命中缓存"""
+        user = cached_repository.create(_new_user())
+        queries.clear()
+
+        assert cached_repository.find_by_id(user.id).username == "testuser"
+        assert cached_repository.find_by_username("testuser").id == user.id
+        assert cached_repository.find_by_email("test@example.com").id == user.id
+        assert cached_repository.find_by_email("Test@Example.com").id == user.id
+        assert cached_repository.find_by_id(str(user.id)).id == user.id
+        assert len(queries) == 1
+
+    def test_returns_copies(self, cached_repository):
+        """调用方修改返回的实体不影响缓存"""
+        user = cached_repository.create(_new_user())
+
+        cached_repository.find_by_id(user.id).is_active = False
+
+        assert cached_repository.find_by_id(user.id).is_active is True
+
+    def test_not_found_is_not_cached(self, cached_repository):
+        """不缓存"不存在"，注册后立即可查到"""
+        assert cached_repository.find_by_username("testuser") is None
+
+        cached_repository.create(_new_user())
+
+        assert cached_repository.find_by_username("testuser") is not None
+
+    def test_update_invalidates(self, cached_repository):
+        """更新后删除实体和旧索引"""
+        user = cached_repository.create(_new_user())
+        cached_repository.find_by_email("test@example.com")
+
+        user.email = "new@example.com"
+        cached_repository.update(user)
+
+        assert cached_repository.find_by_email("test@example.com") is None
+        assert cached_repository.find_by_id(user.id).email == "new@example.com"
+
+    def test_delete_invalidates(self, cached_repository):
+        """删除后不再返回缓存的实体"""
+        user = cached_repository.create(_new_user())
+        cached_repository.find_by_username("testuser")
+
+        assert cached_repository.delete(user.id) is True
+
+        assert cached_repository.find_by_username("testuser") is None
+
+    def test_shared_tier_serves_other_processes(self, test_user_repository, shared, queries):
+        """其他进程（新的进程内层）从共享层读取"""
+        user = test_user_repository.create(_new_user())
+        CachedUserRepository(test_user_repository, UserCache(shared=shared)).find_by_id(user.id)
+        queries.clear()
+
+        other = CachedUserRepository(test_user_repository, UserCache(shared=shared))
+
+        assert other.find_by_username("testuser").id == user.id
+        assert queries == []
+
+    def test_find_by_ids_loads_misses_in_one_query(self, cached_repository, queries):
+        """已缓存的ID不查询，其余ID一次查询后写入缓存"""
+        cached = cached_repository.create(_new_user("cached", "cached@example.com"))
+        first = cached_repository.create(_new_user("first", "first@example.com"))
+        second = cached_repository.create(_new_user("second", "second@example.com"))
+        cached_repository.find_by_id(cached.id)
+        queries.clear()
+
+        users = cached_repository.find_by_ids([second.id, uuid4(), cached.id, first.id, second.id])
+
+        assert [user.id for user in users] == [second.id, cached.id, first.id]
+        assert len(queries) == 1
+        assert cached_repository.find_by_username("first").id == first.id
+        assert len(queries) == 1
+
+    def test_find_by_ids_reads_shared_tier(self, test_user_repository, shared, queries):
+        """其他进程批量查找时从共享层读取"""
+        users = [
+            test_user_repository.create(_new_user(f"user{i}", f"user{i}@example.com"))
+            for i in range(3)
+        ]
+        first = CachedUserRepository(test_user_repository, UserCache(shared=shared))
+        first.find_by_ids([user.id for user in users])
+        queries.clear()
+
+        other = CachedUserRepository(test_user_repository, UserCache(shared=shared))
+        found = other.find_by_ids([users[2].id, users[0].id])
+
+        assert [user.username for user in found] == ["user2", "user0"]
+        assert queries == []
+
+    def test_find_version_without_loading_entity(self, test_user_repository, shared, queries):
+        """版本未缓存时只查询版本列，之后本进程和其他进程都不查询；更新后失效"""
+        user = test_user_repository.create(_new_user())
+        cached_repository = CachedUserRepository(test_user_repository, UserCache(shared=shared))
+        queries.clear()
+
+        version = cached_repository.find_version(user.id)
+
+        assert len(queries) == 1 and "password_hash" not in queries[0]
+        assert version == test_user_repository.find_version(user.id)
+        queries.clear()
+        other = CachedUserRepository(test_user_repository, UserCache(shared=shared))
+        assert cached_repository.find_version(user.id) == version
+        assert other.find_version(user.id) == version
+        assert queries == []
+
+        user.first_name = "Alice"
+        cached_repository.update(user)
+        assert cached_repository.find_version(user.id) > version
+
+    def test_find_version_from_cached_entity(self, cached_repository, queries):
+        """实体已缓存时取其 updated_at；已删除的用户没有版本"""
+        user = cached_repository.create(_new_user())
+        cached = cached_repository.find_by_id(user.id)
+        queries.clear()
+
+        assert cached_repository.find_version(user.id) == cached.updated_at
+        assert queries == []
+
+        cached.is_deleted = True
+        cached_repository.update(cached)
+        assert cached_repository.find_version(user.id) is None
+
+    def test_load_after_invalidation_ignores_lagging_replica(self, tmp_path, shared):
+        """更新失效后，副本仍是修改前的行: 未命中从主库加载，共享层不写入旧值"""
+        engines = [create_engine(f"sqlite:///{tmp_path / name}") for name in ("p.db", "r.db")]
+        for engine in engines:
+            Base.metadata.create_all(bind=engine)
+        pool = ReplicaPool([engines[1]], max_lag_seconds=5)
+        pool.check()
+        session_factory = sessionmaker(
+            class_=RoutingSession, primary=engines[0], replicas=[engines[1]], replica_pool=pool
+        )
+        user = _new_user()
+        for engine in engines:
+            with sessionmaker(bind=engine)() as session:
+                SQLAlchemyUserRepository(session).create(replace(user))
+
+        cache = UserCache(shared=shared)
+        with session_factory() as session:
+            assert CachedUserRepository(
+                SQLAlchemyUserRepository(session), cache
+            ).find_by_id(user.id).first_name is None
+        with session_factory() as session:
+            repository = CachedUserRepository(SQLAlchemyUserRepository(session), cache)
+            updated = repository.find_by_id(user.id)
+            updated.first_name = "Alice"
+            repository.update(updated)
+
+        with session_factory() as session:
+            repository = CachedUserRepository(SQLAlchemyUserRepository(session), cache)
+            assert repository.find_by_username("testuser").first_name == "Alice"
+        with session_factory() as session:
+            other = CachedUserRepository(
+                SQLAlchemyUserRepository(session), UserCache(shared=shared)
+            )
+            assert other.find_by_id(user.id).first_name == "Alice"
+        for engine in engines:
+            engine.dispose()
+
+    def test_shared_tier_failure_falls_back_to_database(self, test_user_repository):
+        """共享层故障时按未命中处理"""
+        class BrokenShared:
+            def get(self, name):
+                raise ConnectionError("Redis 不可达")
+
+            def set(self, name, value, ex=None):
+                raise ConnectionError("Redis 不可达")
+
+            def delete(self, *names):
+                raise ConnectionError("Redis 不可达")
+
+        repository = CachedUserRepository(test_user_repository, UserCache(shared=BrokenShared()))
+        user = repository.create(_new_user())
+
+        assert repository.find_by_id(user.id).id == user.id
+        assert repository.delete(user.id) is True
+
+    def test_stale_index_is_ignored(self):
+        """用户名修改后残留的旧索引按未命中处理"""
+        cache = UserCache()
+        user = _new_user()
+        cache.get_or_load("id", user.id, lambda: user)
+        renamed = _new_user(username="renamed")
+        renamed.id = user.id
+        cache.local.set(("id", user.id), renamed)
+
+        assert cache.get_or_load("username", "testuser", lambda: None) is None
+
+    def test_concurrent_misses_load_once(self):
+        """同一个键的并发未命中只查询一次数据库"""
+        cache = UserCache()
+        user = _new_user()
+        started = threading.Event()
+        release = threading.Event()
+        loads = []
+        results = []
+
+        def load():
+            loads.append(1)
+            started.set()
+            release.wait(timeout=5)
+            return user
+
+        def lookup():
+            results.append(cache.get_or_load("username", "testuser", load))
+
+        threads = [threading.Thread(target=lookup)]
+        threads[0].start()
+        assert started.wait(timeout=5)
+        threads += [threading.Thread(target=lookup) for _ in range(3)]
+        for thread in threads[1:]:
+            thread.start()
+        release.set()
+        for thread in threads:
+            thread.join(timeout=5)
+
+        assert len(loads) == 1
+        assert [result.id for result in results] == [user.id] * 4
+
+    def test_encode_round_trip(self):
+        """共享层序列化保留全部字段"""
+        user = _new_user()
+        user.email_verification_token_hash = hash_verification_token(uuid4())
+        user.email_verification_expires = datetime.utcnow() + timedelta(hours=24)
+
+        assert decode_user(encode_user(user)) == user
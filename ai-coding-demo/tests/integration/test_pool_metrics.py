@@ -0,0 +1,99 @@
+"""集成测试: 数据库连接池监控
+
+用 SQLite 文件库和容量为 1 的连接池模拟连接池耗尽
+"""
+import pytest
+from sqlalchemy import create_engine, exc
+
+from config.settings import settings
+from src.infrastructure.metrics import REGISTRY
+from infrastructure.database import engine_options
+from infrastructure.pool_metrics import (
+    InstrumentedQueuePool,
+    instrument_engine,
+    pool_status,
+    pool_statuses
+)
+
+
+def _sample(name: str, pool: str, **labels) -> float:
+    """读取指标当前值"""
+    return REGISTRY.get_sample_value(name, {"pool": pool, **labels}) or 0.0
+
+
+@pytest.fixture
+def engine(tmp_path, request):
+    """单连接、不允许溢出的连接池"""
+    name = f"test-{request.node.name}"
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'pool.db'}",
+        poolclass=InstrumentedQueuePool,
+        pool_logging_name=name,
+        pool_size=1,
+        max_overflow=0,
+        pool_timeout=0.05
+    )
+    instrument_engine(engine, name)
+    yield engine
+    engine.dispose()
+
+
+@pytest.mark.integration
+class TestPoolMetrics:
+    """连接池指标集成测试"""
+
+    def test_checkout_latency_and_checked_out(self, engine):
+        """获取连接耗时计入直方图，借出连接数实时读取"""
+        name = engine.pool.logging_name
+
+        with engine.connect():
+            assert _sample("db_pool_checked_out", name) == 1
+            assert pool_status(engine)["checked_out"] == 1
+
+        assert _sample("db_pool_checkout_seconds_count", name) == 1
+        assert _sample("db_pool_checked_out", name) == 0
+
+    def test_exhausted_pool_times_out_and_reports_saturation(self, engine):
+        """连接池耗尽: 超时计数，/health 报告饱和"""
+        name = engine.pool.logging_name
+
+        with engine.connect():
+            assert pool_status(engine)["saturated"] is True
+            assert any(p["name"] == name and p["saturated"] for p in pool_statuses())
+            with pytest.raises(exc.TimeoutError):
+                engine.connect()
+
+        assert _sample("db_pool_checkout_timeouts_total", name) == 1
+        assert pool_status(engine)["saturated"] is False
+
+    def test_invalidations_are_counted(self, engine):
+        """连接失效计数"""
+        name = engine.pool.logging_name
+
+        with engine.connect() as connection:
+            connection.invalidate()
+
+        assert _sample("db_pool_invalidations_total", name, soft="false") == 1
+
+    def test_metrics_follow_pool_after_dispose(self, engine):
+        """dispose 换用新连接池后仍记录指标"""
+        name = engine.pool.logging_name
+        engine.dispose()
+
+        with engine.connect():
+            assert _sample("db_pool_checked_out", name) == 1
+        assert _sample("db_pool_checkout_seconds_count", name) == 1
+
+    def test_engine_options_follow_settings(self, monkeypatch, tmp_path):
+        """连接池参数取自 settings，内存 SQLite 不设置连接池大小"""
+        monkeypatch.setattr(settings, "DATABASE_POOL_SIZE", 7)
+        monkeypatch.setattr(settings, "DATABASE_MAX_OVERFLOW", 0)
+        monkeypatch.setattr(settings, "DATABASE_POOL_PRE_PING", False)
+
+        options = engine_options(f"sqlite:///{tmp_path / 'pool.db'}")
+
+        assert options["poolclass"] is InstrumentedQueuePool
+        assert options["pool_size"] == 7
+        assert options["max_overflow"] == 0
+        assert options["pool_pre_ping"] is False
+        assert "pool_size" not in engine_options("sqlite://")
@@ -0,0 +1,189 @@
+"""集成测试: 读写分离
+
+用两个 SQLite 文件模拟主库和只读副本（副本不复制主库数据，
+因此能从查询结果看出语句被路由到了哪个库）
+"""
+import pytest
+import pytest_asyncio
+from uuid import uuid4
+
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from domain.models.user import User
+from infrastructure.database import Base, to_async_url
+from infrastructure.repositories.async_user_repository_impl import AsyncSQLAlchemyUserRepository
+from infrastructure.repositories.user_repository_impl import SQLAlchemyUserRepository
+from infrastructure.routing import ReplicaPool, RoutingSession, read_your_writes
+
+
+def _new_user(username: str = "testuser", email: str = "test@example.com") -> User:
+    """构造待创建的领域用户"""
+    return User(
+        id=uuid4(),
+        username=username,
+        email=email,
+        password_hash="hashed_password_123"
+    )
+
+
+@pytest.fixture
+def database_urls(tmp_path):
+    """主库和副本的 SQLite 文件"""
+    urls = (f"sqlite:///{tmp_path / 'primary.db'}", f"sqlite:///{tmp_path / 'replica.db'}")
+    for url in urls:
+        engine = create_engine(url)
+        Base.metadata.create_all(bind=engine)
+        engine.dispose()
+    return urls
+
+
+@pytest.fixture
+def engines(database_urls):
+    """主库和副本引擎"""
+    primary, replica = (create_engine(url) for url in database_urls)
+    yield primary, replica
+    primary.dispose()
+    replica.dispose()
+
+
+@pytest.fixture
+def replica_pool(engines):
+    """已探测延迟的副本池"""
+    pool = ReplicaPool([engines[1]], max_lag_seconds=5)
+    pool.check()
+    return pool
+
+
+@pytest.fixture
+def session_factory(engines, replica_pool):
+    """读写分离会话工厂"""
+    return sessionmaker(
+        class_=RoutingSession,
+        primary=engines[0],
+        replicas=[engines[1]],
+        replica_pool=replica_pool
+    )
+
+
+@pytest.mark.integration
+class TestRoutingSession:
+    """读写分离会话集成测试"""
+
+    def _create_on_primary(self, session_factory):
+        """在主库上创建用户"""
+        with session_factory() as session:
+            return SQLAlchemyUserRepository(session).create(_new_user())
+
+    def test_reads_go_to_replica(self, session_factory, engines):
+        """写入主库，新会话的只读查询走副本"""
+        self._create_on_primary(session_factory)
+
+        with session_factory() as session:
+            assert SQLAlchemyUserRepository(session).find_by_username("testuser") is None
+        with engines[0].connect() as connection:
+            assert connection.exec_driver_sql("SELECT count(*) FROM users").scalar() == 1
+
+    def test_reads_after_write_in_session_go_to_primary(self, session_factory):
+        """同一会话写入后的读取走主库"""
+        with session_factory() as session:
+            repository = SQLAlchemyUserRepository(session)
+            repository.create(_new_user())
+
+            assert repository.find_by_username("testuser") is not None
+
+    def test_reads_after_write_in_request_go_to_primary(self, session_factory):
+        """同一请求中写入后，其他会话的读取也走主库"""
+        with read_your_writes() as state:
+            self._create_on_primary(session_factory)
+            with session_factory() as session:
+                assert SQLAlchemyUserRepository(session).find_by_username("testuser") is not None
+
+        assert state.wrote is True
+
+    def test_sticky_request_reads_primary(self, session_factory):
+        """粘滞窗口内的请求读取走主库"""
+        self._create_on_primary(session_factory)
+
+        with read_your_writes(sticky=True) as state:
+            with session_factory() as session:
+                assert SQLAlchemyUserRepository(session).find_by_username("testuser") is not None
+
+        assert state.wrote is False
+
+    def test_update_locks_and_reads_primary(self, session_factory):
+        """更新和删除的加锁读取走主库"""
+        user = self._create_on_primary(session_factory)
+        user.is_active = False
+
+        with session_factory() as session:
+            repository = SQLAlchemyUserRepository(session)
+            assert repository.update(user).is_active is False
+        with session_factory() as session:
+            assert SQLAlchemyUserRepository(session).delete(user.id) is True
+
+    def test_lagging_replica_falls_back_to_primary(self, session_factory, replica_pool):
+        """副本延迟超过阈值时读取退回主库"""
+        self._create_on_primary(session_factory)
+        replica_pool.lag_probe = lambda engine: 60.0
+        replica_pool.check()
+
+        with session_factory() as session:
+            assert SQLAlchemyUserRepository(session).find_by_username("testuser") is not None
+
+    def test_unreachable_or_unchecked_replica_is_not_used(self, engines):
+        """未探测或探测失败的副本不参与路由"""
+        pool = ReplicaPool([engines[1]])
+        assert pool.choose() is None
+
+        def broken_probe(engine):
+            raise ConnectionError("副本不可达")
+
+        pool.lag_probe = broken_probe
+        pool.check()
+        assert pool.choose() is None
+        assert pool.lags == [float("inf")]
+
+    def test_round_robin_over_healthy_replicas(self, engines):
+        """在延迟正常的副本之间轮询"""
+        lags = {id(engines[0]): 0.5, id(engines[1]): 30.0}
+        pool = ReplicaPool(
+            [engines[0], engines[1], engines[0]],
+            max_lag_seconds=5,
+            lag_probe=lambda engine: lags[id(engine)]
+        )
+        pool.check()
+
+        assert {pool.choose() for _ in range(4)} == {0, 2}
+
+
+@pytest_asyncio.fixture
+async def async_session_factory(database_urls, replica_pool):
+    """读写分离异步会话工厂"""
+    primary, replica = (create_async_engine(to_async_url(url)) for url in database_urls)
+    yield async_sessionmaker(
+        expire_on_commit=False,
+        sync_session_class=RoutingSession,
+        primary=primary.sync_engine,
+        replicas=[replica.sync_engine],
+        replica_pool=replica_pool
+    )
+    await primary.dispose()
+    await replica.dispose()
+
+
+@pytest.mark.integration
+class TestAsyncRoutingSession:
+    """异步读写分离会话集成测试"""
+
+    @pytest.mark.asyncio
+    async def test_routes_reads_and_writes(self, async_session_factory):
+        """写入走主库，新会话的读取走副本，写入后的读取走主库"""
+        async with async_session_factory() as session:
+            repository = AsyncSQLAlchemyUserRepository(session)
+            await repository.create(_new_user())
+            assert await repository.find_by_username("testuser") is not None
+
+        async with async_session_factory() as session:
+            assert await AsyncSQLAlchemyUserRepository(session).find_by_username("testuser") is None
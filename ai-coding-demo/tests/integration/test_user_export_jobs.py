@@ -0,0 +1,195 @@
+"""集成测试: 用户快照导出任务
+
+使用 SQLite 文件库和临时输出目录；写文件的用例需要 pyarrow
+"""
+import os
+from datetime import datetime, timedelta
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from domain.models.user import User
+from infrastructure.database import Base
+from infrastructure.export import EXPORT_FIELDS
+from infrastructure.export_jobs import (
+    ColumnarExportWriter,
+    ExportJobRunner,
+    ExportJobStatus,
+    claim_statement,
+    list_part_files
+)
+from infrastructure.models.user_sql_model import ExportJobModel
+from infrastructure.repositories.user_repository_impl import SQLAlchemyUserRepository
+
+NOW = datetime(2026, 3, 1, 12, 0, 0)
+
+requires_pyarrow = pytest.mark.skipif(
+    not ColumnarExportWriter.available(), reason="pyarrow 未安装"
+)
+
+
+@pytest.fixture
+def session_factory(tmp_path):
+    """SQLite 文件库会话工厂，写入 7 个用户（第 4 个已删除）"""
+    engine = create_engine(f"sqlite:///{tmp_path / 'export.db'}")
+    Base.metadata.create_all(bind=engine)
+    factory = sessionmaker(bind=engine)
+    with factory() as session:
+        repository = SQLAlchemyUserRepository(session)
+        repository.reconcile_counts()
+        repository.create_many([
+            User(
+                id=uuid4(),
+                username=f"user{i}",
+                email=f"user{i}@example.com",
+                password_hash="hashed_password_123",
+                is_deleted=i == 3,
+                created_at=NOW + timedelta(seconds=i)
+            )
+            for i in range(7)
+        ])
+    yield factory
+    engine.dispose()
+
+
+def _runner(session_factory, tmp_path, **kwargs) -> ExportJobRunner:
+    """每次读取 2 行、每个分片 2 个行组的执行器"""
+    options = dict(chunk_size=2, row_groups_per_file=2, pause_seconds=0, clock=lambda: NOW)
+    options.update(kwargs)
+    return ExportJobRunner(session_factory, str(tmp_path / "exports"), **options)
+
+
+def _read_usernames(directory, format):
+    """按分片顺序读出全部用户名"""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    usernames = []
+    for name in list_part_files(directory):
+        path = os.path.join(directory, name)
+        if format == "parquet":
+            table = pq.read_table(path)
+        else:
+            with pa.memory_map(path) as source:
+                table = pa.ipc.open_file(source).read_all()
+        assert table.column_names == list(EXPORT_FIELDS)
+        usernames.extend(table.column("username").to_pylist())
+    return usernames
+
+
+@pytest.mark.integration
+class TestExportJobRunner:
+    """导出任务集成测试"""
+
+    def test_submit_and_claim(self, session_factory, tmp_path):
+        """提交后为待执行，只能被认领一次；心跳过期的运行中任务可被重新认领"""
+        runner = _runner(session_factory, tmp_path)
+
+        job = runner.submit("parquet", 2)
+
+        assert job.status == ExportJobStatus.PENDING
+        assert job.rows_total == 6
+        assert job.progress == 0
+        stale_before = NOW - timedelta(minutes=10)
+        with session_factory() as session:
+            assert session.execute(claim_statement(job.id, NOW, stale_before)).rowcount == 1
+            assert session.execute(claim_statement(job.id, NOW, stale_before)).rowcount == 0
+            later = NOW + timedelta(minutes=11)
+            assert session.execute(
+                claim_statement(job.id, later, later - timedelta(minutes=10))
+            ).rowcount == 1
+            session.commit()
+        assert runner.get(job.id).status == ExportJobStatus.RUNNING
+        assert runner.get(uuid4()) is None
+
+    def test_rejects_invalid_options(self, session_factory, tmp_path):
+        """不支持的格式或行组大小"""
+        runner = _runner(session_factory, tmp_path)
+
+        with pytest.raises(ValueError):
+            runner.submit("csv", 2)
+        with pytest.raises(ValueError):
+            runner.submit("parquet", 0)
+
+    @requires_pyarrow
+    @pytest.mark.parametrize("format", ["parquet", "arrow"])
+    def test_writes_part_files(self, session_factory, tmp_path, format):
+        """按 (created_at, id) 顺序写出未删除用户，每个分片最多 row_groups_per_file 个行组"""
+        import pyarrow.parquet as pq
+
+        runner = _runner(session_factory, tmp_path)
+        job = runner.submit(format, 2)
+
+        assert runner.run_pending() == 1
+
+        finished = runner.get(job.id)
+        directory = runner.job_dir(job.id)
+        assert finished.status == ExportJobStatus.COMPLETED
+        assert finished.rows_exported == 6
+        assert finished.files == 2
+        assert list_part_files(directory) == [f"part-00000.{format}", f"part-00001.{format}"]
+        assert _read_usernames(directory, format) == [
+            "user0", "user1", "user2", "user4", "user5", "user6"
+        ]
+        if format == "parquet":
+            metadata = pq.ParquetFile(os.path.join(directory, "part-00000.parquet")).metadata
+            assert metadata.num_row_groups == 2
+
+    @requires_pyarrow
+    def test_resumes_from_last_file(self, session_factory, tmp_path):
+        """中断的任务从最后一个完成的分片继续，未完成的临时文件被丢弃"""
+        runner = _runner(session_factory, tmp_path, row_groups_per_file=1)
+        job = runner.submit("parquet", 2)
+
+        # 第一个分片完成后取消: 任务放回待执行，断点保留
+        original_update = runner._update
+
+        def cancel_after_first_file(job_id, **values):
+            original_update(job_id, **values)
+            if values.get("files") == 1:
+                runner.cancel()
+
+        runner._update = cancel_after_first_file
+        assert runner._run_job(runner._claim_next()) is False
+        runner._update = original_update
+
+        interrupted = runner.get(job.id)
+        directory = runner.job_dir(job.id)
+        assert interrupted.status == ExportJobStatus.PENDING
+        assert interrupted.rows_exported == 2
+        assert list_part_files(directory) == ["part-00000.parquet"]
+
+        # 模拟崩溃留下的临时文件
+        with open(os.path.join(directory, "part-00001.parquet.tmp"), "wb") as f:
+            f.write(b"partial")
+
+        assert runner.run_pending() == 1
+
+        resumed = runner.get(job.id)
+        assert resumed.rows_exported == 6
+        assert resumed.files == 3
+        assert not any(name.endswith(".tmp") for name in os.listdir(directory))
+        assert _read_usernames(directory, "parquet") == [
+            "user0", "user1", "user2", "user4", "user5", "user6"
+        ]
+
+    @requires_pyarrow
+    def test_failure_is_recorded(self, session_factory, tmp_path):
+        """读取失败时任务标记为失败并记录错误，不再自动重试"""
+        def broken_repository(session):
+            raise RuntimeError("replica unavailable")
+
+        runner = _runner(session_factory, tmp_path)
+        job = runner.submit("parquet", 2)
+        runner.repository_factory = broken_repository
+
+        assert runner.run_pending() == 0
+
+        failed = runner.get(job.id)
+        assert failed.status == ExportJobStatus.FAILED
+        assert "replica unavailable" in failed.error
+        with session_factory() as session:
+            assert session.get(ExportJobModel, job.id).finished_at == NOW
+        assert runner.run_pending() == 0
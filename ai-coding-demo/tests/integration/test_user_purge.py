@@ -0,0 +1,145 @@
+"""集成测试: 过期注册数据清理任务
+
+使用 SQLite 文件库，每批一个独立会话（与应用内任务相同）
+"""
+from datetime import datetime, timedelta
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from src.infrastructure.metrics import REGISTRY
+from domain.models.user import User, hash_verification_token
+from domain.repositories.user_repository import CountMode
+from infrastructure.database import Base
+from infrastructure.models.user_sql_model import MaintenanceCheckpointModel
+from infrastructure.purge import ACCOUNTS_TASK, TOKENS_TASK, UserPurgeJob, decode_checkpoint
+from infrastructure.repositories.user_repository_impl import SQLAlchemyUserRepository
+
+NOW = datetime(2026, 3, 1, 12, 0, 0)
+
+
+def _new_user(name: str, expired_days_ago: float, verified: bool = False) -> User:
+    """构造验证过期时间为 NOW 之前若干天的用户"""
+    return User(
+        id=uuid4(),
+        username=name,
+        email=f"{name}@example.com",
+        password_hash="hashed_password_123",
+        email_verified=verified,
+        email_verification_token_hash=None if verified else hash_verification_token(uuid4()),
+        email_verification_expires=NOW - timedelta(days=expired_days_ago)
+    )
+
+
+@pytest.fixture
+def session_factory(tmp_path):
+    """SQLite 文件库会话工厂"""
+    engine = create_engine(f"sqlite:///{tmp_path / 'purge.db'}")
+    Base.metadata.create_all(bind=engine)
+    yield sessionmaker(bind=engine)
+    engine.dispose()
+
+
+@pytest.fixture
+def seed(session_factory):
+    """写入用户并初始化计数器"""
+    def seed(users):
+        with session_factory() as session:
+            repository = SQLAlchemyUserRepository(session)
+            repository.reconcile_counts()
+            repository.create_many(users)
+    return seed
+
+
+def _job(session_factory, **kwargs) -> UserPurgeJob:
+    """token 保留 7 天、未验证用户保留 30 天、每批 2 行的任务"""
+    options = dict(
+        token_retention=timedelta(days=7),
+        account_retention=timedelta(days=30),
+        chunk_size=2,
+        pause_seconds=0,
+        clock=lambda: NOW
+    )
+    options.update(kwargs)
+    return UserPurgeJob(session_factory, **options)
+
+
+def _usernames(session_factory):
+    """剩余用户名"""
+    with session_factory() as session:
+        return {user.username for user in SQLAlchemyUserRepository(session).find_many(limit=100)}
+
+
+@pytest.mark.integration
+class TestUserPurgeJob:
+    """清理任务集成测试"""
+
+    def test_purges_in_chunks(self, session_factory, seed):
+        """分批删除过期未验证用户，清除过期 token，其余用户不受影响"""
+        seed(
+            [_new_user(f"stale{i}", 40 + i) for i in range(5)]
+            + [
+                _new_user("pending", 10),
+                _new_user("fresh", -1),
+                _new_user("verified", 400, verified=True),
+            ]
+        )
+        rows_before = REGISTRY.get_sample_value(
+            "user_purge_rows_total", {"task": ACCOUNTS_TASK}
+        ) or 0
+
+        result = _job(session_factory).run()
+
+        assert result == {TOKENS_TASK: 6, ACCOUNTS_TASK: 5}
+        assert _usernames(session_factory) == {"pending", "fresh", "verified"}
+        assert REGISTRY.get_sample_value(
+            "user_purge_rows_total", {"task": ACCOUNTS_TASK}
+        ) == rows_before + 5
+        with session_factory() as session:
+            repository = SQLAlchemyUserRepository(session)
+            assert repository.find_by_username("pending").email_verification_token_hash is None
+            assert repository.find_by_username("fresh").email_verification_token_hash is not None
+            assert repository.count(mode=CountMode.MAINTAINED) == repository.count() == 3
+
+    def test_resumes_from_checkpoint(self, session_factory, seed):
+        """达到批数上限后记录断点，下次从断点继续，扫描结束后清除断点"""
+        seed([_new_user(f"stale{i}", 40 + i) for i in range(5)])
+        job = _job(session_factory, max_chunks_per_run=1)
+
+        assert job.run()[ACCOUNTS_TASK] == 2
+        with session_factory() as session:
+            checkpoint = session.get(MaintenanceCheckpointModel, ACCOUNTS_TASK)
+            assert decode_checkpoint(checkpoint.cursor)[0] == NOW - timedelta(days=43)
+
+        assert job.run()[ACCOUNTS_TASK] == 2
+        assert job.run()[ACCOUNTS_TASK] == 1
+        with session_factory() as session:
+            assert session.get(MaintenanceCheckpointModel, ACCOUNTS_TASK).cursor is None
+        assert _usernames(session_factory) == set()
+
+    def test_archive_runs_before_commit(self, session_factory, seed):
+        """归档失败时回滚本批，归档成功后删除"""
+        seed([_new_user(f"stale{i}", 40 + i) for i in range(3)])
+
+        def broken_archive(users):
+            raise OSError("磁盘已满")
+
+        with pytest.raises(OSError):
+            _job(session_factory, archive=broken_archive).run()
+        assert len(_usernames(session_factory)) == 3
+
+        archived = []
+        _job(session_factory, archive=archived.extend).run()
+        assert sorted(user.username for user in archived) == ["stale0", "stale1", "stale2"]
+        assert _usernames(session_factory) == set()
+
+    def test_invalid_checkpoint_restarts(self, session_factory, seed):
+        """无法解析的断点从头开始"""
+        seed([_new_user("stale", 40)])
+        with session_factory() as session:
+            session.add(MaintenanceCheckpointModel(name=ACCOUNTS_TASK, cursor="garbage"))
+            session.commit()
+
+        assert _job(session_factory).run()[ACCOUNTS_TASK] == 1
@@ -3,11 +3,23 @@
 测试 SQLAlchemy 仓储实现
 """
 import pytest
-from uuid import UUID
+from uuid import UUID, uuid4
 from datetime import datetime
 
-from domain.models.user import User
-from infrastructure.repositories.user_repository_impl import SQLAlchemyUserRepository
+from sqlalchemy import create_engine, event, insert, select, text, update
+from sqlalchemy.orm import sessionmaker
+
+from src.domain.exceptions import ConflictError
+from domain.models.user import User, hash_verification_token
+from domain.repositories.user_repository import CountMode
+from infrastructure.database import Base
+from infrastructure.existence_filter import UserExistenceFilter
+from infrastructure.models.user_sql_model import UserCountModel, UserModel
+from infrastructure.repositories.user_repository_impl import (
+    SQLAlchemyUserRepository,
+    estimated_count_statement,
+    plan_rows
+)
 
 
 class TestSQLAlchemyUserRepository:
@@ -135,3 +147,608 @@ class TestSQLAlchemyUserRepository:
         users = test_user_repository.list_all()
 
         assert len(users) == 3
+
+
+def _new_user(username: str = "testuser", email: str = "test@example.com") -> User:
+    """构造待创建的领域用户"""
+    return User(
+        id=uuid4(),
+        username=username,
+        email=email,
+        password_hash="hashed_password_123"
+    )
+
+
+class TestAtomicCreate:
+    """原子注册（INSERT ... ON CONFLICT）集成测试"""
+
+    def test_create_returns_inserted_user(self, test_user_repository):
+        """插入成功时返回数据库中的用户"""
+        user = _new_user()
+
+        created = test_user_repository.create(user)
+
+        assert created.id == user.id
+        assert created.username == "testuser"
+        assert created.email_verified is False
+        assert test_user_repository.find_by_id(user.id) is not None
+
+    def test_create_duplicate_username_raises_conflict(self, test_user_repository):
+        """用户名冲突映射为 USERNAME_TAKEN"""
+        test_user_repository.create(_new_user())
+
+        with pytest.raises(ConflictError) as exc_info:
+            test_user_repository.create(_new_user(email="other@example.com"))
+
+        assert exc_info.value.code == "USERNAME_TAKEN"
+        assert "testuser" in exc_info.value.message
+
+    def test_create_duplicate_email_raises_conflict(self, test_user_repository):
+        """邮箱冲突映射为 EMAIL_ALREADY_REGISTERED"""
+        test_user_repository.create(_new_user())
+
+        with pytest.raises(ConflictError) as exc_info:
+            test_user_repository.create(_new_user(username="otheruser"))
+
+        assert exc_info.value.code == "EMAIL_ALREADY_REGISTERED"
+
+    def test_conflict_does_not_insert(self, test_user_repository):
+        """冲突时不插入任何行，会话仍可继续使用"""
+        test_user_repository.create(_new_user())
+
+        with pytest.raises(ConflictError):
+            test_user_repository.create(_new_user())
+
+        assert test_user_repository.count() == 1
+
+
+class TestCreateMany:
+    """批量创建集成测试"""
+
+    def test_creates_all_rows_in_chunks(self, test_user_repository):
+        """分块插入全部用户"""
+        users = [_new_user(f"user{i}", f"user{i}@example.com") for i in range(25)]
+
+        result = test_user_repository.create_many(users, chunk_size=10)
+
+        assert [u.id for u in result.created] == [u.id for u in users]
+        assert result.conflicts == {}
+        assert test_user_repository.count() == 25
+
+    def test_reports_conflicts_by_input_index(self, test_user_repository):
+        """冲突行按输入下标报告，不影响同一分块的其他行"""
+        test_user_repository.create(_new_user("taken", "taken@example.com"))
+        users = [
+            _new_user("fresh1", "fresh1@example.com"),
+            _new_user("taken", "other@example.com"),
+            _new_user("fresh2", "taken@example.com"),
+            _new_user("fresh1", "dup@example.com"),
+            _new_user("fresh3", "fresh3@example.com"),
+        ]
+
+        result = test_user_repository.create_many(users, chunk_size=100)
+
+        assert [u.username for u in result.created] == ["fresh1", "fresh3"]
+        assert {i: e.code for i, e in result.conflicts.items()} == {
+            1: "USERNAME_TAKEN",
+            2: "EMAIL_ALREADY_REGISTERED",
+            3: "USERNAME_TAKEN",
+        }
+        assert test_user_repository.count() == 3
+
+    def test_rejects_invalid_chunk_size(self, test_user_repository):
+        """分块大小必须为正数"""
+        with pytest.raises(ValueError):
+            test_user_repository.create_many([_new_user()], chunk_size=0)
+
+
+class TestFindPage:
+    """游标分页集成测试"""
+
+    def _create_users(self, repository, count, created_at=None):
+        """创建用户，可指定相同的创建时间"""
+        users = []
+        for i in range(count):
+            user = _new_user(f"user{i}", f"user{i}@example.com")
+            user.created_at = created_at or datetime(2026, 1, 1, 0, 0, i)
+            users.append(user)
+        repository.create_many(users)
+        return users
+
+    def _collect_pages(self, repository, limit):
+        """按游标依次读取所有页"""
+        ids, cursor = [], None
+        while True:
+            page = repository.find_page(after=cursor, limit=limit)
+            ids.extend(user.id for user in page.items)
+            if page.next_cursor is None:
+                return ids
+            cursor = page.next_cursor
+
+    def test_pages_cover_all_users_in_order(self, test_user_repository):
+        """依次翻页返回全部用户，按创建时间排序"""
+        users = self._create_users(test_user_repository, 7)
+
+        assert self._collect_pages(test_user_repository, limit=3) == [u.id for u in users]
+
+    def test_ties_on_created_at_are_broken_by_id(self, test_user_repository):
+        """创建时间相同时按 id 排序，不跳行也不重复"""
+        users = self._create_users(test_user_repository, 5, created_at=datetime(2026, 1, 1))
+
+        ids = self._collect_pages(test_user_repository, limit=2)
+
+        assert sorted(ids) == sorted(u.id for u in users)
+        assert len(set(ids)) == 5
+
+    def test_inserts_before_cursor_do_not_shift_pages(self, test_user_repository):
+        """翻页期间在已读位置之前插入的用户不会导致重复"""
+        self._create_users(test_user_repository, 4)
+        first = test_user_repository.find_page(limit=2)
+
+        early = _new_user("early", "early@example.com")
+        early.created_at = datetime(2025, 1, 1)
+        test_user_repository.create(early)
+        second = test_user_repository.find_page(after=first.next_cursor, limit=2)
+
+        assert [u.username for u in second.items] == ["user2", "user3"]
+        assert second.next_cursor is None
+
+    def test_filters_apply(self, test_user_repository):
+        """状态过滤"""
+        users = self._create_users(test_user_repository, 3)
+        users[1].is_active = False
+        test_user_repository.update(users[1])
+
+        page = test_user_repository.find_page(is_active=False)
+
+        assert [u.username for u in page.items] == ["user1"]
+
+
+class TestIterUsers:
+    """流式读取用户集成测试"""
+
+    def test_streams_in_creation_order(self, test_user_repository):
+        """按 (created_at, id) 顺序读取全部未删除用户，按批从游标取行"""
+        users = []
+        for i in range(5):
+            user = _new_user(f"user{i}", f"user{i}@example.com")
+            user.created_at = datetime(2026, 1, 1, 0, 0, 5 - i)
+            users.append(user)
+        test_user_repository.create_many(users)
+        users[0].soft_delete()
+        test_user_repository.update(users[0])
+
+        streamed = test_user_repository.iter_users(batch_size=2)
+
+        assert next(streamed).username == "user4"
+        assert [user.username for user in streamed] == ["user3", "user2", "user1"]
+
+    def test_filters_apply(self, test_user_repository):
+        """按状态过滤"""
+        active = test_user_repository.create(_new_user("active", "active@example.com"))
+        inactive = test_user_repository.create(_new_user("inactive", "inactive@example.com"))
+        inactive.is_active = False
+        test_user_repository.update(inactive)
+
+        assert [u.id for u in test_user_repository.iter_users(is_active=True)] == [active.id]
+        assert [u.id for u in test_user_repository.iter_users(is_active=False)] == [inactive.id]
+
+
+class TestCountModes:
+    """用户计数方式集成测试"""
+
+    def _assert_maintained_matches_exact(self, repository):
+        """各种过滤组合下计数器与精确计数一致"""
+        for is_active in (None, True, False):
+            for is_deleted in (None, True, False):
+                assert repository.count(is_active, is_deleted, mode=CountMode.MAINTAINED) == (
+                    repository.count(is_active, is_deleted)
+                )
+
+    def test_maintained_counts_follow_writes(self, test_user_repository):
+        """创建、批量创建、状态变更和删除都同步更新计数器"""
+        test_user_repository.reconcile_counts()
+
+        user = test_user_repository.create(_new_user())
+        test_user_repository.create_many(
+            [_new_user(f"user{i}", f"user{i}@example.com") for i in range(3)]
+        )
+        user.soft_delete()
+        test_user_repository.update(user)
+        other = test_user_repository.find_by_username("user0")
+        other.is_active = False
+        test_user_repository.update(other)
+        test_user_repository.delete(test_user_repository.find_by_username("user1").id)
+
+        assert test_user_repository.count(mode=CountMode.MAINTAINED) == 2
+        self._assert_maintained_matches_exact(test_user_repository)
+
+    def test_conflicts_do_not_change_counts(self, test_user_repository):
+        """冲突的插入不计数"""
+        test_user_repository.reconcile_counts()
+        test_user_repository.create(_new_user())
+
+        with pytest.raises(ConflictError):
+            test_user_repository.create(_new_user(email="other@example.com"))
+        test_user_repository.create_many([_new_user(), _new_user("fresh", "fresh@example.com")])
+
+        assert test_user_repository.count(mode=CountMode.MAINTAINED) == 2
+
+    def test_uninitialized_counters_fall_back_to_exact(self, test_user_repository, test_session):
+        """计数器未初始化时退回精确计数，读取不写入计数器"""
+        test_user_repository.create_many(
+            [_new_user(f"user{i}", f"user{i}@example.com") for i in range(3)]
+        )
+
+        assert test_user_repository.count(mode=CountMode.MAINTAINED) == 3
+        self._assert_maintained_matches_exact(test_user_repository)
+        assert test_session.execute(select(UserCountModel)).all() == []
+
+    def test_reconcile_corrects_drift(self, test_user_repository, test_session):
+        """校准修正绕过仓储的写入造成的偏差"""
+        test_user_repository.create(_new_user())
+        test_user_repository.reconcile_counts()
+        test_session.execute(update(UserModel).values(is_active=False))
+        test_session.commit()
+
+        assert test_user_repository.count(is_active=True, mode=CountMode.MAINTAINED) == 1
+        test_user_repository.reconcile_counts()
+        assert test_user_repository.count(is_active=True, mode=CountMode.MAINTAINED) == 0
+        assert len(test_session.execute(select(UserCountModel)).all()) == 4
+
+    def test_reconcile_does_not_overwrite_interleaved_writes(self, tmp_path, monkeypatch):
+        """校准的第一条语句之后提交的注册计入结果，不被过期的统计覆盖"""
+        engine = create_engine(f"sqlite:///{tmp_path / 'counts.db'}")
+        Base.metadata.create_all(bind=engine)
+        factory = sessionmaker(bind=engine)
+        with factory() as session:
+            SQLAlchemyUserRepository(session).reconcile_counts()
+            SQLAlchemyUserRepository(session).create(_new_user())
+
+        with factory() as session:
+            original_execute = session.execute
+            interleaved = []
+
+            def execute_then_register(statement, *args, **kwargs):
+                if interleaved:
+                    return original_execute(statement, *args, **kwargs)
+                # 读完第一条语句的结果再提交并发写入（SQLite 读游标未关闭时会阻塞写入）
+                result = original_execute(statement, *args, **kwargs).freeze()
+                interleaved.append(statement)
+                with factory() as writer:
+                    SQLAlchemyUserRepository(writer).create(
+                        _new_user("concurrent", "concurrent@example.com")
+                    )
+                return result()
+
+            monkeypatch.setattr(session, "execute", execute_then_register)
+            SQLAlchemyUserRepository(session).reconcile_counts()
+
+        with factory() as session:
+            repository = SQLAlchemyUserRepository(session)
+            assert repository.count() == 2
+            assert repository.count(mode=CountMode.MAINTAINED) == 2
+        engine.dispose()
+
+    def test_estimated_falls_back_to_exact_on_sqlite(self, test_user_repository):
+        """没有规划器统计信息的方言退回精确计数"""
+        test_user_repository.create(_new_user())
+
+        assert test_user_repository.count(mode=CountMode.ESTIMATED) == 1
+
+    def test_estimated_count_statement(self):
+        """PostgreSQL 估计语句内联过滤条件并读取规划行数"""
+        statement = SQLAlchemyUserRepository._filter_status(select(UserModel.id), True, False)
+
+        sql = str(estimated_count_statement(statement))
+
+        assert sql.startswith("EXPLAIN (FORMAT JSON) SELECT users.id")
+        assert "users.is_active = true" in sql
+        assert plan_rows('[{"Plan": {"Plan Rows": 12345}}]') == 12345
+        assert plan_rows([{"Plan": {"Plan Rows": 7}}]) == 7
+
+
+class TestFindExistingUsernames:
+    """批量用户名/邮箱存在性检查集成测试"""
+
+    def test_returns_only_taken_usernames(self, test_user_repository):
+        """一次查询返回已被占用的用户名"""
+        test_user_repository.create(_new_user("john_doe", "john@example.com"))
+        test_user_repository.create(_new_user("john_doe1", "john1@example.com"))
+
+        existing = test_user_repository.find_existing_usernames(
+            ["john_doe1", "john_doe2", "john_doe", "john_doe1"]
+        )
+
+        assert existing == {"john_doe", "john_doe1"}
+
+    def test_empty_candidates(self, test_user_repository):
+        """没有候选时返回空集合"""
+        assert test_user_repository.find_existing_usernames([]) == set()
+
+    def test_returns_only_taken_emails(self, test_user_repository):
+        """一次查询返回已被未删除用户使用的邮箱"""
+        test_user_repository.create(_new_user("john_doe", "john@example.com"))
+        deleted = test_user_repository.create(_new_user("jane_doe", "jane@example.com"))
+        deleted.soft_delete()
+        test_user_repository.update(deleted)
+
+        existing = test_user_repository.find_existing_emails(
+            ["john@example.com", "jane@example.com", "new@example.com"]
+        )
+
+        assert existing == {"john@example.com"}
+        assert test_user_repository.find_existing_emails([]) == set()
+
+
+class TestFindByIds:
+    """按ID批量查找集成测试"""
+
+    def test_keeps_request_order_and_skips_missing(self, test_user_repository):
+        """按请求顺序返回存在的用户，重复ID只返回一次"""
+        first = test_user_repository.create(_new_user("first", "first@example.com"))
+        second = test_user_repository.create(_new_user("second", "second@example.com"))
+
+        users = test_user_repository.find_by_ids([second.id, uuid4(), first.id, second.id])
+
+        assert [user.id for user in users] == [second.id, first.id]
+        assert users[0].changed_fields == set()
+
+    def test_empty_ids(self, test_user_repository):
+        """没有ID时不查询"""
+        assert test_user_repository.find_by_ids([]) == []
+
+
+class TestFindVersion:
+    """版本查询集成测试"""
+
+    def test_version_follows_updates(self, test_user_repository):
+        """返回 updated_at，更新后随之变化；不存在或已删除的用户返回 None"""
+        user = test_user_repository.create(_new_user())
+        version = test_user_repository.find_version(user.id)
+
+        assert version == test_user_repository.find_by_id(user.id).updated_at
+
+        user.first_name = "Alice"
+        test_user_repository.update(user)
+        assert test_user_repository.find_version(user.id) > version
+
+        user.is_deleted = True
+        test_user_repository.update(user)
+        assert test_user_repository.find_version(user.id) is None
+        assert test_user_repository.find_version(uuid4()) is None
+
+
+class TestExistenceFilter:
+    """存在性过滤器与仓储集成测试"""
+
+    @pytest.fixture
+    def filtered_repository(self, test_session):
+        """带存在性过滤器的仓储"""
+        existence_filter = UserExistenceFilter(capacity=100)
+        repository = SQLAlchemyUserRepository(test_session, existence_filter=existence_filter)
+        existence_filter.rebuild(repository.iter_identities())
+        return repository
+
+    def test_created_user_passes_filter(self, filtered_repository):
+        """新建用户加入过滤器，存在性检查仍查询数据库确认"""
+        filtered_repository.create(_new_user())
+
+        assert filtered_repository.username_exists("testuser") is True
+        assert filtered_repository.email_exists("test@example.com") is True
+
+    def test_absent_names_skip_database(self, filtered_repository, test_session):
+        """过滤器判定不存在时不查询数据库"""
+        statements = []
+        event.listen(
+            test_session.get_bind(), "before_cursor_execute",
+            lambda *args: statements.append(args[2])
+        )
+
+        assert filtered_repository.username_exists("nobody") is False
+        assert filtered_repository.email_exists("nobody@example.com") is False
+        assert statements == []
+
+    def test_find_existing_usernames_filters_before_query(
+        self, filtered_repository, test_session
+    ):
+        """批量检查: 过滤器排除的候选不进入 IN 查询"""
+        filtered_repository.create(_new_user())
+        statements = []
+        event.listen(
+            test_session.get_bind(), "before_cursor_execute",
+            lambda *args: statements.append(args[3])
+        )
+
+        existing = filtered_repository.find_existing_usernames(["testuser", "testuser1"])
+
+        assert existing == {"testuser"}
+        assert len(statements) == 1
+
+    def test_iter_identities(self, test_user_repository):
+        """流式读取全部用户名和邮箱"""
+        test_user_repository.create(_new_user())
+
+        assert list(test_user_repository.iter_identities()) == [("testuser", "test@example.com")]
+
+
+class TestDirtyFieldUpdate:
+    """只写入修改列的更新集成测试"""
+
+    @pytest.fixture
+    def statements(self, test_engine):
+        """记录执行的 SQL 语句"""
+        executed = []
+
+        def before_execute(conn, cursor, statement, parameters, context, executemany):
+            executed.append(statement)
+
+        event.listen(test_engine, "before_cursor_execute", before_execute)
+        yield executed
+        event.remove(test_engine, "before_cursor_execute", before_execute)
+
+    def test_verify_email_is_one_statement(self, test_user_repository, statements):
+        """邮箱验证只执行一条只包含修改列的 UPDATE ... RETURNING"""
+        user = test_user_repository.create(_new_user())
+        statements.clear()
+
+        user.verify_email()
+        updated = test_user_repository.update(user)
+
+        assert len(statements) == 1
+        set_clause, returning = statements[0].split("RETURNING")
+        assert set_clause.lstrip().startswith("UPDATE")
+        assert "email_verified" in set_clause
+        assert "password_hash" not in set_clause
+        assert updated.email_verified is True
+        assert test_user_repository.find_by_id(user.id).email_verified is True
+        assert user.changed_fields == set()
+
+    def test_unchanged_entity_skips_write(self, test_user_repository, statements):
+        """没有修改时不访问数据库"""
+        user = test_user_repository.create(_new_user())
+        statements.clear()
+
+        user.is_active = True
+        assert test_user_repository.update(user) is user
+        assert statements == []
+
+    def test_concurrent_updates_of_different_fields_are_kept(self, test_user_repository):
+        """只写入修改的列: 两次加载分别修改不同字段，互不覆盖"""
+        created = test_user_repository.create(_new_user())
+        first = test_user_repository.find_by_id(created.id)
+        second = test_user_repository.find_by_id(created.id)
+
+        first.first_name = "Ann"
+        second.update_last_login()
+        test_user_repository.update(first)
+        test_user_repository.update(second)
+
+        stored = test_user_repository.find_by_id(created.id)
+        assert stored.first_name == "Ann"
+        assert stored.last_login is not None
+
+    def test_status_change_updates_counters(self, test_user_repository):
+        """计数器按加载时的状态计算增减"""
+        test_user_repository.reconcile_counts()
+        user = test_user_repository.create(_new_user())
+
+        user.soft_delete()
+        test_user_repository.update(user)
+
+        assert test_user_repository.count(mode=CountMode.MAINTAINED) == 0
+        assert test_user_repository.count(is_deleted=True, mode=CountMode.MAINTAINED) == 1
+
+    def test_untracked_entity_writes_full_row(self, test_user_repository):
+        """不是从仓储加载的实体整行写入"""
+        created = test_user_repository.create(_new_user())
+        detached = User(
+            id=created.id,
+            username=created.username,
+            email=created.email,
+            password_hash=created.password_hash,
+            email_verified=True,
+            created_at=created.created_at
+        )
+
+        assert test_user_repository.update(detached).email_verified is True
+        assert test_user_repository.find_by_id(created.id).email_verified is True
+
+    def test_missing_user_returns_none(self, test_user_repository):
+        """用户不存在时返回 None"""
+        user = test_user_repository.create(_new_user())
+        test_user_repository.delete(user.id)
+
+        user.first_name = "Ann"
+
+        assert test_user_repository.update(user) is None
+
+
+class TestVerificationToken:
+    """邮箱验证 token 摘要存储集成测试"""
+
+    def test_lookup_by_raw_token_stores_digest(self, test_user_repository, test_session):
+        """按原始 token 查找，数据库只保存摘要"""
+        token = uuid4()
+        user = _new_user()
+        user.email_verification_token_hash = hash_verification_token(token)
+        test_user_repository.create(user)
+
+        assert test_user_repository.find_by_verification_token(str(token)).id == user.id
+        assert test_user_repository.find_by_verification_token(str(token).upper()).id == user.id
+        stored = test_session.scalars(select(UserModel.email_verification_token_hash)).one()
+        assert stored == hash_verification_token(token)
+        assert str(token) not in stored
+
+    def test_unknown_or_malformed_token(self, test_user_repository):
+        """未知或格式错误的 token 返回 None"""
+        assert test_user_repository.find_by_verification_token(str(uuid4())) is None
+        assert test_user_repository.find_by_verification_token("not-a-token") is None
+
+    def test_lookup_uses_index(self, test_session):
+        """按摘要点查走索引，不扫描全表"""
+        plan = test_session.execute(text(
+            "EXPLAIN QUERY PLAN SELECT id FROM users WHERE email_verification_token_hash = :h"
+        ), {"h": hash_verification_token(uuid4())}).all()
+
+        assert any("USING INDEX" in row[-1] for row in plan)
+
+    def test_verify_email_clears_digest(self, test_user_repository):
+        """验证后清除摘要，token 不能再次使用"""
+        token = uuid4()
+        user = _new_user()
+        user.email_verification_token_hash = hash_verification_token(token)
+        created = test_user_repository.create(user)
+
+        created.verify_email()
+        test_user_repository.update(created)
+
+        assert test_user_repository.find_by_verification_token(str(token)) is None
+
+
+class TestCanonicalIdentity:
+    """规范形式列和部分唯一索引集成测试"""
+
+    def test_lookups_are_case_insensitive(self, test_user_repository):
+        """按用户名/邮箱查找不区分大小写"""
+        user = test_user_repository.create(_new_user())
+
+        assert test_user_repository.find_by_username("TestUser").id == user.id
+        assert test_user_repository.find_by_email("Test@Example.COM").id == user.id
+        assert test_user_repository.username_exists("TESTUSER") is True
+        assert test_user_repository.find_existing_usernames(["TestUser", "other"]) == {"TestUser"}
+
+    def test_canonical_columns_are_generated(self, test_user_repository, test_session):
+        """绕过领域模型写入的大小写混合值也按规范形式判定唯一"""
+        test_session.execute(insert(UserModel).values(
+            id=uuid4(), username="MixedCase", email="Mixed@Example.com", password_hash="x"
+        ))
+        test_session.commit()
+
+        assert test_session.scalar(select(UserModel.username_canonical)) == "mixedcase"
+        with pytest.raises(ConflictError) as exc_info:
+            test_user_repository.create(_new_user("mixedcase", "other@example.com"))
+        assert exc_info.value.code == "USERNAME_TAKEN"
+
+    def test_deleted_users_are_excluded(self, test_user_repository):
+        """软删除用户不参与查找和唯一性检查，用户名/邮箱可重新注册"""
+        user = test_user_repository.create(_new_user())
+        user.soft_delete()
+        test_user_repository.update(user)
+
+        assert test_user_repository.find_by_username("testuser") is None
+        assert test_user_repository.email_exists("test@example.com") is False
+
+        again = test_user_repository.create(_new_user())
+        assert test_user_repository.find_by_username("testuser").id == again.id
+        assert test_user_repository.find_by_id(user.id).is_deleted is True
+
+    def test_existence_checks_use_partial_index(self, test_session):
+        """存在性检查按部分唯一索引点查"""
+        for column in ("username_canonical", "email_canonical"):
+            plan = test_session.execute(text(
+                f"EXPLAIN QUERY PLAN SELECT {column} FROM users "
+                f"WHERE {column} = :value AND is_deleted = 0"
+            ), {"value": "testuser"}).all()
+
+            assert any(f"INDEX uq_user_{column}_live" in row[-1] for row in plan)
@@ -0,0 +1,61 @@
+"""
+条件请求单元测试
+
+基于规范: SPEC-USER-001, 4.1 性能要求
+"""
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from src.api.conditional import (
+    entity_tag,
+    is_conditional,
+    last_modified,
+    not_modified,
+    validator_headers
+)
+
+VERSION = datetime(2026, 1, 28, 10, 30, 0, 123456)
+
+
+@pytest.mark.unit
+class TestConditionalRequests:
+    """条件请求测试套件"""
+
+    def test_validators(self):
+        """ETag 区分微秒，Last-Modified 精确到秒；无时区时间按 UTC 处理"""
+        aware = VERSION.replace(tzinfo=timezone.utc).astimezone(timezone(timedelta(hours=8)))
+
+        assert entity_tag(VERSION) == entity_tag(aware)
+        assert entity_tag(VERSION) != entity_tag(VERSION + timedelta(microseconds=1))
+        assert last_modified(VERSION) == "Wed, 28 Jan 2026 10:30:00 GMT"
+        assert validator_headers(VERSION)["Cache-Control"] == "private, no-cache"
+
+    def test_if_none_match(self):
+        """任一 ETag 匹配（弱比较）或 * 时未修改"""
+        tag = entity_tag(VERSION)
+
+        assert not_modified({"if-none-match": tag}, VERSION)
+        assert not_modified({"if-none-match": f'"other", W/{tag}'}, VERSION)
+        assert not_modified({"if-none-match": "*"}, VERSION)
+        assert not not_modified({"if-none-match": tag}, VERSION + timedelta(microseconds=1))
+
+    def test_if_modified_since(self):
+        """版本（截断到秒）不晚于 If-Modified-Since 时未修改，无效日期忽略"""
+        since = last_modified(VERSION)
+
+        assert not_modified({"if-modified-since": since}, VERSION)
+        assert not not_modified({"if-modified-since": since}, VERSION + timedelta(seconds=1))
+        assert not not_modified({"if-modified-since": "yesterday"}, VERSION)
+
+    def test_if_none_match_takes_precedence(self):
+        """同时带两个头时只比较 ETag"""
+        headers = {
+            "if-none-match": '"other"',
+            "if-modified-since": last_modified(VERSION)
+        }
+
+        assert is_conditional(headers)
+        assert not not_modified(headers, VERSION)
+        assert not is_conditional({})
@@ -0,0 +1,42 @@
+"""
+游标分页单元测试
+
+基于规范: SPEC-USER-001, 4.1 性能要求
+"""
+
+from datetime import datetime, timezone
+from uuid import uuid4
+
+import pytest
+
+from src.domain.exceptions import ValidationError
+from src.domain.pagination import PageCursor
+
+
+@pytest.mark.unit
+class TestPageCursor:
+    """分页游标测试套件"""
+
+    @pytest.mark.parametrize("created_at", [
+        datetime(2026, 1, 28, 10, 30, 0, 123456),
+        datetime(2026, 1, 28, 10, 30, tzinfo=timezone.utc),
+    ])
+    def test_round_trip(self, created_at):
+        """编码后可解码为相同排序键"""
+        cursor = PageCursor(created_at=created_at, id=uuid4())
+
+        assert PageCursor.decode(cursor.encode()) == cursor
+
+    def test_cursor_is_url_safe(self):
+        """游标可直接放入查询参数"""
+        encoded = PageCursor(created_at=datetime(2026, 1, 28), id=uuid4()).encode()
+
+        assert all(c.isalnum() or c in "-_" for c in encoded)
+
+    @pytest.mark.parametrize("cursor", ["", "not-a-cursor", "WyJ4Il0", "e30"])
+    def test_invalid_cursor(self, cursor):
+        """无效游标抛出验证错误"""
+        with pytest.raises(ValidationError) as exc_info:
+            PageCursor.decode(cursor)
+
+        assert exc_info.value.field == "cursor"
@@ -0,0 +1,77 @@
+"""
+用户实体修改记录单元测试
+
+基于规范: SPEC-USER-001, 4.1 性能要求
+"""
+
+from dataclasses import replace
+from uuid import uuid4
+
+import pytest
+
+from src.domain.models.user import User
+
+
+def _persisted_user() -> User:
+    """模拟从仓储加载的用户"""
+    user = User(
+        id=uuid4(),
+        username="TestUser",
+        email="Test@Example.com",
+        password_hash="hashed_password_123"
+    )
+    user.mark_persisted()
+    return user
+
+
+@pytest.mark.unit
+class TestUserChangeTracking:
+    """修改记录测试套件"""
+
+    def test_new_entity_is_not_tracked(self):
+        """未标记的实体无法判断修改"""
+        user = User(id=uuid4(), username="a", email="a@example.com", password_hash="x")
+
+        user.first_name = "Ann"
+
+        assert user.changed_fields is None
+
+    def test_records_changed_fields(self):
+        """记录被修改的字段和修改前的值"""
+        user = _persisted_user()
+        assert user.changed_fields == set()
+
+        user.verify_email()
+
+        assert user.changed_fields == {"email_verified", "updated_at"}
+        assert user.persisted_value("email_verified") is False
+        assert user.persisted_value("username") == "testuser"
+
+    def test_reverted_and_same_value_assignments_are_not_changes(self):
+        """赋相同的值或改回原值不算修改"""
+        user = _persisted_user()
+
+        user.is_active = True
+        user.first_name = "Ann"
+        user.first_name = None
+
+        assert user.changed_fields == set()
+
+    def test_mark_persisted_resets(self):
+        """写入后重新开始记录"""
+        user = _persisted_user()
+        user.deactivate()
+
+        user.mark_persisted()
+
+        assert user.changed_fields == set()
+        assert user.persisted_value("is_active") is False
+
+    def test_tracking_does_not_affect_equality_or_copies(self):
+        """修改记录不参与比较，副本不继承记录"""
+        user = _persisted_user()
+        user.first_name = "Ann"
+        copy = replace(user)
+
+        assert copy == user
+        assert copy.changed_fields is None
@@ -0,0 +1,93 @@
+"""
+用户输入验证单元测试
+
+基于规范: SPEC-USER-001, 3.3 业务规则
+"""
+
+import pytest
+
+from src.domain.exceptions import ValidationError
+from src.domain.validation import (
+    USER_FIELD_RULES,
+    UserInputValidator,
+    password_character_classes
+)
+
+
+@pytest.fixture
+def validator():
+    """创建默认验证器"""
+    return UserInputValidator()
+
+
+@pytest.mark.unit
+class TestUserInputValidator:
+    """输入验证器测试套件"""
+
+    def test_valid_registration_passes(self, validator):
+        """有效输入不抛出异常"""
+        validator.validate_registration(
+            username="john_doe",
+            email="john@example.com",
+            password="SecurePass123",
+            first_name="John",
+            phone_number="+8613800000000"
+        )
+
+    @pytest.mark.parametrize("username", ["ab", "a" * 21, "1user", "user-name", "user\n"])
+    def test_invalid_username(self, validator, username):
+        """用户名长度和格式"""
+        with pytest.raises(ValidationError) as exc_info:
+            validator.validate_username(username)
+
+        assert exc_info.value.field == "username"
+
+    def test_reserved_username(self, validator):
+        """保留用户名不区分大小写"""
+        with pytest.raises(ValidationError) as exc_info:
+            validator.validate_username("Admin")
+
+        assert "保留" in exc_info.value.message
+
+    @pytest.mark.parametrize("email", ["notanemail", "missing@domain", "double@@domain.com"])
+    def test_invalid_email(self, validator, email):
+        """邮箱格式"""
+        with pytest.raises(ValidationError) as exc_info:
+            validator.validate_email(email)
+
+        assert exc_info.value.field == "email"
+
+    @pytest.mark.parametrize("password", ["short", "alllowercase1", "ALLUPPERCASE1", "NoNumbers"])
+    def test_weak_password(self, validator, password):
+        """密码长度和复杂度"""
+        with pytest.raises(ValidationError) as exc_info:
+            validator.validate_password(password)
+
+        assert exc_info.value.field == "password"
+
+    def test_custom_weak_password_checker(self):
+        """弱密码判定可替换"""
+        validator = UserInputValidator(is_weak_password=lambda p: p == "securepass123")
+
+        with pytest.raises(ValidationError):
+            validator.validate_password("SecurePass123")
+
+    def test_password_character_classes_single_pass(self):
+        """字符类统计"""
+        assert password_character_classes("Aa1") == (True, True, True)
+        assert password_character_classes("abc") == (False, True, False)
+
+    def test_validate_many_reports_all_errors_per_record(self, validator):
+        """批量验证按输入顺序返回每条记录的全部错误"""
+        results = validator.validate_many([
+            {"username": "john_doe", "email": "john@example.com", "password": "SecurePass123"},
+            {"username": "ab", "email": "invalid", "password": "SecurePass123"},
+        ])
+
+        assert results[0] == []
+        assert [e.field for e in results[1]] == ["username", "email"]
+
+    def test_rule_table_is_shared(self):
+        """规则表暴露 API 层使用的长度约束"""
+        assert USER_FIELD_RULES["username"].max_length == 20
+        assert USER_FIELD_RULES["password"].min_length == 8
@@ -15,7 +15,7 @@ from uuid import uuid4
 
 # 模拟的导入（实际实现时替换）
 from src.domain.services.user_service import UserService
-from src.domain.models.user import User
+from src.domain.models.user import BulkCreateResult, User, hash_verification_token
 from src.domain.exceptions import (
     ValidationError,
     ConflictError,
@@ -425,26 +425,26 @@ class TestUserRegistration:
 
         # Then: 验证 token 已生成
         stored_user = user_service.get_user_by_id(result.user_id)
-        assert stored_user.email_verification_token is not None
+        assert stored_user.email_verification_token_hash is not None
         assert stored_user.email_verification_expires is not None
         # Token 应该在 24 小时后过期
         expiry_delta = stored_user.email_verification_expires - datetime.utcnow()
         assert timedelta(hours=23) < expiry_delta < timedelta(hours=25)
 
-    def test_verify_email_with_valid_token(self, user_service):
+    def test_verify_email_with_valid_token(self, user_service, mocker):
         """
         测试用例: 使用有效 token 验证邮箱
         规范参考: SPEC-USER-001, 3.1 API 接口
         """
-        # Given: 已注册但未验证的用户
+        # Given: 已注册但未验证的用户（原始 token 只出现在验证邮件中）
+        send_email = mocker.patch.object(user_service.email_service, "send_verification_email")
         result = user_service.register_user(
             username="verify_user2",
             email="verify2@example.com",
             password="SecurePass123"
         )
 
-        stored_user = user_service.get_user_by_id(result.user_id)
-        token = stored_user.email_verification_token
+        token = send_email.call_args.kwargs["verification_token"]
 
         # When: 使用 token 验证邮箱
         verify_result = user_service.verify_email(token)
@@ -456,7 +456,7 @@ class TestUserRegistration:
         # 确认用户状态已更新
         verified_user = user_service.get_user_by_id(result.user_id)
         assert verified_user.email_verified is True
-        assert verified_user.email_verification_token is None
+        assert verified_user.email_verification_token_hash is None
 
     def test_verify_email_with_expired_token(self, user_service, mocker):
         """
@@ -464,14 +464,14 @@ class TestUserRegistration:
         规范参考: SPEC-USER-001, 2.3 边缘情况处理
         """
         # Given: 已注册但 token 已过期的用户
+        send_email = mocker.patch.object(user_service.email_service, "send_verification_email")
         result = user_service.register_user(
             username="expired_user",
             email="expired@example.com",
             password="SecurePass123"
         )
 
-        stored_user = user_service.get_user_by_id(result.user_id)
-        token = stored_user.email_verification_token
+        token = send_email.call_args.kwargs["verification_token"]
 
         # 模拟时间流逝，token 过期
         mocker.patch(
@@ -522,3 +522,161 @@ class TestUserRegistrationIntegration:
         # 这里会进行端到端的集成测试
         # 包括数据库、邮件服务、缓存等
         pass
+
+    def test_username_conflict_on_insert_returns_suggestions(
+        self, test_user_repository, mocker
+    ):
+        """
+        测试用例: 真实仓储插入时检测到的用户名冲突带回可用的建议用户名
+        规范参考: SPEC-USER-001, 2.3 边缘情况处理
+        """
+        test_user_repository.create(User(
+            id=uuid4(),
+            username="john_doe",
+            email="john@example.com",
+            password_hash="hashed_password_123"
+        ))
+        rate_limiter = mocker.Mock()
+        rate_limiter.check_limit.return_value = True
+        service = UserService(test_user_repository, mocker.Mock(), rate_limiter)
+        mocker.patch.object(service, "_hash_password", side_effect=lambda p: f"hashed:{p}")
+
+        with pytest.raises(ConflictError) as exc_info:
+            service.register_user(
+                username="john_doe",
+                email="other@example.com",
+                password="SecurePass123"
+            )
+
+        assert exc_info.value.code == "USERNAME_TAKEN"
+        assert exc_info.value.suggestions
+        assert "john_doe" not in exc_info.value.suggestions
+        assert test_user_repository.count() == 1
+
+
+class TestBatchRegistration:
+    """批量注册测试套件"""
+
+    @pytest.fixture
+    def repository(self, mocker):
+        """模拟仓储: taken_name / taken@example.com 已被使用，插入全部成功"""
+        repository = mocker.Mock()
+        repository.find_existing_usernames.return_value = {"taken_name"}
+        repository.find_existing_emails.return_value = {"taken@example.com"}
+        repository.create_many.side_effect = (
+            lambda users, chunk_size: BulkCreateResult(created=list(users))
+        )
+        return repository
+
+    @pytest.fixture
+    def email_service(self, mocker):
+        """支持整批发送的模拟邮件服务"""
+        return mocker.Mock(spec=["send_verification_email", "send_verification_emails"])
+
+    @pytest.fixture
+    def rate_limiter(self, mocker):
+        """不限制的模拟速率限制器"""
+        rate_limiter = mocker.Mock()
+        rate_limiter.check_limit.return_value = True
+        return rate_limiter
+
+    @pytest.fixture
+    def user_service(self, repository, email_service, rate_limiter, mocker):
+        """创建用户服务实例（密码哈希替换为快速实现）"""
+        service = UserService(repository, email_service, rate_limiter)
+        mocker.patch.object(service, "_hash_password", side_effect=lambda p: f"hashed:{p}")
+        return service
+
+    @staticmethod
+    def _record(username, email, password="SecurePass123"):
+        return {"username": username, "email": email, "password": password}
+
+    def test_results_follow_input_order(self, user_service, repository, rate_limiter):
+        """
+        测试用例: 每条记录的结果与输入顺序一致，冲突记录不计算哈希
+        规范参考: SPEC-USER-001, 2.1 核心功能 / 2.3 边缘情况处理
+        """
+        records = [
+            self._record("alice", "alice@example.com"),
+            self._record("bob", "not-an-email", password="short"),
+            self._record("Alice", "alice2@example.com"),
+            self._record("taken_name", "carol@example.com"),
+            self._record("dave", "Taken@Example.com"),
+            self._record("erin", "erin@example.com"),
+        ]
+
+        items = user_service.register_many(records)
+
+        assert [item.index for item in items] == list(range(6))
+        assert items[0].succeeded and items[5].succeeded
+        assert {error.field for error in items[1].errors} == {"email", "password"}
+        assert [error.code for error in items[2].errors] == ["USERNAME_TAKEN"]
+        assert [error.code for error in items[3].errors] == ["USERNAME_TAKEN"]
+        assert [error.code for error in items[4].errors] == ["EMAIL_ALREADY_REGISTERED"]
+
+        created = repository.create_many.call_args.args[0]
+        assert [user.username for user in created] == ["alice", "erin"]
+        assert user_service._hash_password.call_count == 2
+        rate_limiter.check_limit.assert_called_once()
+
+    def test_conflicts_detected_at_insert(self, user_service, repository):
+        """
+        测试用例: 预检之后被并发注册占用的邮箱按插入结果报告冲突
+        规范参考: SPEC-USER-001, 2.3 边缘情况处理
+        """
+        repository.create_many.side_effect = lambda users, chunk_size: BulkCreateResult(
+            created=[users[0]],
+            conflicts={1: ConflictError("邮箱已被注册", code="EMAIL_ALREADY_REGISTERED")}
+        )
+
+        items = user_service.register_many([
+            self._record("alice", "alice@example.com"),
+            self._record("bob", "bob@example.com"),
+        ])
+
+        assert items[0].succeeded
+        assert not items[1].succeeded
+        assert items[1].errors[0].code == "EMAIL_ALREADY_REGISTERED"
+
+    def test_verification_emails_are_sent_as_batch(self, user_service, email_service, repository):
+        """
+        测试用例: 验证邮件整批发送一次，token 与保存的摘要对应
+        规范参考: SPEC-USER-001, 2.1 核心功能
+        """
+        user_service.register_many([
+            self._record("alice", "alice@example.com"),
+            self._record("bob", "bob@example.com"),
+        ])
+
+        email_service.send_verification_emails.assert_called_once()
+        email_service.send_verification_email.assert_not_called()
+        messages = email_service.send_verification_emails.call_args.args[0]
+        created = repository.create_many.call_args.args[0]
+        assert [message["email"] for message in messages] == [
+            "alice@example.com", "bob@example.com"
+        ]
+        assert [
+            hash_verification_token(message["verification_token"]) for message in messages
+        ] == [user.email_verification_token_hash for user in created]
+
+    @pytest.mark.asyncio
+    async def test_async_hashes_on_pool(self, repository, email_service, rate_limiter, mocker):
+        """
+        测试用例: 异步批量注册在进程池中批量计算哈希
+        规范参考: SPEC-USER-001, 4.1 性能要求
+        """
+        password_hasher = mocker.Mock()
+        password_hasher.hash_passwords = mocker.AsyncMock(return_value=["h1", "h2"])
+        service = UserService(repository, email_service, rate_limiter, password_hasher)
+
+        items = await service.register_many_async([
+            self._record("alice", "alice@example.com"),
+            self._record("bob", "bob@example.com"),
+        ])
+
+        assert all(item.succeeded for item in items)
+        password_hasher.hash_passwords.assert_awaited_once_with(
+            ["SecurePass123", "SecurePass123"]
+        )
+        created = repository.create_many.call_args.args[0]
+        assert [user.password_hash for user in created] == ["h1", "h2"]
@@ -0,0 +1,107 @@
+"""
+准入控制单元测试
+
+基于规范: SPEC-USER-001, 4.1 性能要求
+"""
+
+import asyncio
+
+import pytest
+
+from src.domain.exceptions import ServiceOverloadedError
+from src.infrastructure.admission import (
+    AdmissionController,
+    REJECT_DEADLINE,
+    REJECT_QUEUE_FULL
+)
+
+
+async def hold(controller: AdmissionController, release: asyncio.Event) -> None:
+    """占用一个许可直到 release 被设置"""
+    async with controller.admit():
+        await release.wait()
+
+
+@pytest.mark.unit
+class TestAdmissionController:
+    """准入控制器测试套件"""
+
+    @pytest.mark.asyncio
+    async def test_admits_up_to_max_in_flight(self):
+        """并发上限以内直接准入"""
+        controller = AdmissionController(max_in_flight=2, name="test_admit")
+        release = asyncio.Event()
+
+        tasks = [asyncio.create_task(hold(controller, release)) for _ in range(2)]
+        await asyncio.sleep(0)
+
+        assert controller.in_flight == 2
+        assert controller.queue_depth == 0
+
+        release.set()
+        await asyncio.gather(*tasks)
+        assert controller.in_flight == 0
+
+    @pytest.mark.asyncio
+    async def test_rejects_when_queue_full(self):
+        """队列已满时立即拒绝"""
+        controller = AdmissionController(
+            max_in_flight=1, max_queue=1, queue_timeout=5, retry_after=3, name="test_full"
+        )
+        release = asyncio.Event()
+
+        running = asyncio.create_task(hold(controller, release))
+        queued = asyncio.create_task(hold(controller, release))
+        await asyncio.sleep(0)
+
+        with pytest.raises(ServiceOverloadedError) as exc_info:
+            async with controller.admit():
+                pass
+
+        assert exc_info.value.reason == REJECT_QUEUE_FULL
+        assert exc_info.value.retry_after == 3
+
+        release.set()
+        await asyncio.gather(running, queued)
+
+    @pytest.mark.asyncio
+    async def test_rejects_after_queue_deadline(self):
+        """排队超过截止时间时拒绝"""
+        controller = AdmissionController(
+            max_in_flight=1, max_queue=10, queue_timeout=0.01, name="test_deadline"
+        )
+        release = asyncio.Event()
+        running = asyncio.create_task(hold(controller, release))
+        await asyncio.sleep(0)
+
+        with pytest.raises(ServiceOverloadedError) as exc_info:
+            async with controller.admit():
+                pass
+
+        assert exc_info.value.reason == REJECT_DEADLINE
+        assert controller.queue_depth == 0
+
+        release.set()
+        await running
+
+    @pytest.mark.asyncio
+    async def test_queued_task_runs_after_release(self):
+        """许可释放后排队任务得到执行"""
+        controller = AdmissionController(max_in_flight=1, queue_timeout=1, name="test_queue")
+        release = asyncio.Event()
+        running = asyncio.create_task(hold(controller, release))
+        await asyncio.sleep(0)
+
+        second_release = asyncio.Event()
+        queued = asyncio.create_task(hold(controller, second_release))
+        await asyncio.sleep(0)
+        assert controller.queue_depth == 1
+
+        release.set()
+        await running
+        await asyncio.sleep(0.01)
+        assert controller.in_flight == 1
+        assert controller.queue_depth == 0
+
+        second_release.set()
+        await queued
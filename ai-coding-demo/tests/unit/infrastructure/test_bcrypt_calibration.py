@@ -0,0 +1,69 @@
+"""
+bcrypt cost 校准单元测试
+
+基于规范: SPEC-USER-001, 4.1 性能要求
+"""
+
+import pytest
+
+from src.infrastructure.hashing.calibration import calibrate_bcrypt_rounds
+from src.infrastructure.hashing.hashers import get_bcrypt_rounds
+
+
+def doubling_cost(base_ms: float, base_rounds: int = 10):
+    """模拟 bcrypt 耗时: 每增加 1 个 cost 耗时翻倍"""
+    calls = []
+
+    def measure(rounds: int) -> float:
+        calls.append(rounds)
+        return base_ms * 2 ** (rounds - base_rounds)
+
+    return measure, calls
+
+
+@pytest.mark.unit
+class TestBcryptCalibration:
+    """bcrypt cost 校准测试套件"""
+
+    def test_picks_highest_rounds_within_budget(self):
+        """选出不超过预算的最高 cost"""
+        measure, _ = doubling_cost(base_ms=60)  # 10→60ms, 11→120ms, 12→240ms, 13→480ms
+
+        result = calibrate_bcrypt_rounds(budget_ms=250, measure=measure)
+
+        assert result.rounds == 12
+        assert result.measurements[12] == 240
+
+    def test_stops_measuring_when_next_cost_cannot_fit(self):
+        """上一级耗时翻倍已超预算时不再测量更高 cost"""
+        measure, calls = doubling_cost(base_ms=60)
+
+        calibrate_bcrypt_rounds(budget_ms=250, samples=1, measure=measure)
+
+        assert 14 not in calls
+
+    def test_falls_back_to_min_rounds_on_slow_hardware(self):
+        """最低 cost 也超出预算时返回 min_rounds"""
+        measure, _ = doubling_cost(base_ms=1000)
+
+        result = calibrate_bcrypt_rounds(budget_ms=250, measure=measure)
+
+        assert result.rounds == 10
+
+    def test_respects_max_rounds(self):
+        """快机器上不超过 max_rounds"""
+        measure, _ = doubling_cost(base_ms=0.01)
+
+        result = calibrate_bcrypt_rounds(budget_ms=250, max_rounds=14, measure=measure)
+
+        assert result.rounds == 14
+
+    def test_invalid_range_raises_value_error(self):
+        """cost 范围无效时抛出异常"""
+        with pytest.raises(ValueError):
+            calibrate_bcrypt_rounds(budget_ms=250, min_rounds=14, max_rounds=12)
+
+    def test_get_bcrypt_rounds(self):
+        """从哈希中解析 cost"""
+        assert get_bcrypt_rounds("$2b$12$abcdefghijklmnopqrstuv") == 12
+        assert get_bcrypt_rounds("not-a-bcrypt-hash") is None
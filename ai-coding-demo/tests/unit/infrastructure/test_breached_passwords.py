@@ -0,0 +1,118 @@
+"""
+泄露密码过滤器单元测试
+
+基于规范: SPEC-USER-001, 4.2 安全要求
+"""
+
+import gzip
+
+import pytest
+
+from src.domain.exceptions import ValidationError
+from src.domain.validation import UserInputValidator
+from src.infrastructure.breached_passwords import (
+    BreachedPasswordChecker,
+    build_password_filter,
+    iter_password_file
+)
+from src.utils.bloom_filter import BloomFilter
+
+
+@pytest.fixture
+def filter_path(tmp_path):
+    """生成包含少量泄露密码的过滤器文件"""
+    path = tmp_path / "breached.bloom"
+    bloom = build_password_filter(["securepass123", "hunter2hunter2"], capacity=100)
+    bloom.save(str(path))
+    return str(path)
+
+
+@pytest.mark.unit
+class TestBloomFilter:
+    """Bloom 过滤器测试套件"""
+
+    def test_added_items_are_found(self):
+        """已添加元素一定命中"""
+        bloom = BloomFilter.with_capacity(1000, 0.01)
+        items = [f"password{i}" for i in range(1000)]
+        bloom.update(items)
+
+        assert all(item in bloom for item in items)
+        assert len(bloom) == 1000
+
+    def test_false_positive_rate_within_target(self):
+        """误判率接近目标值"""
+        bloom = BloomFilter.with_capacity(2000, 0.01)
+        bloom.update(f"member{i}" for i in range(2000))
+
+        false_positives = sum(f"absent{i}" in bloom for i in range(10000))
+
+        assert false_positives / 10000 < 0.02
+
+    def test_save_and_open_with_mmap(self, tmp_path):
+        """保存后以只读 mmap 方式打开，查询结果一致"""
+        path = str(tmp_path / "filter.bloom")
+        bloom = BloomFilter.with_capacity(100)
+        bloom.update(["alpha", "beta"])
+        bloom.save(path)
+
+        with BloomFilter.open(path) as mapped:
+            assert mapped.read_only
+            assert "alpha" in mapped
+            assert "beta" in mapped
+            assert mapped.count == 2
+            assert mapped.num_bits == bloom.num_bits
+
+    def test_read_only_filter_rejects_add(self, filter_path):
+        """只读过滤器不能添加元素"""
+        with BloomFilter.open(filter_path) as mapped:
+            with pytest.raises(ValueError):
+                mapped.add("new")
+
+    def test_open_rejects_invalid_file(self, tmp_path):
+        """无效文件格式"""
+        path = tmp_path / "invalid.bloom"
+        path.write_bytes(b"not a bloom filter at all")
+
+        with pytest.raises(ValueError):
+            BloomFilter.open(str(path))
+
+
+@pytest.mark.unit
+class TestBreachedPasswordChecker:
+    """泄露密码检查器测试套件"""
+
+    def test_checker_rejects_breached_and_common_passwords(self, filter_path):
+        """过滤器中的密码和内置弱密码都被拒绝"""
+        checker = BreachedPasswordChecker.from_file(filter_path)
+
+        assert checker("securepass123")
+        assert checker("password123")
+        assert not checker("an0ther-unique-passphrase")
+        checker.close()
+
+    def test_checker_without_filter_uses_builtin_list(self):
+        """未配置过滤器时只检查内置弱密码"""
+        checker = BreachedPasswordChecker()
+
+        assert checker("password123")
+        assert not checker("securepass123")
+
+    def test_validator_uses_checker(self, filter_path):
+        """验证器按小写密码查询过滤器"""
+        checker = BreachedPasswordChecker.from_file(filter_path)
+        validator = UserInputValidator(is_weak_password=checker)
+
+        with pytest.raises(ValidationError) as exc_info:
+            validator.validate_password("SecurePass123")
+
+        assert exc_info.value.field == "password"
+        checker.close()
+
+    def test_iter_password_file_normalizes_gzip_input(self, tmp_path):
+        """读取 gzip 密码库，去除空白并转为小写"""
+        path = tmp_path / "passwords.txt.gz"
+        with gzip.open(path, "wt", encoding="utf-8") as f:
+            f.write("Secret1\n\n  HUNTER2 \n")
+
+        assert list(iter_password_file(str(path))) == ["secret1", "hunter2"]
@@ -0,0 +1,133 @@
+"""
+缓存组件单元测试
+"""
+
+import threading
+
+import pytest
+
+from src.infrastructure.cache import InMemorySharedCache, LRUTTLCache, SingleFlight
+
+
+class FakeClock:
+    """可手动推进的时钟"""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.mark.unit
+class TestLRUTTLCache:
+    """进程内 LRU + TTL 缓存测试套件"""
+
+    def test_evicts_least_recently_used(self):
+        """超出容量时淘汰最久未使用的条目"""
+        cache = LRUTTLCache("test", max_entries=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        assert cache.get("a") == 1
+
+        cache.set("c", 3)
+
+        assert cache.get("b") is None
+        assert cache.get("a") == 1
+        assert cache.get("c") == 3
+        assert len(cache) == 2
+
+    def test_entries_expire(self):
+        """条目到期后失效"""
+        clock = FakeClock()
+        cache = LRUTTLCache("test", ttl_seconds=30, clock=clock)
+        cache.set("a", 1)
+
+        clock.now = 29.9
+        assert cache.get("a") == 1
+        clock.now = 30.0
+        assert cache.get("a") is None
+        assert len(cache) == 0
+
+    def test_delete_and_clear(self):
+        """删除和清空"""
+        cache = LRUTTLCache("test")
+        cache.set("a", 1)
+        cache.set("b", 2)
+
+        cache.delete("a", "missing")
+        assert cache.get("a") is None
+        assert cache.get("b") == 2
+
+        cache.clear()
+        assert len(cache) == 0
+
+    def test_rejects_empty_capacity(self):
+        """容量必须大于 0"""
+        with pytest.raises(ValueError):
+            LRUTTLCache("test", max_entries=0)
+
+
+@pytest.mark.unit
+class TestInMemorySharedCache:
+    """共享缓存层替身测试套件"""
+
+    def test_get_set_delete_with_expiry(self):
+        """与 Redis GET / SET EX / DEL 行为一致"""
+        clock = FakeClock()
+        shared = InMemorySharedCache(clock=clock)
+
+        shared.set("a", "1", ex=10)
+        shared.set("b", b"2")
+        assert shared.get("a") == b"1"
+
+        clock.now = 10
+        assert shared.get("a") is None
+        assert shared.get("b") == b"2"
+        assert shared.delete("a", "b") == 1
+
+
+@pytest.mark.unit
+class TestSingleFlight:
+    """并发加载合并测试套件"""
+
+    def test_concurrent_loads_run_once(self):
+        """同一个键的并发加载只执行一次，结果共用"""
+        single_flight = SingleFlight("test")
+        started = threading.Event()
+        release = threading.Event()
+        calls = []
+        results = []
+
+        def load():
+            calls.append(1)
+            started.set()
+            release.wait(timeout=5)
+            return "value"
+
+        leader = threading.Thread(target=lambda: results.append(single_flight.do("k", load)))
+        leader.start()
+        assert started.wait(timeout=5)
+        followers = [
+            threading.Thread(target=lambda: results.append(single_flight.do("k", load)))
+            for _ in range(3)
+        ]
+        for thread in followers:
+            thread.start()
+        release.set()
+        for thread in [leader, *followers]:
+            thread.join(timeout=5)
+
+        assert len(calls) == 1
+        assert results == ["value"] * 4
+
+    def test_error_is_not_cached(self):
+        """加载失败后下一次调用重新加载"""
+        single_flight = SingleFlight("test")
+
+        def failing():
+            raise RuntimeError("数据库连接断开")
+
+        with pytest.raises(RuntimeError):
+            single_flight.do("k", failing)
+        assert single_flight.do("k", lambda: "value") == "value"
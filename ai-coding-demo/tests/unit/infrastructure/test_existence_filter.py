@@ -0,0 +1,103 @@
+"""
+用户名/邮箱存在性过滤器单元测试
+
+基于规范: SPEC-USER-001, 4.1 性能要求
+"""
+
+import threading
+import time
+
+import pytest
+
+from src.infrastructure.existence_filter import ExistenceFilter, UserExistenceFilter
+
+
+@pytest.mark.unit
+class TestExistenceFilter:
+    """单字段过滤器测试套件"""
+
+    def test_not_ready_filter_reports_maybe_present(self):
+        """未构建前一律判定为可能存在"""
+        existence_filter = ExistenceFilter("username", capacity=100)
+
+        assert not existence_filter.ready
+        assert existence_filter.might_contain("anyone")
+        assert existence_filter.false_positive_rate == 1.0
+
+    def test_rebuild_then_lookup(self):
+        """构建后已有值命中，大部分不存在的值判定为一定不存在"""
+        user_filter = UserExistenceFilter(capacity=1000, false_positive_rate=0.01)
+        user_filter.rebuild((f"user{i}", f"user{i}@example.com") for i in range(1000))
+
+        assert all(user_filter.usernames.might_contain(f"user{i}") for i in range(1000))
+        assert user_filter.emails.might_contain("user1@example.com")
+        absent = sum(not user_filter.usernames.might_contain(f"other{i}") for i in range(1000))
+        assert absent > 950
+
+    def test_add_after_build(self):
+        """新建用户立即可查到"""
+        user_filter = UserExistenceFilter(capacity=100)
+        user_filter.rebuild([])
+
+        user_filter.add("newuser", "new@example.com")
+
+        assert user_filter.usernames.might_contain("newuser")
+        assert user_filter.emails.might_contain("new@example.com")
+
+    def test_values_added_during_rebuild_are_kept(self):
+        """重建期间加入的值在切换后仍可查到"""
+        user_filter = UserExistenceFilter(capacity=100)
+        user_filter.rebuild([])
+
+        def identities():
+            yield "existing", "existing@example.com"
+            # 模拟重建扫描期间有新用户注册
+            user_filter.add("concurrent", "concurrent@example.com")
+            yield "another", "another@example.com"
+
+        user_filter.rebuild(identities())
+
+        assert user_filter.usernames.might_contain("concurrent")
+        assert user_filter.usernames.count == 3
+
+    def test_failed_rebuild_keeps_previous_filter(self):
+        """重建失败时保留旧过滤器"""
+        user_filter = UserExistenceFilter(capacity=100)
+        user_filter.rebuild([("kept", "kept@example.com")])
+
+        def broken():
+            yield "partial", "partial@example.com"
+            raise RuntimeError("数据库连接断开")
+
+        with pytest.raises(RuntimeError):
+            user_filter.rebuild(broken())
+
+        assert user_filter.usernames.might_contain("kept")
+        assert user_filter.usernames.count == 1
+
+    def test_exposes_footprint(self):
+        """暴露内存占用和误判率"""
+        user_filter = UserExistenceFilter(capacity=1000, false_positive_rate=0.01)
+        user_filter.rebuild((f"user{i}", f"user{i}@example.com") for i in range(500))
+
+        assert user_filter.memory_bytes > 0
+        assert user_filter.usernames.false_positive_rate < 0.01
+
+    def test_background_rebuild(self):
+        """后台线程构建，不阻塞调用方"""
+        user_filter = UserExistenceFilter(capacity=100)
+        loaded = threading.Event()
+
+        def load_identities():
+            loaded.set()
+            return [("background", "background@example.com")]
+
+        user_filter.start(load_identities, rebuild_interval_seconds=60)
+        try:
+            assert loaded.wait(timeout=5)
+            deadline = time.monotonic() + 5
+            while not user_filter.usernames.ready and time.monotonic() < deadline:
+                time.sleep(0.01)
+            assert user_filter.usernames.might_contain("background")
+        finally:
+            user_filter.stop()
@@ -0,0 +1,104 @@
+"""
+用户导出编码单元测试
+
+基于规范: SPEC-USER-001, 4.1 性能要求
+"""
+
+import csv
+import io
+import json
+from datetime import datetime, timedelta
+from uuid import uuid4
+
+import pytest
+
+from src.domain.models.user import User
+from src.infrastructure.export import (
+    EXPORT_FIELDS,
+    UserExportEncoder,
+    export_chunks,
+    export_chunks_async
+)
+
+
+def _user(i: int, first_name=None) -> User:
+    """构造用户"""
+    return User(
+        id=uuid4(),
+        username=f"user{i}",
+        email=f"user{i}@example.com",
+        password_hash="hashed_password_123",
+        first_name=first_name,
+        email_verification_token_hash="0" * 64,
+        created_at=datetime(2026, 1, 28, 10, 30) + timedelta(seconds=i)
+    )
+
+
+@pytest.mark.unit
+class TestUserExport:
+    """导出编码测试套件"""
+
+    def test_ndjson_lines(self):
+        """每行一个 JSON 对象，不含密码哈希和 token 摘要"""
+        users = [_user(0, first_name="张三"), _user(1)]
+
+        data = b"".join(export_chunks(users, "ndjson")).decode("utf-8")
+
+        records = [json.loads(line) for line in data.splitlines()]
+        assert [r["username"] for r in records] == ["user0", "user1"]
+        assert records[0]["id"] == str(users[0].id)
+        assert records[0]["first_name"] == "张三"
+        assert records[1]["created_at"] == "2026-01-28T10:30:01"
+        assert set(records[0]) == set(EXPORT_FIELDS)
+
+    def test_csv_header_and_escaping(self):
+        """首行为表头，含逗号和引号的值按 CSV 规则转义，None 为空"""
+        users = [_user(0, first_name='Doe, "JJ"'), _user(1)]
+
+        data = b"".join(export_chunks(users, "csv")).decode("utf-8")
+
+        rows = list(csv.DictReader(io.StringIO(data)))
+        assert list(rows[0]) == list(EXPORT_FIELDS)
+        assert rows[0]["first_name"] == 'Doe, "JJ"'
+        assert rows[1]["first_name"] == ""
+        assert "hashed_password_123" not in data
+
+    def test_empty_export(self):
+        """没有用户时 CSV 只有表头，NDJSON 为空"""
+        assert b"".join(export_chunks([], "csv")).decode("utf-8").startswith("id,username,")
+        assert list(export_chunks([], "ndjson")) == []
+
+    def test_chunks_are_produced_lazily(self):
+        """按块大小产出，取第一块时只读取了凑满一块所需的用户"""
+        consumed = []
+
+        def users():
+            for i in range(100):
+                consumed.append(i)
+                yield _user(i)
+
+        chunks = export_chunks(users(), "ndjson", chunk_bytes=1000)
+        first = next(chunks)
+
+        assert len(first) >= 1000
+        assert len(consumed) < 10
+        rest = b"".join(chunks)
+        assert len((first + rest).splitlines()) == 100
+
+    @pytest.mark.asyncio
+    async def test_async_chunks(self):
+        """异步迭代器产出相同的内容"""
+        users = [_user(i) for i in range(3)]
+
+        async def stream():
+            for user in users:
+                yield user
+
+        chunks = [chunk async for chunk in export_chunks_async(stream(), "csv")]
+
+        assert b"".join(chunks) == b"".join(export_chunks(users, "csv"))
+
+    def test_rejects_unknown_format(self):
+        """不支持的格式"""
+        with pytest.raises(ValueError):
+            UserExportEncoder("xml")
@@ -0,0 +1,104 @@
+"""
+密码哈希算法注册表单元测试
+
+基于规范: SPEC-USER-001, 4.2 安全要求
+"""
+
+import pytest
+
+from src.infrastructure.hashing.hashers import (
+    Argon2Hasher,
+    BcryptHasher,
+    PasswordHasherRegistry,
+    ScryptHasher,
+    UnknownHashFormatError,
+    create_hasher
+)
+
+
+# 低参数以加快测试
+FAST_BCRYPT = BcryptHasher(rounds=4)
+FAST_SCRYPT = ScryptHasher(ln=10, r=8, p=1)
+
+
+@pytest.mark.unit
+class TestPasswordHashers:
+    """各算法实现测试套件"""
+
+    @pytest.mark.parametrize("hasher", [FAST_BCRYPT, FAST_SCRYPT])
+    def test_hash_and_verify(self, hasher):
+        """哈希后可校验，错误密码校验失败"""
+        password_hash = hasher.hash("SecurePass123")
+
+        assert hasher.identify(password_hash)
+        assert hasher.verify("SecurePass123", password_hash) is True
+        assert hasher.verify("WrongPass123", password_hash) is False
+
+    def test_scrypt_hash_format(self):
+        """scrypt 哈希包含参数"""
+        password_hash = FAST_SCRYPT.hash("SecurePass123")
+
+        assert password_hash.startswith("$scrypt$ln=10,r=8,p=1$")
+
+    def test_scrypt_needs_rehash_on_parameter_change(self):
+        """scrypt 参数变化后需要重新哈希"""
+        password_hash = FAST_SCRYPT.hash("SecurePass123")
+
+        assert FAST_SCRYPT.needs_rehash(password_hash) is False
+        assert ScryptHasher(ln=11).needs_rehash(password_hash) is True
+
+    def test_bcrypt_needs_rehash_only_upgrades(self):
+        """bcrypt cost 低于当前配置时重新哈希，更高 cost 的哈希保留"""
+        password_hash = BcryptHasher(rounds=5).hash("SecurePass123")
+
+        assert BcryptHasher(rounds=5).needs_rehash(password_hash) is False
+        assert BcryptHasher(rounds=6).needs_rehash(password_hash) is True
+        assert FAST_BCRYPT.needs_rehash(password_hash) is False
+
+    @pytest.mark.skipif(not Argon2Hasher.available(), reason="argon2-cffi 未安装")
+    def test_argon2_hash_and_verify(self):
+        """argon2 哈希后可校验"""
+        hasher = Argon2Hasher(time_cost=1, memory_cost=1024, parallelism=1)
+        password_hash = hasher.hash("SecurePass123")
+
+        assert password_hash.startswith("$argon2id$")
+        assert hasher.verify("SecurePass123", password_hash) is True
+        assert hasher.verify("WrongPass123", password_hash) is False
+
+    def test_create_hasher_unknown_scheme(self):
+        """未知算法抛出异常"""
+        with pytest.raises(ValueError):
+            create_hasher("md5")
+
+
+@pytest.mark.unit
+class TestPasswordHasherRegistry:
+    """注册表测试套件"""
+
+    @pytest.fixture
+    def registry(self):
+        """默认 scrypt，同时可校验 bcrypt"""
+        return PasswordHasherRegistry(FAST_SCRYPT, [FAST_BCRYPT])
+
+    def test_new_hashes_use_default(self, registry):
+        """新哈希使用默认算法"""
+        assert registry.hash("SecurePass123").startswith("$scrypt$")
+
+    def test_verifies_legacy_hash_by_prefix(self, registry):
+        """旧算法哈希按前缀识别并校验"""
+        legacy_hash = FAST_BCRYPT.hash("SecurePass123")
+
+        assert registry.identify(legacy_hash) is FAST_BCRYPT
+        assert registry.verify("SecurePass123", legacy_hash) is True
+
+    def test_legacy_hash_needs_rehash(self, registry):
+        """非默认算法生成的哈希需要升级"""
+        assert registry.needs_rehash(FAST_BCRYPT.hash("SecurePass123")) is True
+        assert registry.needs_rehash(registry.hash("SecurePass123")) is False
+
+    def test_unknown_hash_format(self, registry):
+        """无法识别的哈希校验失败"""
+        with pytest.raises(UnknownHashFormatError):
+            registry.identify("plaintext")
+
+        assert registry.verify("SecurePass123", "plaintext") is False
@@ -0,0 +1,73 @@
+"""
+密码哈希执行器单元测试
+
+基于规范: SPEC-USER-001, 4.1 性能要求
+"""
+
+import asyncio
+
+import bcrypt
+import pytest
+
+from src.infrastructure.hashing.executor import PasswordHashingExecutor
+from src.infrastructure.hashing.hashers import BcryptHasher, create_registry
+
+
+@pytest.fixture
+def hasher():
+    """创建小规模执行器（低 cost 以加快测试）"""
+    executor = PasswordHashingExecutor(
+        max_workers=2, hashers=create_registry(BcryptHasher(rounds=4))
+    )
+    yield executor
+    executor.shutdown()
+
+
+@pytest.mark.unit
+class TestPasswordHashingExecutor:
+    """进程池哈希执行器测试套件"""
+
+    @pytest.mark.asyncio
+    async def test_hash_password_produces_bcrypt_hash(self, hasher):
+        """哈希结果是可被 bcrypt 校验的字符串"""
+        password_hash = await hasher.hash_password("SecurePass123")
+
+        assert password_hash.startswith("$2b$04$")
+        assert bcrypt.checkpw(b"SecurePass123", password_hash.encode('utf-8'))
+
+    @pytest.mark.asyncio
+    async def test_verify_password(self, hasher):
+        """校验正确与错误密码"""
+        password_hash = await hasher.hash_password("SecurePass123")
+
+        assert await hasher.verify_password("SecurePass123", password_hash) is True
+        assert await hasher.verify_password("WrongPass123", password_hash) is False
+
+    @pytest.mark.asyncio
+    async def test_warm_up_starts_pool(self, hasher):
+        """预热后进程池已创建"""
+        await hasher.warm_up()
+
+        assert hasher.started is True
+
+    @pytest.mark.asyncio
+    async def test_queue_depth_returns_to_zero(self, hasher):
+        """并发任务完成后队列深度归零"""
+        results = await asyncio.gather(*[
+            hasher.hash_password(f"SecurePass{i}") for i in range(5)
+        ])
+
+        assert len(set(results)) == 5
+        assert hasher.queue_depth == 0
+
+    @pytest.mark.asyncio
+    async def test_hash_passwords_keeps_input_order(self, hasher):
+        """批量哈希按输入顺序返回，跨多个任务"""
+        passwords = [f"SecurePass{i}" for i in range(7)]
+
+        hashes = await hasher.hash_passwords(passwords, chunk_size=3)
+
+        assert len(hashes) == 7
+        for password, password_hash in zip(passwords, hashes):
+            assert bcrypt.checkpw(password.encode('utf-8'), password_hash.encode('utf-8'))
+        assert hasher.queue_depth == 0
@@ -0,0 +1,46 @@
+"""
+周期任务单元测试
+"""
+
+import threading
+
+import pytest
+
+from src.infrastructure.periodic import PeriodicTask
+
+
+@pytest.mark.unit
+class TestPeriodicTask:
+    """周期任务测试套件"""
+
+    def test_runs_repeatedly_and_survives_errors(self):
+        """按间隔重复执行，单次异常不终止循环"""
+        calls = []
+        done = threading.Event()
+
+        def func():
+            calls.append(1)
+            if len(calls) == 1:
+                raise RuntimeError("数据库连接断开")
+            if len(calls) == 3:
+                done.set()
+
+        task = PeriodicTask("test-task", func, interval_seconds=0.01)
+        task.start()
+        try:
+            assert done.wait(timeout=5)
+        finally:
+            task.stop()
+
+        assert not task.running
+
+    def test_delayed_first_run(self):
+        """run_immediately=False 时等待一个间隔后才执行"""
+        called = threading.Event()
+        task = PeriodicTask("test-task", called.set, interval_seconds=60, run_immediately=False)
+
+        task.start()
+        try:
+            assert not called.wait(timeout=0.1)
+        finally:
+            task.stop()